@@ -0,0 +1,106 @@
+"""Add item search vector
+
+Revision ID: 9d4b6e1f0a37
+Revises: 0c3f8d27a91e
+Create Date: 2026-10-17 13:21:07.412980
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '9d4b6e1f0a37'
+down_revision: Union[str, None] = '0c3f8d27a91e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('item', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+    op.create_index('ix_item_search_vector', 'item', ['search_vector'], unique=False, postgresql_using='gin')
+    # Titles weigh A, skill titles B and skill descriptions C, so an item
+    # update can swap its own lexemes and keep the skill ones.
+    op.execute("""
+        CREATE FUNCTION refresh_item_search_vectors(item_ingame_ids integer[])
+        RETURNS void AS $$
+            UPDATE item
+            SET search_vector = setweight(to_tsvector('english', item.title), 'A')
+                || coalesce(skills.search_vector, '')
+            FROM (
+                SELECT
+                    affected.ingame_id,
+                    setweight(to_tsvector('english', string_agg(skill.title, ' ')), 'B')
+                    || setweight(to_tsvector('english', string_agg(skill.description, ' ')), 'C')
+                    AS search_vector
+                FROM unnest(item_ingame_ids) AS affected(ingame_id)
+                LEFT JOIN skill ON skill.item_ingame_id = affected.ingame_id
+                GROUP BY affected.ingame_id
+            ) AS skills
+            WHERE item.ingame_id = skills.ingame_id
+        $$ LANGUAGE sql
+    """)
+    op.execute("""
+        CREATE FUNCTION set_item_search_vector() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector := setweight(to_tsvector('english', NEW.title), 'A');
+            IF TG_OP = 'UPDATE' THEN
+                NEW.search_vector := NEW.search_vector
+                    || ts_filter(coalesce(OLD.search_vector, ''), '{b,c}');
+            END IF;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER item_set_search_vector
+        BEFORE INSERT OR UPDATE OF title ON item
+        FOR EACH ROW EXECUTE FUNCTION set_item_search_vector()
+    """)
+    # Skill changes are applied once per statement from the transition tables,
+    # so bulk COPY loads refresh each affected item with a single join.
+    op.execute("""
+        CREATE FUNCTION refresh_item_search_vector() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                PERFORM refresh_item_search_vectors(
+                    ARRAY(SELECT DISTINCT item_ingame_id FROM new_skill)
+                );
+            END IF;
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                PERFORM refresh_item_search_vectors(
+                    ARRAY(SELECT DISTINCT item_ingame_id FROM old_skill)
+                );
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER skill_insert_refresh_item_search_vector
+        AFTER INSERT ON skill REFERENCING NEW TABLE AS new_skill
+        FOR EACH STATEMENT EXECUTE FUNCTION refresh_item_search_vector()
+    """)
+    op.execute("""
+        CREATE TRIGGER skill_update_refresh_item_search_vector
+        AFTER UPDATE ON skill REFERENCING OLD TABLE AS old_skill NEW TABLE AS new_skill
+        FOR EACH STATEMENT EXECUTE FUNCTION refresh_item_search_vector()
+    """)
+    op.execute("""
+        CREATE TRIGGER skill_delete_refresh_item_search_vector
+        AFTER DELETE ON skill REFERENCING OLD TABLE AS old_skill
+        FOR EACH STATEMENT EXECUTE FUNCTION refresh_item_search_vector()
+    """)
+    op.execute("SELECT refresh_item_search_vectors(ARRAY(SELECT ingame_id FROM item))")
+
+def downgrade() -> None:
+    for operation in ('insert', 'update', 'delete'):
+        op.execute(f"DROP TRIGGER skill_{operation}_refresh_item_search_vector ON skill")
+    op.execute("DROP FUNCTION refresh_item_search_vector()")
+    op.execute("DROP TRIGGER item_set_search_vector ON item")
+    op.execute("DROP FUNCTION set_item_search_vector()")
+    op.execute("DROP FUNCTION refresh_item_search_vectors(integer[])")
+    op.drop_index('ix_item_search_vector', table_name='item', postgresql_using='gin')
+    op.drop_column('item', 'search_vector')
@@ -1,18 +1,25 @@
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, AsyncIterator
+from contextlib import asynccontextmanager
 from typing import Annotated
 
 import jwt
-from fastapi import Depends
+from fastapi import Depends, Request
 from fastapi.exceptions import HTTPException
 from fastapi.security import OAuth2PasswordBearer
 from jwt.exceptions import InvalidTokenError
 from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.types import Scope
 
+from app import crud
 from app.core import security
 from app.core.config import settings
-from app.core.db import engine
-from app.models import User
+from app.core.db import engine, replica_router
+from app.core.etag import make_etag, not_modified, validator_headers
+from app.core.middleware import READ_YOUR_WRITES_HEADER
+from app.core.security import Principal
+from app.models import CatalogVersion, User
 from app.schemas import TokenPayload
 
 reusable_oauth2 = OAuth2PasswordBearer(
@@ -30,7 +37,65 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
 SessionDep = Annotated[AsyncSession, Depends(get_db)]
 
 
-async def get_current_user(session: SessionDep, token: TokenDep) -> User:
+@asynccontextmanager
+async def read_session(request: Request) -> AsyncIterator[AsyncSession]:
+    if replica_router.available and READ_YOUR_WRITES_HEADER not in request.headers:
+        assert replica_router.replica is not None
+        async with AsyncSession(replica_router.replica) as session:
+            try:
+                await session.connection()
+            except (OSError, SQLAlchemyError):
+                replica_router.mark_failed()
+            else:
+                yield session
+                return
+    async with AsyncSession(engine) as session:
+        yield session
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    async with read_session(request) as session:
+        yield session
+
+
+ReadSessionDep = Annotated[AsyncSession, Depends(get_read_db)]
+
+
+async def get_catalog_version(
+    request: Request, session: ReadSessionDep
+) -> CatalogVersion:
+    catalog_version = await crud.get_catalog_version(session)
+    etag = make_etag(catalog_version.version)
+    if not_modified(request.headers, etag, catalog_version.updated_at):
+        raise HTTPException(
+            status_code=304,
+            headers=validator_headers(etag, catalog_version.updated_at),
+        )
+    return catalog_version
+
+
+CatalogVersionDep = Annotated[CatalogVersion, Depends(get_catalog_version)]
+
+
+async def read_catalog_version(scope: Scope) -> int:
+    async with read_session(Request(scope)) as session:
+        catalog_version = await crud.get_catalog_version(session)
+    return catalog_version.version
+
+
+def cache_principal(user: User) -> Principal:
+    principal = Principal(
+        id=user.id,
+        email=user.email,
+        name=user.name,
+        is_active=user.is_active,
+        is_superuser=user.is_superuser,
+    )
+    security.principal_cache.set(user.id, principal)
+    return principal
+
+
+async def get_current_principal(session: SessionDep, token: TokenDep) -> Principal:
     try:
         decoded = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[security.ALGORITHM]
@@ -41,10 +106,27 @@ async def get_current_user(session: SessionDep, token: TokenDep) -> User:
             status_code=403,
             detail="Could not validate credentials",
         ) from e
-    user = await session.get(User, payload.sub)
+    principal = security.principal_cache.get(payload.sub)
+    if principal is None:
+        user = await session.get(User, payload.sub)
+        if user is None:
+            raise HTTPException(status_code=404, detail="User not found")
+        principal = cache_principal(user)
+    if not principal.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    return principal
+
+
+CurrentPrincipal = Annotated[Principal, Depends(get_current_principal)]
+
+
+async def get_current_user(session: SessionDep, principal: CurrentPrincipal) -> User:
+    user = await session.get(User, principal.id)
     if user is None:
         raise HTTPException(status_code=404, detail="User not found")
-    if not user.is_active:
+    # The cached principal may predate a deactivation in another worker, writes
+    # go by the row just loaded.
+    if not cache_principal(user).is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return user
 
@@ -52,9 +134,24 @@ async def get_current_user(session: SessionDep, token: TokenDep) -> User:
 CurrentUser = Annotated[User, Depends(get_current_user)]
 
 
-async def get_current_active_superuser(current_user: CurrentUser) -> User:
-    if not current_user.is_superuser:
+async def confirm_superuser(session: AsyncSession, principal: Principal) -> Principal:
+    # The principal cache is per worker, so a demotion or deactivation in
+    # another worker is checked against the database before granting access.
+    if principal.is_superuser:
+        user = await session.get(User, principal.id)
+        if user is None:
+            raise HTTPException(status_code=404, detail="User not found")
+        principal = cache_principal(user)
+        if not principal.is_active:
+            raise HTTPException(status_code=400, detail="Inactive user")
+    if not principal.is_superuser:
         raise HTTPException(
             status_code=403, detail="The user doesn't have enough privileges"
         )
-    return current_user
+    return principal
+
+
+async def get_current_active_superuser(
+    session: SessionDep, principal: CurrentPrincipal
+) -> Principal:
+    return await confirm_superuser(session, principal)
@@ -1,8 +1,10 @@
 from fastapi import APIRouter
 
-from app.api.routes import items, login, users
+from app.api.routes import images, items, login, users, utils
 
 api_router = APIRouter()
 api_router.include_router(items.router)
+api_router.include_router(images.router)
 api_router.include_router(users.router)
 api_router.include_router(login.router)
+api_router.include_router(utils.router)
@@ -0,0 +1,34 @@
+import asyncio
+import time
+from typing import Any
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.db import engine, health_engine
+from app.core.pool import pool_status
+
+router = APIRouter(tags=["health"])
+
+HEALTH_CHECK_TIMEOUT_SECONDS = 5
+
+
+@router.get("/healthz")
+async def healthz() -> Any:
+    try:
+        async with asyncio.timeout(HEALTH_CHECK_TIMEOUT_SECONDS):
+            async with health_engine.connect() as connection:
+                start = time.perf_counter()
+                await connection.execute(text("SELECT 1"))
+                latency_ms = (time.perf_counter() - start) * 1000
+    except (SQLAlchemyError, OSError, TimeoutError):
+        return JSONResponse(
+            {"status": "unavailable", "pool": pool_status(engine)}, status_code=503
+        )
+    return {
+        "status": "ok",
+        "database": {"latency_ms": latency_ms},
+        "pool": pool_status(engine),
+    }
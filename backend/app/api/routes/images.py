@@ -0,0 +1,33 @@
+from typing import Annotated
+
+from fastapi import APIRouter, HTTPException, Path, Query, Request
+from fastapi.responses import FileResponse
+
+from app.core.config import settings
+from app.core.etag import not_modified
+from app.images.store import image_store
+from app.images.variants import MEDIA_TYPES
+
+router = APIRouter(prefix="/images", tags=["images"])
+
+
+@router.get("/{image_id}", response_class=FileResponse)
+async def read_image(
+    request: Request,
+    image_id: Annotated[int, Path(ge=0)],
+    w: Annotated[int | None, Query(ge=1, description="Rendered width")] = None,
+) -> FileResponse:
+    found = image_store.find(image_id, request.headers.get("accept"), w)
+    if found is None:
+        raise HTTPException(status_code=404, detail="Image not found")
+    path, image_format = found
+    # Variants are stored under the hash of their content.
+    etag = f'"{path.stem}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={settings.IMAGES_MAX_AGE_SECONDS}",
+        "Vary": "Accept",
+    }
+    if not_modified(request.headers, etag, None):
+        raise HTTPException(status_code=304, headers=headers)
+    return FileResponse(path, media_type=MEDIA_TYPES[image_format], headers=headers)
@@ -1,50 +1,403 @@
-from typing import Any
+from collections.abc import AsyncIterator
+from dataclasses import asdict
+from typing import Annotated, Any
 
-from fastapi import APIRouter, HTTPException, Path
-from sqlalchemy import func, select
-from sqlalchemy.orm import joinedload
+from fastapi import APIRouter, HTTPException, Path, Query, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from hg2_item_parser.enums import DamageType, WeaponType
+from sqlalchemy import (
+    ARRAY,
+    Integer,
+    Text,
+    and_,
+    any_,
+    bindparam,
+    cast,
+    func,
+    or_,
+    select,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import SessionDep
-from app.models import Item
-from app.schemas import ItemReadSchema, ItemsReadSchema
+from app.api.deps import CatalogVersionDep, ReadSessionDep, read_session
+from app.core.cache import ITEMS_LIST_KEY, item_key
+from app.core.config import settings
+from app.core.counts import CountStrategy, count_column, resolve_count
+from app.core.etag import make_etag, validator_headers
+from app.core.middleware import SURROGATE_KEY_HEADER
+from app.core.pagination import InvalidCursorError, decode_cursor, encode_cursor
+from app.filters import ItemFilters, facet_counts
+from app.models import CatalogVersion, Item
+from app.projection import (
+    InvalidProjectionError,
+    ItemProjection,
+    encode_document,
+)
+from app.schemas import (
+    ItemRankingsSchema,
+    ItemReadSchema,
+    ItemsBatchRequestSchema,
+    ItemsBatchSchema,
+    ItemsReadSchema,
+    ItemsSearchSchema,
+)
+from app.stats import Metric, stats_cache
 
 router = APIRouter(prefix="/items", tags=["items"])
 
+# Must match the text search configuration used by the search_vector triggers.
+SEARCH_CONFIG = "english"
+REVISION_LENGTH = 12
+# ingame_id is an int4 column, larger ids cannot be sent as parameters.
+MAX_INGAME_ID = 2**31 - 1
+
+
+def valid_cursor_id(ingame_id: int) -> int:
+    if not 0 <= ingame_id <= MAX_INGAME_ID:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return ingame_id
+
+
+def parse_after(after: str) -> int:
+    if after.isdecimal():
+        return valid_cursor_id(int(after))
+    try:
+        (ingame_id,) = decode_cursor(after, int)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from e
+    return valid_cursor_id(int(ingame_id))
+
+
+def parse_search_after(after: str) -> tuple[float, int]:
+    try:
+        rank, ingame_id = decode_cursor(after, float, int)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from e
+    return float(rank), valid_cursor_id(int(ingame_id))
+
+
+def parse_projection(fields: str | None, include: str | None) -> ItemProjection:
+    try:
+        return ItemProjection.parse(fields, include)
+    except InvalidProjectionError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+
+def catalog_headers(catalog_version: CatalogVersion) -> dict[str, str]:
+    etag = make_etag(catalog_version.version)
+    return validator_headers(etag, catalog_version.updated_at)
+
 
 @router.get("/", response_model=ItemsReadSchema)
-async def read_items(session: SessionDep, skip: int = 0, limit: int = 100) -> Any:
-    count_query = select(func.count()).select_from(Item)
-    count_result = await session.execute(count_query)
-    count = count_result.scalars().one()
+async def read_items(
+    session: ReadSessionDep,
+    catalog_version: CatalogVersionDep,
+    skip: int = 0,
+    limit: Annotated[int, Query(ge=1, le=settings.ITEMS_MAX_LIMIT)] = 100,
+    after: str | None = None,
+    fields: str | None = None,
+    include: str | None = None,
+    rarity: Annotated[list[int] | None, Query()] = None,
+    damage_type: Annotated[list[DamageType] | None, Query()] = None,
+    weapon_type: Annotated[list[WeaponType] | None, Query()] = None,
+    facets: bool = False,
+) -> Any:
+    projection = parse_projection(fields, include)
+    filters = ItemFilters(
+        rarity=tuple(rarity or ()),
+        damage_type=tuple(damage_type or ()),
+        weapon_type=tuple(weapon_type or ()),
+    )
+    count_strategy = CountStrategy(settings.ITEMS_COUNT_STRATEGY)
+    if filters:
+        # Cached and estimated counts only exist for the whole table.
+        count_strategy = CountStrategy.EXACT
+    render_in_database = settings.ITEMS_RENDER_STRATEGY == "database"
+    items_query = select(Item.ingame_id) if render_in_database else projection.select()
     items_query = (
-        select(Item)
-        .offset(skip)
-        .limit(limit)
-        .options(
-            joinedload(Item.properties),
-            joinedload(Item.skills),
+        items_query.where(*filters.clauses).limit(limit).order_by(Item.ingame_id)
+    )
+    total = count_column(
+        count_strategy, Item, keyset=after is not None, where=filters.clauses
+    )
+    if total is not None:
+        items_query = items_query.add_columns(total.label("total"))
+    if after is not None:
+        items_query = items_query.where(Item.ingame_id > parse_after(after))
+    else:
+        items_query = items_query.offset(skip)
+    if render_in_database:
+        documents_result = await session.execute(
+            projection.documents_select(items_query)
+        )
+        documents = documents_result.one()
+        data: Any = documents.data
+        ingame_ids: list[int] = documents.ingame_ids or []
+        counted = documents.total
+    else:
+        items_result = await session.execute(items_query)
+        rows = items_result.all()
+        data = await projection.load(session, rows)
+        ingame_ids = [row.ingame_id for row in rows]
+        counted = rows[0].total if rows and total is not None else None
+    seen = len(ingame_ids) if after is not None else skip + len(ingame_ids)
+    count = await resolve_count(
+        session, count_strategy, Item, counted, at_least=seen, where=filters.clauses
+    )
+    next_cursor = None
+    if ingame_ids and len(ingame_ids) == limit:
+        next_cursor = encode_cursor(ingame_ids[-1])
+    content: dict[str, Any] = {
+        "count": count,
+        "count_kind": count_strategy,
+        "next_cursor": next_cursor,
+    }
+    if facets:
+        content["facets"] = await facet_counts(session, filters)
+
+    surrogate_keys = [ITEMS_LIST_KEY, *(item_key(i) for i in ingame_ids)]
+    headers = {
+        SURROGATE_KEY_HEADER: " ".join(surrogate_keys),
+        **catalog_headers(catalog_version),
+    }
+    if render_in_database:
+        return Response(
+            encode_document(data, content),
+            media_type="application/json",
+            headers=headers,
         )
+    # Rows come from our own tables, already in the response schema's shape, so
+    # they are encoded as read instead of being validated again.
+    return ORJSONResponse({"data": data, **content}, headers=headers)
+
+
+@router.get("/export.ndjson", response_class=StreamingResponse)
+async def export_items(
+    request: Request,
+    fields: str | None = None,
+    include: str | None = None,
+    rarity: Annotated[list[int] | None, Query()] = None,
+    damage_type: Annotated[list[DamageType] | None, Query()] = None,
+    weapon_type: Annotated[list[WeaponType] | None, Query()] = None,
+) -> Any:
+    projection = parse_projection(fields, include)
+    filters = ItemFilters(
+        rarity=tuple(rarity or ()),
+        damage_type=tuple(damage_type or ()),
+        weapon_type=tuple(weapon_type or ()),
+    )
+    query = (
+        select(cast(projection.document(), Text))
+        .where(*filters.clauses)
         .order_by(Item.ingame_id)
+        .execution_options(yield_per=settings.ITEMS_EXPORT_CHUNK_SIZE)
+    )
+
+    async def lines() -> AsyncIterator[bytes]:
+        # The body is sent after dependencies have closed their sessions, so
+        # the generator holds its own session and server side cursor.
+        async with read_session(request) as session:
+            documents = await session.stream_scalars(query)
+            async for chunk in documents.partitions():
+                yield "".join(f"{document}\n" for document in chunk).encode()
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@router.get("/revisions")
+async def read_item_revisions(
+    session: ReadSessionDep,
+    catalog_version: CatalogVersionDep,
+    fields: str | None = None,
+    include: str | None = None,
+) -> Any:
+    # A hash of each item's document for the same projection, clients keeping
+    # a local copy refetch only the items whose hash changed.
+    projection = parse_projection(fields, include)
+    revision = func.left(func.md5(cast(projection.document(), Text)), REVISION_LENGTH)
+    result = await session.execute(
+        select(Item.ingame_id, revision).order_by(Item.ingame_id)
     )
+    revisions = [[ingame_id, revision] for ingame_id, revision in result.tuples()]
+    return ORJSONResponse(
+        {"version": catalog_version.version, "data": revisions},
+        headers={
+            SURROGATE_KEY_HEADER: ITEMS_LIST_KEY,
+            **catalog_headers(catalog_version),
+        },
+    )
+
+
+@router.get("/search", response_model=ItemsSearchSchema)
+async def search_items(
+    session: ReadSessionDep,
+    catalog_version: CatalogVersionDep,
+    q: str = Query(min_length=1, max_length=256),
+    limit: Annotated[int, Query(ge=1, le=settings.ITEMS_MAX_LIMIT)] = 100,
+    after: str | None = None,
+    fields: str | None = None,
+    include: str | None = None,
+) -> Any:
+    projection = parse_projection(fields, include)
+    # As a subquery the tsquery is built once per statement, not once per
+    # matching row when Postgres switches the prepared statement to a generic
+    # plan.
+    ts_query = select(func.websearch_to_tsquery(SEARCH_CONFIG, q)).scalar_subquery()
+    rank = func.ts_rank(Item.search_vector, ts_query)
+    rank_column = rank.label("rank")
+    items_query = (
+        projection.select()
+        .add_columns(rank_column)
+        .where(Item.search_vector.bool_op("@@")(ts_query))
+        .order_by(rank_column.desc(), Item.ingame_id)
+        .limit(limit)
+    )
+    if after is not None:
+        after_rank, after_ingame_id = parse_search_after(after)
+        items_query = items_query.where(
+            or_(
+                rank < after_rank,
+                and_(rank == after_rank, Item.ingame_id > after_ingame_id),
+            )
+        )
     items_result = await session.execute(items_query)
-    items = items_result.scalars().unique().all()
+    rows = items_result.all()
+    items = await projection.load(session, rows)
+    next_cursor = None
+    if rows and len(rows) == limit:
+        next_cursor = encode_cursor(rows[-1].rank, rows[-1].ingame_id)
 
-    return ItemsReadSchema(data=items, count=count)
+    surrogate_keys = [ITEMS_LIST_KEY, *(item_key(row.ingame_id) for row in rows)]
+    return ORJSONResponse(
+        {"data": items, "next_cursor": next_cursor},
+        headers={
+            SURROGATE_KEY_HEADER: " ".join(surrogate_keys),
+            **catalog_headers(catalog_version),
+        },
+    )
 
 
-@router.get("/{item_id}", response_model=ItemReadSchema)
-async def read_item(session: SessionDep, item_id: int = Path(ge=1)) -> Any:
-    query = (
-        select(Item)
-        .where(Item.ingame_id == item_id)
-        .options(
-            joinedload(Item.properties),
-            joinedload(Item.skills),
+def parse_ids(ids: str) -> list[int]:
+    try:
+        return [int(ingame_id) for ingame_id in ids.split(",")]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail="Invalid ids") from e
+
+
+def unique_ids(ingame_ids: list[int]) -> list[int]:
+    # Repeated ids are returned once, at their first position.
+    ingame_ids = list(dict.fromkeys(ingame_ids))
+    if len(ingame_ids) > settings.ITEMS_BATCH_MAX_IDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.ITEMS_BATCH_MAX_IDS} ids per batch",
+        )
+    return ingame_ids
+
+
+async def read_batch(
+    session: AsyncSession, ingame_ids: list[int], projection: ItemProjection
+) -> tuple[list[dict[str, Any]], list[int]]:
+    # Ids no item can have are reported missing without a query.
+    valid_ids = [i for i in ingame_ids if 1 <= i <= MAX_INGAME_ID]
+    rows = []
+    if valid_ids:
+        # One array parameter, so every batch size shares a prepared statement.
+        query = projection.select().where(
+            Item.ingame_id == any_(bindparam("ingame_ids", valid_ids, ARRAY(Integer)))
         )
+        result = await session.execute(query)
+        rows = list(result.all())
+    loaded = await projection.load(session, rows)
+    items = {row.ingame_id: item for row, item in zip(rows, loaded, strict=True)}
+    data = [items[i] for i in ingame_ids if i in items]
+    missing = [i for i in ingame_ids if i not in items]
+    return data, missing
+
+
+@router.get("/batch", response_model=ItemsBatchSchema)
+async def read_items_batch(
+    session: ReadSessionDep,
+    catalog_version: CatalogVersionDep,
+    ids: str = Query(description="Comma separated ingame_ids"),
+    fields: str | None = None,
+    include: str | None = None,
+) -> Any:
+    projection = parse_projection(fields, include)
+    ingame_ids = unique_ids(parse_ids(ids))
+    data, missing = await read_batch(session, ingame_ids, projection)
+    # The list key also purges batches when one of the missing ids is created.
+    surrogate_keys = [ITEMS_LIST_KEY, *(item_key(i) for i in ingame_ids)]
+    return ORJSONResponse(
+        {"data": data, "missing": missing},
+        headers={
+            SURROGATE_KEY_HEADER: " ".join(surrogate_keys),
+            **catalog_headers(catalog_version),
+        },
     )
+
+
+@router.post("/batch", response_model=ItemsBatchSchema)
+async def read_items_batch_post(
+    session: ReadSessionDep,
+    batch: ItemsBatchRequestSchema,
+    fields: str | None = None,
+    include: str | None = None,
+) -> Any:
+    projection = parse_projection(fields, include)
+    data, missing = await read_batch(session, unique_ids(batch.ids), projection)
+    return ORJSONResponse({"data": data, "missing": missing})
+
+
+@router.get("/rankings", response_model=ItemRankingsSchema)
+async def read_item_rankings(
+    session: ReadSessionDep,
+    catalog_version: CatalogVersionDep,
+    metric: Metric = Metric.DPS,
+    level: Annotated[
+        int | None, Query(ge=1, le=99, description="Defaults to each max_lvl")
+    ] = None,
+    weapon_type: Annotated[list[WeaponType] | None, Query()] = None,
+    limit: Annotated[int, Query(ge=1)] = 100,
+) -> Any:
+    stats = await stats_cache.get(session, catalog_version.version)
+    rankings = stats.rank(metric, level, weapon_type or (), limit)
+    return ORJSONResponse(
+        {
+            "metric": metric,
+            "level": level,
+            "data": [asdict(ranking) for ranking in rankings],
+        },
+        headers={
+            SURROGATE_KEY_HEADER: ITEMS_LIST_KEY,
+            **catalog_headers(catalog_version),
+        },
+    )
+
+
+@router.get("/{item_id}", response_model=ItemReadSchema)
+async def read_item(
+    session: ReadSessionDep,
+    catalog_version: CatalogVersionDep,
+    item_id: int = Path(ge=1),
+    fields: str | None = None,
+    include: str | None = None,
+    skill_level: Annotated[
+        int | None, Query(ge=1, le=99, description="Level to render skills at")
+    ] = None,
+) -> Any:
+    projection = parse_projection(fields, include)
+    query = projection.select().where(Item.ingame_id == item_id)
     result = await session.execute(query)
-    item = result.scalars().unique().first()
-    if item is None:
+    rows = result.all()
+    if not rows:
         raise HTTPException(status_code=404, detail="Item not found")
+    (item,) = await projection.load(session, rows, skill_level=skill_level)
 
-    return item
+    return ORJSONResponse(
+        item,
+        headers={
+            SURROGATE_KEY_HEADER: item_key(item_id),
+            **catalog_headers(catalog_version),
+        },
+    )
@@ -1,11 +1,24 @@
 from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException, Path
-from sqlalchemy import func, select
+from sqlalchemy import select
 
 from app import crud
-from app.api.deps import CurrentUser, SessionDep, get_current_active_superuser
-from app.core.security import get_password_hash, verify_password
+from app.api.deps import (
+    CurrentPrincipal,
+    CurrentUser,
+    ReadSessionDep,
+    SessionDep,
+    confirm_superuser,
+    get_current_active_superuser,
+)
+from app.core.config import settings
+from app.core.counts import CountStrategy, count_column, resolve_count
+from app.core.security import (
+    get_password_hash_async,
+    invalidate_principal,
+    verify_password_async,
+)
 from app.models import User
 from app.schemas import (
     Message,
@@ -25,20 +38,26 @@ router = APIRouter(prefix="/users", tags=["users"])
     dependencies=[Depends(get_current_active_superuser)],
     response_model=UsersReadSchema,
 )
-async def read_users(session: SessionDep, skip: int = 0, limit: int = 100) -> Any:
-    count_query = select(func.count()).select_from(User)
-    count_result = await session.execute(count_query)
-    count = count_result.scalars().one()
+async def read_users(session: ReadSessionDep, skip: int = 0, limit: int = 100) -> Any:
+    count_strategy = CountStrategy(settings.USERS_COUNT_STRATEGY)
     users_query = select(User).offset(skip).limit(limit).order_by(User.name)
+    total = count_column(count_strategy, User)
+    if total is not None:
+        users_query = users_query.add_columns(total)
     users_result = await session.execute(users_query)
-    users = users_result.scalars().all()
+    rows = users_result.all()
+    users = [row[0] for row in rows]
+    counted = rows[0][1] if rows and total is not None else None
+    count = await resolve_count(
+        session, count_strategy, User, counted, at_least=skip + len(users)
+    )
 
-    return UsersReadSchema(data=users, count=count)
+    return UsersReadSchema(data=users, count=count, count_kind=count_strategy)
 
 
 @router.get("/me", response_model=UserReadSchema)
-async def read_user_me(current_user: CurrentUser) -> Any:
-    return current_user
+async def read_user_me(principal: CurrentPrincipal) -> Any:
+    return principal
 
 
 @router.patch("/me", response_model=UserReadSchema)
@@ -71,16 +90,20 @@ async def update_user_me(
 async def update_password_me(
     session: SessionDep, body: UpdatePassword, current_user: CurrentUser
 ) -> Any:
-    if not verify_password(body.current_password, current_user.hashed_password):
+    if not await verify_password_async(
+        body.current_password, current_user.hashed_password
+    ):
         raise HTTPException(status_code=400, detail="Incorrect password")
     if body.current_password == body.new_password:
         raise HTTPException(
             status_code=400, detail="New password cannot be the same as the current one"
         )
-    hashed_password = get_password_hash(body.new_password)
+    hashed_password = await get_password_hash_async(body.new_password)
+    user_id = current_user.id
     current_user.hashed_password = hashed_password
     session.add(current_user)
     await session.commit()
+    invalidate_principal(user_id)
     return Message(message="Password updated successfully")
 
 
@@ -93,8 +116,7 @@ async def delete_user_me(
         raise HTTPException(
             status_code=403, detail="Super users are not allowed to delete themselves"
         )
-    await session.delete(current_user)
-    await session.commit()
+    await crud.delete_user(session, current_user)
     return Message(message="User deleted successfully")
 
 
@@ -103,15 +125,13 @@ async def delete_user_me(
     response_model=UserReadSchema,
 )
 async def read_user(
-    session: SessionDep, current_user: CurrentUser, username: str = Path(max_length=32)
+    session: SessionDep,
+    principal: CurrentPrincipal,
+    username: str = Path(max_length=32),
 ) -> Any:
-    if username == current_user.name:
-        return current_user
-    if not current_user.is_superuser:
-        raise HTTPException(
-            status_code=403,
-            detail="The user doesn't have enough privileges",
-        )
+    if username == principal.name:
+        return principal
+    await confirm_superuser(session, principal)
     user = await crud.get_user_by_name(session, username)
     if user is None:
         raise HTTPException(
@@ -201,15 +221,16 @@ async def update_user(
 
 @router.delete("/{username}", dependencies=[Depends(get_current_active_superuser)])
 async def delete_user(
-    session: SessionDep, current_user: CurrentUser, username: str = Path(max_length=32)
+    session: SessionDep,
+    principal: CurrentPrincipal,
+    username: str = Path(max_length=32),
 ) -> Message:
     user = await crud.get_user_by_name(session, username)
     if user is None:
         raise HTTPException(status_code=404, detail="User not found")
-    if user == current_user:
+    if user.id == principal.id:
         raise HTTPException(
             status_code=403, detail="Super users are not allowed to delete themselves"
         )
-    await session.delete(user)
-    await session.commit()
+    await crud.delete_user(session, user)
     return Message(message="User deleted successfully")
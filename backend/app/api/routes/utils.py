@@ -0,0 +1,19 @@
+from typing import Any
+
+from fastapi import APIRouter, Depends
+
+from app.api.deps import get_current_active_superuser
+from app.core.db import engine, replica_router
+from app.core.pool import pool_status
+from app.core.security import hashing_metrics
+
+router = APIRouter(prefix="/utils", tags=["utils"])
+
+
+@router.get("/metrics", dependencies=[Depends(get_current_active_superuser)])
+async def read_metrics() -> Any:
+    return {
+        "password_hashing": hashing_metrics.snapshot(),
+        "database_pool": pool_status(engine),
+        "database_replica": replica_router.snapshot(),
+    }
@@ -0,0 +1,41 @@
+import argparse
+import logging
+import os
+from pathlib import Path
+
+from app.core.config import settings
+from app.images.build import build_images
+from app.images.store import configured_options
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Render resized item image variants into the image cache"
+    )
+    parser.add_argument("--source", type=Path, default=settings.IMAGES_SOURCE_DIR)
+    parser.add_argument("--cache", type=Path, default=settings.IMAGES_CACHE_DIR)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Image processes",
+    )
+    args = parser.parse_args()
+    report = build_images(
+        args.source, args.cache, configured_options(), workers=args.workers
+    )
+    logger.info(
+        "%s rendered, %s unchanged, %s removed, %s failed, %s objects pruned",
+        report.rendered,
+        report.unchanged,
+        report.removed,
+        report.failed,
+        report.pruned,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+import argparse
+import gzip
+import hashlib
+import logging
+import posixpath
+import re
+import shutil
+from pathlib import Path
+
+import brotli
+
+from app.core.config import settings
+from app.core.static import PRECOMPRESSED_SUFFIXES
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+FINGERPRINTED_SUFFIXES = frozenset({".css", ".js"})
+COMPRESSED_SUFFIXES = frozenset({".css", ".html", ".js", ".json", ".svg", ".txt"})
+REFERENCE = re.compile(r'(?P<attribute>(?:href|src)=")(?P<path>[^"]+)"')
+
+
+def fingerprint(path: Path, content: bytes) -> Path:
+    digest = hashlib.blake2b(content, digest_size=8).hexdigest()
+    return path.with_name(f"{path.stem}.{digest}{path.suffix}")
+
+
+def rewrite_references(html: str, directory: str, names: dict[str, str]) -> str:
+    def replace(match: re.Match[str]) -> str:
+        reference = match["path"]
+        if reference.startswith("/"):
+            target = reference.removeprefix("/")
+        else:
+            target = posixpath.normpath(posixpath.join(directory, reference))
+        if target not in names:
+            return match[0]
+        name = posixpath.basename(names[target])
+        return (
+            f'{match["attribute"]}{posixpath.join(posixpath.dirname(reference), name)}"'
+        )
+
+    return REFERENCE.sub(replace, html)
+
+
+def precompress(path: Path, content: bytes) -> None:
+    # Built once, so both use their slowest and smallest settings.
+    variants = {
+        "gzip": gzip.compress(content, compresslevel=9, mtime=0),
+        "br": brotli.compress(content, quality=11),
+    }
+    for encoding, compressed in variants.items():
+        if len(compressed) < len(content):
+            suffix = PRECOMPRESSED_SUFFIXES[encoding]
+            path.with_name(path.name + suffix).write_bytes(compressed)
+
+
+def build(source: Path, output: Path) -> dict[str, str]:
+    if output.exists():
+        shutil.rmtree(output)
+    files = sorted(path for path in source.rglob("*") if path.is_file())
+    names: dict[str, str] = {}
+    for path in files:
+        if path.suffix in FINGERPRINTED_SUFFIXES:
+            relative = path.relative_to(source)
+            names[relative.as_posix()] = fingerprint(
+                relative, path.read_bytes()
+            ).as_posix()
+
+    for path in files:
+        relative = path.relative_to(source)
+        content = path.read_bytes()
+        if path.suffix == ".html":
+            directory = relative.parent.as_posix()
+            content = rewrite_references(content.decode(), directory, names).encode()
+        target = output / names.get(relative.as_posix(), relative.as_posix())
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(content)
+        if path.suffix in COMPRESSED_SUFFIXES:
+            precompress(target, content)
+    return names
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Fingerprint and precompress the frontend static files"
+    )
+    parser.add_argument("--source", type=Path, default=settings.STATIC_SOURCE_DIR)
+    parser.add_argument("--output", type=Path, default=settings.STATIC_DIR)
+    args = parser.parse_args()
+    names = build(args.source, args.output)
+    for name, fingerprinted in names.items():
+        logger.info("%s -> %s", name, fingerprinted)
+    logger.info("Built %s into %s", args.source, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+from hg2_item_parser.enums import ItemCategory, SkillCategory
+from hg2_item_parser.info_parser import InfoParser
+from hg2_item_parser.property_parser import PropertyParser
+from hg2_item_parser.skill_parser import (
+    EquipSkillParser,
+    PetSkillParser,
+    SkillParser,
+)
+
+from app.catalog.rows import LevelValues, StatValues
+
+EQUIP_PARAMETERS = range(1, 6)
+PET_PARAMETERS = range(1, 7)
+
+
+def equip_level_values(
+    item_skill_data: dict[str, str], item_main_data: dict[str, str], skill_num: int
+) -> LevelValues:
+    slot_num = EquipSkillParser.parse_slot_num(item_skill_data, item_main_data)
+    max_up = EquipSkillParser.parse_max_up(item_skill_data, slot_num)
+    return (
+        [
+            EquipSkillParser.parse_base_value(item_main_data, skill_num, i)
+            for i in EQUIP_PARAMETERS
+        ],
+        [
+            EquipSkillParser.parse_value_per_lvl(item_main_data, skill_num, i)
+            for i in EQUIP_PARAMETERS
+        ],
+        [
+            EquipSkillParser.parse_value_per_up(item_skill_data, slot_num, i) * max_up
+            for i in EQUIP_PARAMETERS
+        ],
+    )
+
+
+def pet_level_values(item_skill_data: dict[str, str]) -> LevelValues:
+    # Pet skill values do not grow with the item level, only with upgrades.
+    max_up = PetSkillParser.parse_max_up(item_skill_data)
+    return (
+        [PetSkillParser.parse_value(item_skill_data, i) for i in PET_PARAMETERS],
+        [0.0 for _ in PET_PARAMETERS],
+        [
+            PetSkillParser.parse_value_per_up(item_skill_data, i) * max_up
+            for i in PET_PARAMETERS
+        ],
+    )
+
+
+def skill_level_values(
+    skill_parser: SkillParser, item_main_data: dict[str, str]
+) -> list[LevelValues]:
+    # The parser only keeps the rendered description, the values behind it
+    # are read again the way SkillParser.parse_skills pairs skills with them.
+    if InfoParser.parse_category(item_main_data) == ItemCategory.PET:
+        pet_skills_data = skill_parser.get_item_skills_data(
+            item_main_data, SkillCategory.PET
+        )
+        return [pet_level_values(data) for data in pet_skills_data]
+    equip_skills_data = skill_parser.get_item_skills_data(
+        item_main_data, SkillCategory.EQUIP
+    )
+    skill_range = EquipSkillParser.parse_skill_range(item_main_data)
+    return [
+        equip_level_values(data, item_main_data, skill_num)
+        for skill_num, data in zip(skill_range, equip_skills_data, strict=False)
+    ]
+
+
+def stat_level_values(item_main_data: dict[str, str]) -> StatValues:
+    return (
+        PropertyParser.parse_base_damage(item_main_data),
+        PropertyParser.parse_damage_per_lvl(item_main_data),
+        PropertyParser.parse_base_atk_speed(item_main_data),
+        PropertyParser.parse_atk_speed_per_lvl(item_main_data),
+        PropertyParser.parse_base_hp(item_main_data),
+        PropertyParser.parse_hp_per_lvl(item_main_data),
+    )
@@ -0,0 +1,90 @@
+from collections.abc import AsyncIterable, Iterable, Mapping, Sequence
+from itertools import batched
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.catalog.rows import (
+    ITEM_COLUMNS,
+    PROPERTIES_COLUMNS,
+    SKILL_COLUMNS,
+    CatalogRows,
+    Record,
+    record_hash,
+)
+from app.models import SkillDescriptionTemplate
+
+CATALOG_TABLES = ("item", "properties", "skill", "skill_description_template")
+# Keeps multi-row statements well below the 32767 bind parameter limit.
+STATEMENT_ROWS = 1000
+
+
+async def copy_records(
+    session: AsyncSession,
+    table_name: str,
+    columns: Sequence[str],
+    records: Sequence[Record],
+) -> None:
+    if not records:
+        return
+    connection = await session.connection()
+    raw_connection = await connection.get_raw_connection()
+    driver_connection: Any = raw_connection.driver_connection
+    # Hashes are written as well, so a later sync sees the rows as unchanged.
+    await driver_connection.copy_records_to_table(
+        table_name,
+        records=[(*record, record_hash(record)) for record in records],
+        columns=[*columns, "content_hash"],
+    )
+
+
+async def upsert_templates(session: AsyncSession, templates: Mapping[int, str]) -> None:
+    # Batches share templates, so they are upserted rather than copied.
+    values = [{"id": i, "template": template} for i, template in templates.items()]
+    for chunk in batched(values, STATEMENT_ROWS):
+        statement = insert(SkillDescriptionTemplate).values(chunk)
+        excluded = statement.excluded.template
+        statement = statement.on_conflict_do_update(
+            index_elements=["id"],
+            set_={"template": excluded},
+            where=SkillDescriptionTemplate.template != excluded,
+        )
+        await session.execute(statement)
+
+
+async def copy_catalog_rows(session: AsyncSession, rows: CatalogRows) -> None:
+    await copy_records(session, "item", ITEM_COLUMNS, rows.items)
+    await copy_records(session, "properties", PROPERTIES_COLUMNS, rows.properties)
+    await upsert_templates(session, rows.templates)
+    await copy_records(session, "skill", SKILL_COLUMNS, rows.skills)
+
+
+async def begin_catalog_write(session: AsyncSession, *, replace: bool) -> None:
+    # Running a statement through the session opens the transaction that
+    # the raw COPY calls then join, and keeps other writers out meanwhile.
+    tables = ", ".join(CATALOG_TABLES)
+    if replace:
+        await session.execute(text(f"TRUNCATE {tables} RESTART IDENTITY"))
+    else:
+        await session.execute(text(f"LOCK TABLE {tables} IN EXCLUSIVE MODE"))
+
+
+async def load_catalog(
+    session: AsyncSession,
+    batches: Iterable[CatalogRows] | AsyncIterable[CatalogRows],
+    *,
+    replace: bool = False,
+) -> int:
+    await begin_catalog_write(session, replace=replace)
+    written = 0
+    if isinstance(batches, AsyncIterable):
+        async for rows in batches:
+            await copy_catalog_rows(session, rows)
+            written += len(rows)
+    else:
+        for rows in batches:
+            await copy_catalog_rows(session, rows)
+            written += len(rows)
+    return written
@@ -0,0 +1,118 @@
+import asyncio
+from collections.abc import AsyncIterator, Callable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from functools import cache, partial
+from pathlib import Path
+
+from hg2_item_parser import ItemParser
+from hg2_item_parser.exceptions import ItemNotFoundError
+from hg2_item_parser.info_parser import InfoParser
+from hg2_item_parser.models import Item as ParsedItem
+from hg2_item_parser.property_parser import PropertyParser
+from hg2_item_parser.skill_parser import SkillParser
+
+from app.catalog.levels import skill_level_values, stat_level_values
+from app.catalog.rows import CatalogRows
+
+type IdRange = tuple[int, int]
+
+
+def id_ranges(first_item_id: int, last_item_id: int, size: int) -> list[IdRange]:
+    return [
+        (start, min(start + size - 1, last_item_id))
+        for start in range(first_item_id, last_item_id + 1, size)
+    ]
+
+
+@cache
+def get_parser(data_dir: Path) -> ItemParser:
+    # Loading the game tables is expensive, each worker does it once.
+    return ItemParser(data_dir)
+
+
+@cache
+def get_skill_parser(data_dir: Path) -> SkillParser:
+    return SkillParser(data_dir)
+
+
+def parse_range(data_dir: Path, id_range: IdRange) -> CatalogRows:
+    parser = get_parser(data_dir)
+    skill_parser = get_skill_parser(data_dir)
+    rows = CatalogRows()
+    first_item_id, last_item_id = id_range
+    for item_id in range(first_item_id, last_item_id + 1):
+        try:
+            item_main_data = parser.search_item_main_data(item_id)
+        except ItemNotFoundError:
+            continue
+        # ItemParser.parse_item would load a new SkillParser for every item.
+        parsed_item = ParsedItem(
+            InfoParser.parse_info(item_main_data),
+            PropertyParser.parse_properties(item_main_data),
+            skill_parser.parse_skills(item_main_data),
+        )
+        rows.add(
+            parsed_item,
+            skill_level_values(skill_parser, item_main_data),
+            stat_level_values(item_main_data),
+        )
+    return rows
+
+
+async def stream_batches(
+    id_ranges: Sequence[IdRange],
+    parse: Callable[[IdRange], CatalogRows],
+    *,
+    workers: int,
+    queue_size: int,
+) -> AsyncIterator[CatalogRows]:
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue[CatalogRows | None] = asyncio.Queue(maxsize=queue_size)
+    slots = asyncio.Semaphore(workers)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+
+        async def parse_into_queue(id_range: IdRange) -> None:
+            # A worker slot is held until the batch fits in the queue, so a
+            # slow consumer stops new ranges from being parsed.
+            async with slots:
+                rows = await loop.run_in_executor(pool, parse, id_range)
+                await queue.put(rows)
+
+        async def produce() -> None:
+            try:
+                async with asyncio.TaskGroup() as task_group:
+                    for id_range in id_ranges:
+                        task_group.create_task(parse_into_queue(id_range))
+            finally:
+                # Also wakes the consumer when parsing failed, the error is
+                # then raised from awaiting the producer.
+                if not producer.cancelling():
+                    await queue.put(None)
+
+        producer = asyncio.create_task(produce())
+        try:
+            while (rows := await queue.get()) is not None:
+                yield rows
+            await producer
+        finally:
+            if not producer.done():
+                producer.cancel()
+                await asyncio.gather(producer, return_exceptions=True)
+
+
+def parse_batches(
+    data_dir: Path,
+    first_item_id: int,
+    last_item_id: int,
+    *,
+    batch_size: int,
+    workers: int,
+    queue_size: int,
+) -> AsyncIterator[CatalogRows]:
+    return stream_batches(
+        id_ranges(first_item_id, last_item_id, batch_size),
+        partial(parse_range, data_dir),
+        workers=workers,
+        queue_size=queue_size,
+    )
@@ -0,0 +1,167 @@
+import hashlib
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass, field
+from enum import Enum
+from itertools import batched
+from typing import Any
+
+from hg2_item_parser.models import Item as ParsedItem
+
+type Record = tuple[Any, ...]
+
+ITEM_COLUMNS = (
+    "ingame_id",
+    "title_id",
+    "title",
+    "image_id",
+    "image_url",
+    "damage_type",
+    "rarity",
+)
+PROPERTIES_COLUMNS = (
+    "max_lvl",
+    "cost",
+    "max_lvl_damage",
+    "max_lvl_ammo",
+    "max_lvl_atk_speed",
+    "max_lvl_hp",
+    "weapon_type",
+    "deploy_limit",
+    "duration",
+    "crit_rate",
+    "base_sync",
+    "max_sync",
+    "base_damage",
+    "damage_per_lvl",
+    "base_atk_speed",
+    "atk_speed_per_lvl",
+    "base_hp",
+    "hp_per_lvl",
+    "item_ingame_id",
+)
+SKILL_COLUMNS = (
+    "ingame_id",
+    "title_id",
+    "title",
+    "description_template_id",
+    "description",
+    "damage_type",
+    "item_ingame_id",
+    "base_values",
+    "level_steps",
+    "max_up_increases",
+)
+
+# Template parameters at level 1, their increase per level and their increase
+# at the maximum skill upgrade, one entry per parsed skill.
+type LevelValues = tuple[list[float], list[float], list[float]]
+# Damage, attack speed and hp at level 1, each followed by its increase per
+# level, in PROPERTIES_COLUMNS order.
+type StatValues = tuple[float | None, ...]
+
+NO_STAT_VALUES: StatValues = (None,) * 6
+
+
+@dataclass
+class CatalogRows:
+    items: list[Record] = field(default_factory=list)
+    properties: list[Record] = field(default_factory=list)
+    skills: list[Record] = field(default_factory=list)
+    # Shared by many skills, stored once per description_template_id.
+    templates: dict[int, str] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return (
+            len(self.items)
+            + len(self.properties)
+            + len(self.skills)
+            + len(self.templates)
+        )
+
+    def extend(self, other: "CatalogRows") -> None:
+        self.items.extend(other.items)
+        self.properties.extend(other.properties)
+        self.skills.extend(other.skills)
+        self.templates.update(other.templates)
+
+    def add(
+        self,
+        parsed_item: ParsedItem,
+        level_values: Sequence[LevelValues] = (),
+        stat_values: StatValues = NO_STAT_VALUES,
+    ) -> None:
+        info = parsed_item.info
+        self.items.append(
+            (
+                info.id,
+                info.title_id,
+                info.title,
+                info.image_id,
+                info.image_url,
+                enum_name(info.damage_type),
+                info.rarity,
+            )
+        )
+        props = parsed_item.properties
+        self.properties.append(
+            (
+                props.max_lvl,
+                props.cost,
+                props.max_lvl_damage,
+                props.max_lvl_ammo,
+                props.max_lvl_atk_speed,
+                props.max_lvl_hp,
+                enum_name(props.weapon_type),
+                props.deploy_limit,
+                props.duration,
+                props.crit_rate,
+                props.base_sync,
+                props.max_sync,
+                *stat_values,
+                info.id,
+            )
+        )
+        for position, skill in enumerate(parsed_item.skills):
+            base_values: list[float] | None = None
+            level_steps: list[float] | None = None
+            max_up_increases: list[float] | None = None
+            if position < len(level_values):
+                base_values, level_steps, max_up_increases = level_values[position]
+            self.templates[skill.description_template_id] = skill.description_template
+            self.skills.append(
+                (
+                    skill.id,
+                    skill.title_id,
+                    skill.title,
+                    skill.description_template_id,
+                    skill.description,
+                    enum_name(skill.damage_type),
+                    info.id,
+                    base_values,
+                    level_steps,
+                    max_up_increases,
+                )
+            )
+
+
+def enum_name(value: Enum | None) -> str | None:
+    # SQLAlchemy persists Python enums by member name.
+    return value.name if value is not None else None
+
+
+def record_hash(record: Record) -> str:
+    return hashlib.blake2b(repr(record).encode(), digest_size=16).hexdigest()
+
+
+def catalog_rows(parsed_items: Iterable[ParsedItem]) -> CatalogRows:
+    rows = CatalogRows()
+    for parsed_item in parsed_items:
+        rows.add(parsed_item)
+    return rows
+
+
+def row_batches(
+    parsed_items: Iterable[ParsedItem], batch_size: int
+) -> Iterator[CatalogRows]:
+    for batch in batched(parsed_items, batch_size):
+        yield catalog_rows(batch)
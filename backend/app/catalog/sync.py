@@ -0,0 +1,200 @@
+from collections import Counter, defaultdict
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from itertools import batched
+from typing import Any
+
+from sqlalchemy import delete, exists, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.catalog.loader import STATEMENT_ROWS, begin_catalog_write, upsert_templates
+from app.catalog.rows import (
+    ITEM_COLUMNS,
+    PROPERTIES_COLUMNS,
+    SKILL_COLUMNS,
+    CatalogRows,
+    Record,
+    record_hash,
+)
+from app.models import Base, Item, Properties, Skill, SkillDescriptionTemplate
+
+
+@dataclass
+class TableSyncReport:
+    inserted: int = 0
+    updated: int = 0
+    deleted: int = 0
+    unchanged: int = 0
+
+
+@dataclass
+class SyncReport:
+    item: TableSyncReport = field(default_factory=TableSyncReport)
+    properties: TableSyncReport = field(default_factory=TableSyncReport)
+    skill: TableSyncReport = field(default_factory=TableSyncReport)
+    skill_description_template: TableSyncReport = field(default_factory=TableSyncReport)
+
+
+def hashed_values(columns: Sequence[str], record: Record) -> dict[str, Any]:
+    return {
+        **dict(zip(columns, record, strict=True)),
+        "content_hash": record_hash(record),
+    }
+
+
+async def upsert(
+    session: AsyncSession,
+    model: type[Base],
+    key: str,
+    values: Sequence[dict[str, Any]],
+) -> None:
+    for chunk in batched(values, STATEMENT_ROWS):
+        statement = insert(model).values(chunk)
+        statement = statement.on_conflict_do_update(
+            index_elements=[key],
+            set_={name: statement.excluded[name] for name in chunk[0] if name != key},
+        )
+        await session.execute(statement)
+
+
+async def sync_keyed(
+    session: AsyncSession,
+    model: type[Item] | type[Properties],
+    key: str,
+    columns: Sequence[str],
+    records: Sequence[Record],
+    report: TableSyncReport,
+) -> None:
+    key_column = getattr(model, key)
+    result = await session.execute(select(key_column, model.content_hash))
+    stored: dict[int, str | None] = dict(result.tuples().all())
+    changed = []
+    for record in records:
+        values = hashed_values(columns, record)
+        if values[key] not in stored:
+            report.inserted += 1
+            changed.append(values)
+        elif stored[values[key]] != values["content_hash"]:
+            report.updated += 1
+            changed.append(values)
+        else:
+            report.unchanged += 1
+    await upsert(session, model, key, changed)
+
+
+async def sync_skills(
+    session: AsyncSession, records: Sequence[Record], report: TableSyncReport
+) -> None:
+    result = await session.execute(
+        select(Skill.id, Skill.item_ingame_id, Skill.content_hash)
+    )
+    stored: dict[int, dict[str | None, list[int]]] = defaultdict(
+        lambda: defaultdict(list)
+    )
+    for skill_id, item_ingame_id, content_hash in result.tuples():
+        stored[item_ingame_id][content_hash].append(skill_id)
+    fresh: dict[int, list[dict[str, Any]]] = defaultdict(list)
+    for record in records:
+        values = hashed_values(SKILL_COLUMNS, record)
+        fresh[values["item_ingame_id"]].append(values)
+
+    inserts: list[dict[str, Any]] = []
+    updates: list[dict[str, Any]] = []
+    stale_ids: list[int] = []
+    for item_ingame_id in stored.keys() | fresh.keys():
+        stored_ids = stored.get(item_ingame_id, {})
+        pending = []
+        remaining = Counter({h: len(ids) for h, ids in stored_ids.items()})
+        for values in fresh.get(item_ingame_id, []):
+            if remaining[values["content_hash"]] > 0:
+                remaining[values["content_hash"]] -= 1
+                report.unchanged += 1
+            else:
+                pending.append(values)
+        # Rows that no longer match are rewritten in place before any
+        # insert or delete, so skill ids stay stable across small edits.
+        leftover = [
+            skill_id
+            for content_hash, ids in stored_ids.items()
+            for skill_id in ids[len(ids) - remaining[content_hash] :]
+        ]
+        for skill_id, values in zip(leftover, pending, strict=False):
+            updates.append({"id": skill_id, **values})
+        inserts.extend(pending[len(leftover) :])
+        stale_ids.extend(leftover[len(pending) :])
+
+    report.updated += len(updates)
+    report.inserted += len(inserts)
+    report.deleted += len(stale_ids)
+    if stale_ids:
+        await session.execute(delete(Skill).where(Skill.id.in_(stale_ids)))
+    for chunk in batched(updates, STATEMENT_ROWS):
+        await session.execute(update(Skill), list(chunk))
+    for chunk in batched(inserts, STATEMENT_ROWS):
+        await session.execute(insert(Skill).values(chunk))
+
+
+async def sync_templates(
+    session: AsyncSession, templates: dict[int, str], report: TableSyncReport
+) -> None:
+    result = await session.execute(
+        select(SkillDescriptionTemplate.id, SkillDescriptionTemplate.template)
+    )
+    stored = dict(result.tuples().all())
+    changed = {}
+    for template_id, template in templates.items():
+        if template_id not in stored:
+            report.inserted += 1
+            changed[template_id] = template
+        elif stored[template_id] != template:
+            report.updated += 1
+            changed[template_id] = template
+        else:
+            report.unchanged += 1
+    await upsert_templates(session, changed)
+
+
+async def delete_unused_templates(
+    session: AsyncSession, report: TableSyncReport
+) -> None:
+    used = exists().where(Skill.description_template_id == SkillDescriptionTemplate.id)
+    statement = delete(SkillDescriptionTemplate).where(~used)
+    report.deleted += (await session.execute(statement)).rowcount
+
+
+async def delete_missing_items(
+    session: AsyncSession, ingame_ids: set[int], report: SyncReport
+) -> None:
+    result = await session.execute(select(Item.ingame_id))
+    missing = [i for i in result.scalars() if i not in ingame_ids]
+    if not missing:
+        return
+    for model, table_report in (
+        (Skill, report.skill),
+        (Properties, report.properties),
+    ):
+        statement = delete(model).where(model.item_ingame_id.in_(missing))
+        table_report.deleted += (await session.execute(statement)).rowcount
+    statement = delete(Item).where(Item.ingame_id.in_(missing))
+    report.item.deleted += (await session.execute(statement)).rowcount
+
+
+async def sync_catalog(session: AsyncSession, rows: CatalogRows) -> SyncReport:
+    report = SyncReport()
+    await begin_catalog_write(session, replace=False)
+    ingame_ids = {record[ITEM_COLUMNS.index("ingame_id")] for record in rows.items}
+    await delete_missing_items(session, ingame_ids, report)
+    await sync_keyed(session, Item, "ingame_id", ITEM_COLUMNS, rows.items, report.item)
+    await sync_keyed(
+        session,
+        Properties,
+        "item_ingame_id",
+        PROPERTIES_COLUMNS,
+        rows.properties,
+        report.properties,
+    )
+    await sync_templates(session, rows.templates, report.skill_description_template)
+    await sync_skills(session, rows.skills, report.skill)
+    await delete_unused_templates(session, report.skill_description_template)
+    return report
@@ -0,0 +1,145 @@
+import time
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass, field
+
+from app.core.config import settings
+
+
+class TTLCache[K, V]:
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: K) -> V | None:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def discard(self, key: K) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+ITEMS_LIST_KEY = "items:list"
+
+
+def item_key(ingame_id: int) -> str:
+    return f"item:{ingame_id}"
+
+
+@dataclass
+class CachedResponse:
+    status: int
+    headers: list[tuple[bytes, bytes]]
+    body: bytes
+    tags: frozenset[str]
+    expires_at: float
+    # Compressed bodies by content coding, added on first request.
+    variants: dict[str, bytes] = field(default_factory=dict)
+
+    @property
+    def size(self) -> int:
+        headers_size = sum(len(k) + len(v) for k, v in self.headers)
+        variants_size = sum(len(body) for body in self.variants.values())
+        return len(self.body) + headers_size + variants_size
+
+
+class ResponseCache:
+    def __init__(self, max_bytes: int, ttl: float) -> None:
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.size = 0
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._tags: dict[str, set[str]] = defaultdict(set)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> CachedResponse | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def set(
+        self,
+        key: str,
+        status: int,
+        headers: list[tuple[bytes, bytes]],
+        body: bytes,
+        tags: frozenset[str],
+    ) -> CachedResponse:
+        entry = CachedResponse(status, headers, body, tags, time.monotonic() + self.ttl)
+        if entry.size > self.max_bytes:
+            return entry
+        self._remove(key)
+        self._entries[key] = entry
+        self.size += entry.size
+        for tag in tags:
+            self._tags[tag].add(key)
+        self._evict()
+        return entry
+
+    def add_variant(
+        self, key: str, entry: CachedResponse, encoding: str, body: bytes
+    ) -> None:
+        entry.variants[encoding] = body
+        # Entries purged or replaced meanwhile are no longer accounted for.
+        if self._entries.get(key) is entry:
+            self.size += len(body)
+            self._evict()
+
+    def purge(self, *tags: str) -> int:
+        keys = set().union(*(self._tags.get(tag, ()) for tag in tags))
+        for key in keys:
+            self._remove(key)
+        return len(keys)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._tags.clear()
+        self.size = 0
+
+    def _evict(self) -> None:
+        while self.size > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self.size -= entry.size
+        for tag in entry.tags:
+            keys = self._tags[tag]
+            keys.discard(key)
+            if not keys:
+                del self._tags[tag]
+
+
+response_cache = ResponseCache(
+    max_bytes=settings.RESPONSE_CACHE_MAX_BYTES,
+    ttl=settings.RESPONSE_CACHE_TTL_SECONDS,
+)
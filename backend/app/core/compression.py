@@ -0,0 +1,141 @@
+import zlib
+from collections.abc import Mapping
+
+import brotli
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.etag import CONTENT_CODINGS, encoded_etag
+
+COMPRESSIBLE_TYPES = frozenset(
+    {
+        "application/json",
+        "application/x-ndjson",
+        "application/javascript",
+        "application/xml",
+        "image/svg+xml",
+    }
+)
+
+
+def negotiate_encoding(accept_encoding: str | None) -> str | None:
+    if not accept_encoding:
+        return None
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, parameters = part.partition(";")
+        weight = 1.0
+        name, _, value = parameters.strip().partition("=")
+        if name.strip() == "q":
+            try:
+                weight = float(value)
+            except ValueError:
+                weight = 0.0
+        weights[coding.strip().lower()] = weight
+    encoding, best = None, 0.0
+    for candidate in CONTENT_CODINGS:
+        weight = weights.get(candidate, weights.get("*", 0.0))
+        if weight > best:
+            encoding, best = candidate, weight
+    return encoding
+
+
+def compressible(headers: Mapping[str, str]) -> bool:
+    if "content-encoding" in headers:
+        return False
+    # Routes opt out of compression with Cache-Control: no-transform.
+    if "no-transform" in headers.get("cache-control", "").lower():
+        return False
+    content_type = headers.get("content-type", "").partition(";")[0].strip()
+    return content_type.startswith("text/") or content_type in COMPRESSIBLE_TYPES
+
+
+class Compressor:
+    def __init__(self, encoding: str) -> None:
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(
+                quality=settings.COMPRESSION_BROTLI_QUALITY
+            )
+        else:
+            self._zlib = zlib.compressobj(
+                settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS
+            )
+
+    def compress(self, data: bytes, *, final: bool) -> bytes:
+        # Non final chunks are flushed so streamed lines reach the client.
+        if self.encoding == "br":
+            chunk: bytes = self._brotli.process(data)
+            chunk += self._brotli.finish() if final else self._brotli.flush()
+            return chunk
+        flush_mode = zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH
+        return self._zlib.compress(data) + self._zlib.flush(flush_mode)
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    return Compressor(encoding).compress(body, final=True)
+
+
+def set_content_encoding(headers: MutableHeaders, encoding: str) -> None:
+    headers["Content-Encoding"] = encoding
+    etag = headers.get("etag")
+    if etag is not None:
+        headers["ETag"] = encoded_etag(etag, encoding)
+
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"))
+        start: Message = {}
+        compressor: Compressor | None = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start, compressor
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                if not compressible(headers):
+                    await send(message)
+                    return
+                headers.add_vary_header("Accept-Encoding")
+                if encoding is None:
+                    await send(message)
+                    return
+                # Held back until the first body chunk tells whether the
+                # response is worth compressing.
+                start = message
+                return
+            if message["type"] != "http.response.body" or not start:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is None:
+                assert encoding is not None
+                headers = MutableHeaders(scope=start)
+                if not more_body and len(body) < settings.COMPRESSION_MIN_SIZE:
+                    await send(start)
+                    await send(message)
+                    start = {}
+                    return
+                compressor = Compressor(encoding)
+                set_content_encoding(headers, encoding)
+                del headers["content-length"]
+                body = compressor.compress(body, final=not more_body)
+                if not more_body:
+                    headers["Content-Length"] = str(len(body))
+                await send(start)
+            else:
+                body = compressor.compress(body, final=not more_body)
+            await send(
+                {"type": "http.response.body", "body": body, "more_body": more_body}
+            )
+
+        await self.app(scope, receive, send_wrapper)
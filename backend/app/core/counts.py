@@ -0,0 +1,90 @@
+from collections.abc import Sequence
+from enum import StrEnum
+
+from sqlalchemy import BigInteger, Select, cast, column, func, select, table
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import ColumnElement, TableClause
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models import Base
+
+
+class CountStrategy(StrEnum):
+    EXACT = "exact"
+    CACHED = "cached"
+    ESTIMATED = "estimated"
+
+
+pg_class: TableClause = table("pg_class", column("relname"), column("reltuples"))
+
+count_cache: TTLCache[str, int] = TTLCache(
+    maxsize=128, ttl=settings.COUNT_CACHE_TTL_SECONDS
+)
+
+
+def invalidate_count(model: type[Base]) -> None:
+    count_cache.discard(model.__tablename__)
+
+
+def exact_count_query(
+    model: type[Base], where: Sequence[ColumnElement[bool]] = ()
+) -> Select[tuple[int]]:
+    return select(func.count()).select_from(model).where(*where)
+
+
+def estimated_count_query(model: type[Base]) -> Select[tuple[int]]:
+    reltuples = func.greatest(pg_class.c.reltuples, 0)
+    return select(cast(reltuples, BigInteger)).where(
+        pg_class.c.relname == model.__tablename__
+    )
+
+
+def count_column(
+    strategy: CountStrategy,
+    model: type[Base],
+    *,
+    keyset: bool = False,
+    where: Sequence[ColumnElement[bool]] = (),
+) -> ColumnElement[int] | None:
+    if strategy is CountStrategy.EXACT:
+        if keyset:
+            # The cursor predicate would narrow a window count to the rows
+            # after the cursor, so count the whole table in a subquery.
+            return exact_count_query(model, where).scalar_subquery()
+        return func.count().over()
+    if strategy is CountStrategy.ESTIMATED:
+        return estimated_count_query(model).scalar_subquery()
+    return None
+
+
+async def cached_count(session: AsyncSession, model: type[Base]) -> int:
+    count = count_cache.get(model.__tablename__)
+    if count is None:
+        count = (await session.execute(exact_count_query(model))).scalar_one()
+        count_cache.set(model.__tablename__, count)
+    return count
+
+
+async def resolve_count(
+    session: AsyncSession,
+    strategy: CountStrategy,
+    model: type[Base],
+    counted: int | None,
+    at_least: int = 0,
+    where: Sequence[ColumnElement[bool]] = (),
+) -> int:
+    if strategy is CountStrategy.CACHED:
+        return await cached_count(session, model)
+    if counted is None:
+        # Empty pages carry no count column, fall back to a separate query.
+        if strategy is CountStrategy.ESTIMATED:
+            query = estimated_count_query(model)
+        else:
+            query = exact_count_query(model, where)
+        counted = (await session.execute(query)).scalar_one_or_none() or 0
+    if strategy is CountStrategy.ESTIMATED:
+        # Planner statistics lag behind writes, never report fewer rows
+        # than the ones already returned.
+        return max(counted, at_least)
+    return counted
@@ -1,10 +1,75 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 
 from app import crud
 from app.core.config import settings
+from app.core.pool import InstrumentedPool, instrument_pool
 from app.schemas import UserCreateSchema
 
-engine = create_async_engine(settings.SQLALCHEMY_DATABASE_URI.unicode_string())
+engine = create_async_engine(
+    settings.SQLALCHEMY_DATABASE_URI.unicode_string(),
+    poolclass=InstrumentedPool,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+    pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+)
+instrument_pool(engine)
+
+# Health checks get their own connection, so they still answer while the
+# request pool is exhausted and never queue behind requests.
+health_engine = create_async_engine(
+    settings.SQLALCHEMY_DATABASE_URI.unicode_string(),
+    pool_size=1,
+    max_overflow=0,
+    pool_pre_ping=True,
+)
+
+replica_engine = None
+if settings.DB_REPLICA_URI is not None:
+    replica_engine = create_async_engine(
+        settings.DB_REPLICA_URI,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        # A replica that does not answer must fail fast so reads fall back.
+        connect_args={"timeout": settings.DB_REPLICA_CONNECT_TIMEOUT_SECONDS},
+    )
+
+
+@dataclass
+class ReplicaRouter:
+    replica: AsyncEngine | None
+    retry_seconds: float
+    unhealthy_until: float = 0.0
+    fallbacks: int = 0
+
+    @property
+    def available(self) -> bool:
+        return self.replica is not None and time.monotonic() >= self.unhealthy_until
+
+    def mark_failed(self) -> None:
+        # Reads go to the primary until the retry period is over.
+        self.unhealthy_until = time.monotonic() + self.retry_seconds
+        self.fallbacks += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "configured": self.replica is not None,
+            "available": self.available,
+            "fallbacks": self.fallbacks,
+        }
+
+
+replica_router = ReplicaRouter(
+    replica=replica_engine, retry_seconds=settings.DB_REPLICA_RETRY_SECONDS
+)
 
 
 async def init_db(session: AsyncSession) -> None:
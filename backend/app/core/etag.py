@@ -0,0 +1,65 @@
+from collections.abc import Mapping
+from datetime import UTC, datetime
+from email.utils import format_datetime, parsedate_to_datetime
+
+# Supported content codings, in order of preference on equal weights.
+CONTENT_CODINGS = ("br", "gzip")
+
+
+def make_etag(version: int) -> str:
+    return f'"catalog-{version}"'
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    # Each content coding is a different representation with its own ETag.
+    return f'{etag.removesuffix('"')}-{encoding}"'
+
+
+def identity_etag(etag: str) -> str:
+    base, _, coding = etag.removesuffix('"').rpartition("-")
+    if base and coding in CONTENT_CODINGS:
+        return f'{base}"'
+    return etag
+
+
+def http_date(value: datetime) -> str:
+    return format_datetime(value.astimezone(UTC), usegmt=True)
+
+
+def validator_headers(etag: str, last_modified: datetime) -> dict[str, str]:
+    return {
+        "ETag": etag,
+        "Last-Modified": http_date(last_modified),
+        "Cache-Control": "no-cache",
+    }
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison function. A validator of a
+    # compressed representation also matches the uncompressed one, the
+    # content coding is renegotiated on every request.
+    candidates = {
+        identity_etag(tag.strip().removeprefix("W/"))
+        for tag in if_none_match.split(",")
+    }
+    return identity_etag(etag.removeprefix("W/")) in candidates
+
+
+def not_modified(
+    request_headers: Mapping[str, str],
+    etag: str | None,
+    last_modified: datetime | None,
+) -> bool:
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag is not None and etag_matches(if_none_match, etag)
+    if_modified_since = request_headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    return last_modified.replace(microsecond=0) <= since
@@ -0,0 +1,27 @@
+import bisect
+import math
+from typing import Any
+
+DEFAULT_BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class Histogram:
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS_MS) -> None:
+        self.buckets = (*buckets, math.inf)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self) -> dict[str, Any]:
+        # Cumulative "less or equal" counts, as Prometheus histograms report.
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip(self.buckets, self.counts, strict=True):
+            cumulative += count
+            buckets["+Inf" if math.isinf(bound) else str(bound)] = cumulative
+        return {"buckets": buckets, "count": self.count, "sum": self.sum}
@@ -0,0 +1,136 @@
+from collections.abc import Awaitable, Callable
+from email.utils import parsedate_to_datetime
+from urllib.parse import parse_qsl, urlencode
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.cache import CachedResponse, ResponseCache
+from app.core.compression import (
+    compress,
+    compressible,
+    negotiate_encoding,
+    set_content_encoding,
+)
+from app.core.config import settings
+from app.core.etag import not_modified
+
+SURROGATE_KEY_HEADER = "Surrogate-Key"
+# Sent by clients that must see their own writes, routes reads to the primary
+# and skips the shared cache.
+READ_YOUR_WRITES_HEADER = "X-Read-Your-Writes"
+
+
+def cache_key(scope: Scope, catalog_version: int) -> str:
+    query = parse_qsl(scope["query_string"].decode("latin-1"), keep_blank_values=True)
+    return f"{catalog_version}:{scope['path']}?{urlencode(sorted(query))}"
+
+
+class ResponseCacheMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        cache: ResponseCache,
+        catalog_version: Callable[[Scope], Awaitable[int]],
+        path_prefix: str,
+    ) -> None:
+        self.app = app
+        self.cache = cache
+        self.catalog_version = catalog_version
+        # Only catalog routes are cached, others skip the version lookup.
+        self.path_prefix = path_prefix
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "GET"
+            or not scope["path"].startswith(self.path_prefix)
+        ):
+            await self.app(scope, receive, send)
+            return
+        request_headers = Headers(scope=scope)
+        if (
+            "authorization" in request_headers
+            or READ_YOUR_WRITES_HEADER in request_headers
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        # Catalog writes from other processes bump the version, so entries
+        # of an older catalog are never served again and age out.
+        key = cache_key(scope, await self.catalog_version(scope))
+        entry = self.cache.get(key)
+        if entry is not None:
+            await self.send_entry(key, entry, request_headers, send, "HIT")
+            return
+
+        start: Message = {}
+        body: list[bytes] = []
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                # Only responses tagged by their route are buffered and stored.
+                if message["status"] == 200 and SURROGATE_KEY_HEADER in headers:
+                    start = message
+                    return
+            elif message["type"] == "http.response.body" and start:
+                body.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    entry = self.store(key, start, b"".join(body))
+                    await self.send_entry(key, entry, request_headers, send, "MISS")
+                return
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+    async def send_entry(
+        self,
+        key: str,
+        entry: CachedResponse,
+        request_headers: Headers,
+        send: Send,
+        cache_status: str,
+    ) -> None:
+        headers = MutableHeaders(raw=list(entry.headers))
+        headers["X-Cache"] = cache_status
+        body = entry.body
+        if settings.COMPRESSION_ENABLED and compressible(headers):
+            headers.add_vary_header("Accept-Encoding")
+            encoding = negotiate_encoding(request_headers.get("accept-encoding"))
+            if encoding is not None and len(body) >= settings.COMPRESSION_MIN_SIZE:
+                # Compressed once per catalog version and encoding, then served
+                # as is until the version changes or the entry is purged.
+                body = entry.variants.get(encoding) or compress(entry.body, encoding)
+                if encoding not in entry.variants:
+                    self.cache.add_variant(key, entry, encoding, body)
+                set_content_encoding(headers, encoding)
+                headers["Content-Length"] = str(len(body))
+        last_modified = headers.get("last-modified")
+        if not_modified(
+            request_headers,
+            headers.get("etag"),
+            parsedate_to_datetime(last_modified) if last_modified else None,
+        ):
+            del headers["content-length"]
+            del headers["content-type"]
+            del headers["content-encoding"]
+            await send(
+                {"type": "http.response.start", "status": 304, "headers": headers.raw}
+            )
+            await send({"type": "http.response.body", "body": b""})
+            return
+        await send(
+            {
+                "type": "http.response.start",
+                "status": entry.status,
+                "headers": headers.raw,
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+    def store(self, key: str, start: Message, body: bytes) -> CachedResponse:
+        headers = MutableHeaders(raw=list(start["headers"]))
+        tags = frozenset(headers[SURROGATE_KEY_HEADER].split())
+        return self.cache.set(key, start["status"], headers.raw, body, tags)
@@ -0,0 +1,65 @@
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
+
+from app.core.metrics import Histogram
+
+
+@dataclass
+class PoolMetrics:
+    connects: int = 0
+    checkouts: int = 0
+    invalidations: int = 0
+    wait_ms: Histogram = field(default_factory=Histogram)
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    # Pool events fire once a connection has been handed out, timing the
+    # checkout itself is the only way to see requests queuing for one.
+    def _do_get(self) -> ConnectionPoolEntry:
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            pool_metrics.wait_ms.observe((time.perf_counter() - start) * 1000)
+
+
+def instrument_pool(engine: AsyncEngine) -> None:
+    pool = engine.sync_engine.pool
+
+    @event.listens_for(pool, "connect")
+    def on_connect(*_: Any) -> None:
+        pool_metrics.connects += 1
+
+    @event.listens_for(pool, "checkout")
+    def on_checkout(*_: Any) -> None:
+        pool_metrics.checkouts += 1
+
+    @event.listens_for(pool, "invalidate")
+    def on_invalidate(*_: Any) -> None:
+        pool_metrics.invalidations += 1
+
+
+def pool_status(engine: AsyncEngine) -> dict[str, Any]:
+    pool = engine.sync_engine.pool
+    status: dict[str, Any] = {}
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        status |= {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": pool.overflow(),
+        }
+    return status | {
+        "connects": pool_metrics.connects,
+        "checkouts": pool_metrics.checkouts,
+        "invalidations": pool_metrics.invalidations,
+        "wait_ms": pool_metrics.wait_ms.snapshot(),
+    }
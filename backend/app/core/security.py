@@ -1,9 +1,15 @@
+import asyncio
+import uuid
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
 from datetime import UTC, datetime, timedelta
 from typing import Any
 
 import jwt
 from passlib.context import CryptContext
 
+from app.core.cache import TTLCache
 from app.core.config import settings
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -11,6 +17,49 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 ALGORITHM = "HS256"
 
 
+@dataclass(frozen=True)
+class Principal:
+    id: uuid.UUID
+    email: str
+    name: str
+    is_active: bool
+    is_superuser: bool
+
+
+# Authenticated requests resolve their user from here. Writes through crud
+# invalidate the entry in this worker only, other workers notice a change once
+# the TTL runs out. Superuser and write paths re-check the database instead.
+principal_cache: TTLCache[uuid.UUID, Principal] = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_MAX_SIZE, ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS
+)
+
+
+def invalidate_principal(user_id: uuid.UUID) -> None:
+    principal_cache.discard(user_id)
+
+
+@dataclass
+class HashingMetrics:
+    waiting: int = 0
+    running: int = 0
+    completed: int = 0
+    peak_waiting: int = 0
+
+    def snapshot(self) -> dict[str, int]:
+        return asdict(self)
+
+
+# bcrypt releases the GIL, so worker threads hash in parallel while the event
+# loop keeps serving requests. The semaphore caps how many hashes run at once,
+# callers beyond it wait on the loop where they can still be cancelled.
+hashing_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_CONCURRENCY,
+    thread_name_prefix="password-hash",
+)
+hashing_slots = asyncio.Semaphore(settings.PASSWORD_HASH_CONCURRENCY)
+hashing_metrics = HashingMetrics()
+
+
 def create_access_token(subject: str | Any, expires_delta: timedelta) -> str:
     expire = datetime.now(UTC) + expires_delta
     to_encode = {"exp": expire, "sub": str(subject)}
@@ -24,3 +73,30 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
+
+
+async def run_hashing[T](func: Callable[..., T], *args: Any) -> T:
+    hashing_metrics.waiting += 1
+    hashing_metrics.peak_waiting = max(
+        hashing_metrics.peak_waiting, hashing_metrics.waiting
+    )
+    try:
+        await hashing_slots.acquire()
+    finally:
+        hashing_metrics.waiting -= 1
+    hashing_metrics.running += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(hashing_executor, func, *args)
+    finally:
+        hashing_metrics.running -= 1
+        hashing_metrics.completed += 1
+        hashing_slots.release()
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await run_hashing(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await run_hashing(get_password_hash, password)
@@ -0,0 +1,55 @@
+import os
+import re
+from mimetypes import guess_type
+from pathlib import Path
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, PathLike, StaticFiles
+from starlette.types import Scope
+
+from app.core.compression import negotiate_encoding
+
+PRECOMPRESSED_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+# Names written by app.build_static, e.g. script.0123456789abcdef.js
+FINGERPRINTED_NAME = re.compile(r"\.[0-9a-f]{16}\.\w+$")
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    def file_response(
+        self,
+        full_path: PathLike,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        request_headers = Headers(scope=scope)
+        media_type, _ = guess_type(full_path)
+        headers = {"Vary": "Accept-Encoding", "Cache-Control": "no-cache"}
+        if FINGERPRINTED_NAME.search(os.fspath(full_path)):
+            # A new build changes the name, the content behind it never does.
+            headers["Cache-Control"] = IMMUTABLE
+        encoding = negotiate_encoding(request_headers.get("accept-encoding"))
+        if encoding is not None:
+            compressed_path = Path(
+                f"{os.fspath(full_path)}{PRECOMPRESSED_SUFFIXES[encoding]}"
+            )
+            try:
+                compressed_stat = compressed_path.stat()
+            except FileNotFoundError:
+                pass
+            else:
+                full_path, stat_result = compressed_path, compressed_stat
+                headers["Content-Encoding"] = encoding
+
+        response = FileResponse(
+            full_path,
+            status_code=status_code,
+            headers=headers,
+            media_type=media_type,
+            stat_result=stat_result,
+        )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
@@ -3,8 +3,14 @@ import uuid
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security import get_password_hash, verify_password
-from app.models import Item, User
+from app.core.cache import ITEMS_LIST_KEY, item_key, response_cache
+from app.core.counts import invalidate_count
+from app.core.security import (
+    get_password_hash_async,
+    invalidate_principal,
+    verify_password_async,
+)
+from app.models import CatalogVersion, Item, User
 from app.schemas import ItemCreateSchema, UserCreateSchema, UserUpdateSchema
 
 
@@ -20,20 +26,29 @@ async def create_item(session: AsyncSession, item_in: ItemCreateSchema) -> Item:
     )
     session.add(db_item)
     await session.commit()
+    invalidate_count(Item)
+    response_cache.purge(ITEMS_LIST_KEY, item_key(db_item.ingame_id))
     await session.refresh(db_item)
     return db_item
 
 
+async def get_catalog_version(session: AsyncSession) -> CatalogVersion:
+    query = select(CatalogVersion).where(CatalogVersion.id == 1)
+    result = await session.execute(query)
+    return result.scalars().one()
+
+
 async def create_user(session: AsyncSession, user_in: UserCreateSchema) -> User:
     db_user = User(
         email=user_in.email,
         name=user_in.name,
-        hashed_password=get_password_hash(user_in.password),
+        hashed_password=await get_password_hash_async(user_in.password),
         is_active=user_in.is_active,
         is_superuser=user_in.is_superuser,
     )
     session.add(db_user)
     await session.commit()
+    invalidate_count(User)
     await session.refresh(db_user)
     return db_user
 
@@ -65,23 +80,33 @@ async def update_user(
     user_data = user_in.model_dump(exclude_unset=True)
     if "password" in user_data:
         password = user_data["password"]
-        hashed_password = get_password_hash(password)
+        hashed_password = await get_password_hash_async(password)
         user_data["hashed_password"] = hashed_password
 
     for key, value in user_data.items():
         if hasattr(db_user, key):
             setattr(db_user, key, value)
 
+    user_id = db_user.id
     session.add(db_user)
     await session.commit()
+    invalidate_principal(user_id)
     await session.refresh(db_user)
     return db_user
 
 
+async def delete_user(session: AsyncSession, db_user: User) -> None:
+    user_id = db_user.id
+    await session.delete(db_user)
+    await session.commit()
+    invalidate_count(User)
+    invalidate_principal(user_id)
+
+
 async def authenticate(session: AsyncSession, name: str, password: str) -> User | None:
     db_user = await get_user_by_name(session, name)
     if db_user is None:
         return None
-    if not verify_password(password, db_user.hashed_password):
+    if not await verify_password_async(password, db_user.hashed_password):
         return None
     return db_user
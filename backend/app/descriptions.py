@@ -0,0 +1,102 @@
+import re
+from collections.abc import Sequence
+from dataclasses import dataclass
+from functools import lru_cache
+
+# Game markup dropped from the text, as hg2_item_parser does.
+MARKUP = re.compile(r"# ?!?ALB ?\(\d+\)")
+# Stands in for a placeholder while the template is compiled, it contains no
+# digit or "#" so it cannot be mistaken for another placeholder.
+SLOT = re.compile("\x00(\\d)\x00")
+PLACEHOLDER_COUNT = 6
+TEMPLATE_CACHE_SIZE = 4096
+
+
+@dataclass(frozen=True)
+class Placeholder:
+    index: int
+    percent: bool
+    multiplier: int | None
+    # Left in the text when the skill has fewer values than placeholders.
+    source: str
+
+    def scale(self, value: float) -> float:
+        # Applied in the parser's order, so equal values stay equal.
+        if self.percent:
+            value *= 100
+        if self.multiplier is not None:
+            value *= self.multiplier
+        return value
+
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    parts: tuple[str | Placeholder, ...]
+
+    def render(
+        self,
+        base_values: Sequence[float],
+        level_steps: Sequence[float],
+        max_up_increases: Sequence[float],
+        level: int,
+    ) -> str:
+        values = []
+        for base, step, increase in zip(
+            base_values, level_steps, max_up_increases, strict=True
+        ):
+            value = round(base + step * (level - 1), 3)
+            values.append((value, round(value + increase, 3)))
+        rendered = []
+        for part in self.parts:
+            if isinstance(part, str):
+                rendered.append(part)
+            elif part.index < len(values):
+                value, max_up_value = (part.scale(v) for v in values[part.index])
+                rendered.append(f"{value:g}")
+                # Skill upgrades show their maximum in parentheses.
+                if value != max_up_value:
+                    rendered.append(f"({max_up_value:g})")
+            else:
+                rendered.append(part.source)
+        return "".join(rendered).strip()
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def compile_template(template: str) -> CompiledTemplate:
+    # Mirrors TextParser.fill_description_template: "#1%" shows a fraction as
+    # percent and a leading digit, as in "2#1", multiplies the value.
+    text = MARKUP.sub("", template).replace("#n", "").replace(" %", "%")
+    placeholders = {}
+    for number in range(1, PLACEHOLDER_COUNT + 1):
+        match = re.search(rf"([1-9]+)#{number}", text)
+        multiplier = match.group(1) if match is not None else ""
+        source = f"{multiplier}#{number}"
+        placeholders[str(number)] = Placeholder(
+            number - 1,
+            percent=f"#{number}%" in text,
+            multiplier=int(multiplier) if multiplier else None,
+            source=source,
+        )
+        text = text.replace(source, f"\x00{number}\x00")
+
+    parts: list[str | Placeholder] = []
+    for position, piece in enumerate(SLOT.split(text)):
+        if position % 2:
+            parts.append(placeholders[piece])
+        elif piece:
+            parts.append(piece)
+    return CompiledTemplate(tuple(parts))
+
+
+def render_description(
+    template: str,
+    base_values: Sequence[float] | None,
+    level_steps: Sequence[float] | None,
+    max_up_increases: Sequence[float] | None,
+    level: int,
+) -> str | None:
+    if base_values is None or level_steps is None or max_up_increases is None:
+        return None
+    return compile_template(template).render(
+        base_values, level_steps, max_up_increases, level
+    )
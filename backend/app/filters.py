@@ -0,0 +1,67 @@
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any
+
+from hg2_item_parser.enums import DamageType, WeaponType
+from sqlalchemy import ColumnElement, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+from app.models import Item, Properties
+
+FACET_COLUMNS: dict[str, InstrumentedAttribute[Any]] = {
+    "rarity": Item.rarity,
+    "damage_type": Item.damage_type,
+    "weapon_type": Properties.weapon_type,
+}
+
+
+@dataclass(frozen=True)
+class ItemFilters:
+    rarity: tuple[int, ...] = ()
+    damage_type: tuple[DamageType, ...] = ()
+    weapon_type: tuple[WeaponType, ...] = ()
+
+    def __bool__(self) -> bool:
+        return bool(self.rarity or self.damage_type or self.weapon_type)
+
+    @property
+    def clauses(self) -> list[ColumnElement[bool]]:
+        clauses: list[ColumnElement[bool]] = []
+        if self.rarity:
+            clauses.append(Item.rarity.in_(self.rarity))
+        if self.damage_type:
+            clauses.append(Item.damage_type.in_(self.damage_type))
+        if self.weapon_type:
+            clauses.append(
+                Item.properties.has(Properties.weapon_type.in_(self.weapon_type))
+            )
+        return clauses
+
+
+async def facet_counts(
+    session: AsyncSession, filters: ItemFilters
+) -> dict[str, list[dict[str, Any]]]:
+    # One GROUPING SETS pass counts every facet, grouping() tells which facet
+    # a row belongs to since NULL is also a facet value.
+    columns = list(FACET_COLUMNS.values())
+    query = (
+        select(
+            *columns,
+            *(func.grouping(column) for column in columns),
+            func.count().label("count"),
+        )
+        .select_from(Item)
+        .outerjoin(Item.properties)
+        .where(*filters.clauses)
+        .group_by(func.grouping_sets(*columns))
+        .order_by(func.count().desc())
+    )
+    result = await session.execute(query)
+    facets: dict[str, list[dict[str, Any]]] = defaultdict(list)
+    for row in result:
+        values, groupings = row[: len(columns)], row[len(columns) : -1]
+        for name, value, grouping in zip(FACET_COLUMNS, values, groupings, strict=True):
+            if grouping == 0:
+                facets[name].append({"value": value, "count": row.count})
+    return {name: facets[name] for name in FACET_COLUMNS}
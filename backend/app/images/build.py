@@ -0,0 +1,123 @@
+import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+
+from app.images.store import Manifest, load_manifest, referenced_objects, save_manifest
+from app.images.variants import (
+    SOURCE_SUFFIXES,
+    ImageEntry,
+    VariantOptions,
+    file_digest,
+    render_variants,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ImageBuildReport:
+    rendered: int = 0
+    unchanged: int = 0
+    removed: int = 0
+    failed: int = 0
+    pruned: int = 0
+
+
+def scan_sources(source_dir: Path) -> dict[int, Path]:
+    return {
+        int(path.stem): path
+        for path in sorted(source_dir.iterdir())
+        if path.stem.isdigit() and path.suffix.lower() in SOURCE_SUFFIXES
+    }
+
+
+def is_current(entry: ImageEntry, cache_dir: Path) -> bool:
+    return all(
+        (cache_dir / object_path).exists()
+        for widths in entry.variants.values()
+        for object_path in widths.values()
+    )
+
+
+def pending_sources(
+    sources: dict[int, Path], manifest: Manifest, cache_dir: Path
+) -> dict[int, tuple[Path, str]]:
+    pending: dict[int, tuple[Path, str]] = {}
+    for image_id, path in sources.items():
+        entry = manifest.images.get(image_id)
+        stat = path.stat()
+        if (
+            entry is not None
+            and entry.source == path.name
+            and (entry.size, entry.mtime_ns) == (stat.st_size, stat.st_mtime_ns)
+            and is_current(entry, cache_dir)
+        ):
+            continue
+        # Only hashed when the file looks modified, a touched file with the
+        # same content is not rendered again.
+        digest = file_digest(path)
+        if (
+            entry is not None
+            and entry.digest == digest
+            and is_current(entry, cache_dir)
+        ):
+            entry.source, entry.size, entry.mtime_ns = (
+                path.name,
+                stat.st_size,
+                stat.st_mtime_ns,
+            )
+            continue
+        pending[image_id] = (path, digest)
+    return pending
+
+
+def prune_objects(cache_dir: Path, manifest: Manifest) -> int:
+    referenced = referenced_objects(manifest)
+    pruned = 0
+    for path in (cache_dir / "objects").glob("*/*"):
+        if path.relative_to(cache_dir).as_posix() not in referenced:
+            path.unlink()
+            pruned += 1
+    return pruned
+
+
+def build_images(
+    source_dir: Path, cache_dir: Path, options: VariantOptions, *, workers: int
+) -> ImageBuildReport:
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    manifest = load_manifest(cache_dir)
+    if manifest.options != options:
+        # Every variant changes, objects with the same content are reused.
+        manifest = Manifest(options=options)
+    sources = scan_sources(source_dir)
+    report = ImageBuildReport()
+
+    for image_id in manifest.images.keys() - sources.keys():
+        del manifest.images[image_id]
+        report.removed += 1
+
+    pending = pending_sources(sources, manifest, cache_dir)
+    report.unchanged = len(sources) - len(pending)
+    if pending:
+        with ProcessPoolExecutor(max_workers=min(workers, len(pending))) as pool:
+            futures = {
+                pool.submit(render_variants, path, digest, cache_dir, options): (
+                    image_id
+                )
+                for image_id, (path, digest) in pending.items()
+            }
+            for future in as_completed(futures):
+                image_id = futures[future]
+                try:
+                    manifest.images[image_id] = future.result()
+                except OSError as e:
+                    # Unreadable sources keep their previous variants.
+                    logger.warning("Skipped image %s: %s", image_id, e)
+                    report.failed += 1
+                else:
+                    report.rendered += 1
+
+    save_manifest(cache_dir, manifest)
+    report.pruned = prune_objects(cache_dir, manifest)
+    return report
@@ -0,0 +1,123 @@
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from app.core.config import settings
+from app.images.variants import ImageEntry, VariantOptions
+
+MANIFEST_NAME = "manifest.json"
+
+
+@dataclass
+class Manifest:
+    options: VariantOptions | None = None
+    images: dict[int, ImageEntry] = field(default_factory=dict)
+
+
+def configured_options() -> VariantOptions:
+    return VariantOptions(
+        widths=tuple(sorted(settings.IMAGES_WIDTHS)),
+        formats=tuple(settings.IMAGES_FORMATS),
+        quality=settings.IMAGES_QUALITY,
+    )
+
+
+def parse_entry(data: dict[str, Any]) -> ImageEntry:
+    variants = {
+        image_format: {int(width): path for width, path in widths.items()}
+        for image_format, widths in data.pop("variants").items()
+    }
+    return ImageEntry(**data, variants=variants)
+
+
+def load_manifest(cache_dir: Path) -> Manifest:
+    try:
+        data = json.loads((cache_dir / MANIFEST_NAME).read_text())
+    except FileNotFoundError:
+        return Manifest()
+    options = data["options"]
+    return Manifest(
+        options=VariantOptions(
+            widths=tuple(options["widths"]),
+            formats=tuple(options["formats"]),
+            quality=options["quality"],
+        ),
+        images={
+            int(image_id): parse_entry(entry)
+            for image_id, entry in data["images"].items()
+        },
+    )
+
+
+def save_manifest(cache_dir: Path, manifest: Manifest) -> None:
+    path = cache_dir / MANIFEST_NAME
+    temporary = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    temporary.write_text(json.dumps(asdict(manifest), sort_keys=True))
+    temporary.replace(path)
+
+
+def referenced_objects(manifest: Manifest) -> set[str]:
+    return {
+        path
+        for entry in manifest.images.values()
+        for widths in entry.variants.values()
+        for path in widths.values()
+    }
+
+
+def negotiate_format(accept: str | None, formats: tuple[str, ...]) -> str | None:
+    if not formats:
+        return None
+    accept = (accept or "").lower()
+    for image_format in formats:
+        if f"image/{image_format}" in accept:
+            return image_format
+    # Formats are configured from smallest to most widely supported.
+    return formats[-1]
+
+
+def select_width(widths: list[int], requested: int | None) -> int:
+    # The smallest variant that still covers the requested width.
+    if requested is not None:
+        for width in widths:
+            if width >= requested:
+                return width
+    return widths[-1]
+
+
+class ImageStore:
+    def __init__(self, cache_dir: Path) -> None:
+        self.cache_dir = cache_dir
+        self._manifest = Manifest()
+        self._manifest_mtime_ns: int | None = None
+
+    @property
+    def manifest(self) -> Manifest:
+        # Reloaded when app.build_images replaces the manifest, without a
+        # restart of the app.
+        try:
+            mtime_ns = (self.cache_dir / MANIFEST_NAME).stat().st_mtime_ns
+        except FileNotFoundError:
+            return Manifest()
+        if mtime_ns != self._manifest_mtime_ns:
+            self._manifest = load_manifest(self.cache_dir)
+            self._manifest_mtime_ns = mtime_ns
+        return self._manifest
+
+    def find(
+        self, image_id: int, accept: str | None, width: int | None
+    ) -> tuple[Path, str] | None:
+        entry = self.manifest.images.get(image_id)
+        if entry is None:
+            return None
+        image_format = negotiate_format(accept, tuple(entry.variants))
+        if image_format is None:
+            return None
+        widths = entry.variants[image_format]
+        path = widths[select_width(sorted(widths), width)]
+        return self.cache_dir / path, image_format
+
+
+image_store = ImageStore(settings.IMAGES_CACHE_DIR)
@@ -0,0 +1,85 @@
+import hashlib
+import io
+import os
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from PIL import Image, ImageOps
+
+MEDIA_TYPES = {"avif": "image/avif", "webp": "image/webp"}
+SOURCE_SUFFIXES = frozenset({".gif", ".jpeg", ".jpg", ".png", ".webp"})
+
+
+@dataclass(frozen=True)
+class VariantOptions:
+    widths: tuple[int, ...]
+    formats: tuple[str, ...]
+    quality: int
+
+
+@dataclass
+class ImageEntry:
+    source: str
+    size: int
+    mtime_ns: int
+    digest: str
+    width: int
+    height: int
+    # Format, then width, to the object path relative to the cache directory.
+    variants: dict[str, dict[int, str]] = field(default_factory=dict)
+
+
+def file_digest(path: Path) -> str:
+    with path.open("rb") as file:
+        return hashlib.file_digest(
+            file, lambda: hashlib.blake2b(digest_size=16)
+        ).hexdigest()
+
+
+def variant_widths(source_width: int, widths: Iterable[int]) -> list[int]:
+    # Sources are never upscaled, widths past the source collapse into one
+    # variant at the source width.
+    return sorted({min(width, source_width) for width in widths})
+
+
+def store_object(cache_dir: Path, data: bytes, extension: str) -> str:
+    digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+    relative = f"objects/{digest[:2]}/{digest}.{extension}"
+    path = cache_dir / relative
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Renamed into place, readers never see a partial file.
+        temporary = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        temporary.write_bytes(data)
+        temporary.replace(path)
+    return relative
+
+
+def render_variants(
+    source: Path, digest: str, cache_dir: Path, options: VariantOptions
+) -> ImageEntry:
+    stat = source.stat()
+    with Image.open(source) as opened:
+        image = ImageOps.exif_transpose(opened)
+        has_alpha = "A" in image.getbands() or "transparency" in image.info
+        image = image.convert("RGBA" if has_alpha else "RGB")
+
+    entry = ImageEntry(
+        source=source.name,
+        size=stat.st_size,
+        mtime_ns=stat.st_mtime_ns,
+        digest=digest,
+        width=image.width,
+        height=image.height,
+    )
+    for width in variant_widths(image.width, options.widths):
+        height = max(1, round(image.height * width / image.width))
+        resized = image.resize((width, height), Image.Resampling.LANCZOS)
+        for image_format in options.formats:
+            buffer = io.BytesIO()
+            resized.save(buffer, format=image_format, quality=options.quality)
+            entry.variants.setdefault(image_format, {})[width] = store_object(
+                cache_dir, buffer.getvalue(), image_format
+            )
+    return entry
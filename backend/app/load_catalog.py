@@ -0,0 +1,104 @@
+import argparse
+import asyncio
+import logging
+import os
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.catalog.loader import load_catalog
+from app.catalog.pipeline import parse_batches
+from app.catalog.rows import CatalogRows
+from app.catalog.sync import sync_catalog
+from app.core.db import engine
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def load(batches: AsyncIterator[CatalogRows], *, replace: bool) -> None:
+    async with AsyncSession(engine) as session:
+        written = await load_catalog(session, batches, replace=replace)
+        await session.commit()
+    logger.info("Loaded %s rows", written)
+
+
+async def sync(batches: AsyncIterator[CatalogRows]) -> None:
+    # Deletions can only be detected once the whole dump has been parsed.
+    rows = CatalogRows()
+    async for batch in batches:
+        rows.extend(batch)
+    logger.info("Parsed %s items", len(rows.items))
+    async with AsyncSession(engine) as session:
+        report = await sync_catalog(session, rows)
+        await session.commit()
+    for table_name, table_report in vars(report).items():
+        logger.info(
+            "%s: %s inserted, %s updated, %s deleted, %s unchanged",
+            table_name,
+            table_report.inserted,
+            table_report.updated,
+            table_report.deleted,
+            table_report.unchanged,
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load parsed game items")
+    parser.add_argument("--data-dir", type=Path, default=Path("extracted"))
+    parser.add_argument(
+        "--range",
+        type=int,
+        nargs=2,
+        metavar=("FIRST", "LAST"),
+        default=(1, 5000),
+        help="Range of item IDs to parse (inclusive)",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=250,
+        help="Item IDs parsed per worker task and written per COPY batch",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Parser processes",
+    )
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=8,
+        help="Parsed batches buffered while the database catches up",
+    )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--replace",
+        action="store_true",
+        help="Remove the current catalog before loading",
+    )
+    mode.add_argument(
+        "--sync",
+        action="store_true",
+        help="Write only the rows that changed since the last load or sync",
+    )
+    args = parser.parse_args()
+    first_item_id, last_item_id = args.range
+    batches = parse_batches(
+        args.data_dir,
+        first_item_id,
+        last_item_id,
+        batch_size=args.batch_size,
+        workers=args.workers,
+        queue_size=args.queue_size,
+    )
+    if args.sync:
+        asyncio.run(sync(batches))
+    else:
+        asyncio.run(load(batches, replace=args.replace))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,8 +2,14 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.routing import APIRoute
 
+from app.api.deps import read_catalog_version
 from app.api.main import api_router
+from app.api.routes import health
+from app.core.cache import response_cache
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
+from app.core.middleware import ResponseCacheMiddleware
+from app.core.static import PrecompressedStaticFiles
 
 
 def custom_generate_unique_id(route: APIRoute) -> str:
@@ -16,6 +22,18 @@ app = FastAPI(
     generate_unique_id_function=custom_generate_unique_id,
 )
 
+if settings.RESPONSE_CACHE_ENABLED:
+    app.add_middleware(
+        ResponseCacheMiddleware,
+        cache=response_cache,
+        catalog_version=read_catalog_version,
+        path_prefix=f"{settings.API_V1_STR}/items",
+    )
+
+# Outside the response cache, which serves its entries already compressed.
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
 if settings.all_cors_origins:
     app.add_middleware(
         CORSMiddleware,
@@ -26,3 +44,12 @@ if settings.all_cors_origins:
     )
 
 app.include_router(api_router, prefix=settings.API_V1_STR)
+app.include_router(health.router)
+
+# Mounted last, API routes take precedence over static files.
+if settings.STATIC_DIR.is_dir():
+    app.mount(
+        "/",
+        PrecompressedStaticFiles(directory=settings.STATIC_DIR, html=True),
+        name="static",
+    )
@@ -1,12 +1,24 @@
 import uuid
+from datetime import datetime
 
 from hg2_item_parser.enums import DamageType, WeaponType
-from sqlalchemy import ForeignKey, String
+from sqlalchemy import (
+    ARRAY,
+    BigInteger,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    String,
+    select,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.ext.asyncio import AsyncAttrs
 from sqlalchemy.orm import (
     DeclarativeBase,
     Mapped,
     MappedAsDataclass,
+    column_property,
     mapped_column,
     relationship,
 )
@@ -17,6 +29,14 @@ class Base(DeclarativeBase, MappedAsDataclass, AsyncAttrs): ...
 
 class Item(Base):
     __tablename__ = "item"
+    __table_args__ = (
+        Index("ix_item_search_vector", "search_vector", postgresql_using="gin"),
+        # Filtered listings page in ingame_id order.
+        Index(
+            "ix_item_rarity_damage_type_ingame_id", "rarity", "damage_type", "ingame_id"
+        ),
+        Index("ix_item_damage_type_ingame_id", "damage_type", "ingame_id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, init=False)
     ingame_id: Mapped[int] = mapped_column(unique=True, nullable=False)
@@ -26,6 +46,13 @@ class Item(Base):
     image_url: Mapped[str]
     damage_type: Mapped[DamageType] = mapped_column(nullable=True)
     rarity: Mapped[int]
+    content_hash: Mapped[str | None] = mapped_column(
+        String(32), init=False, default=None
+    )
+    # Maintained by database triggers from the item title and its skills.
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR, init=False, default=None, deferred=True
+    )
 
     properties: Mapped["Properties"] = relationship(
         "Properties", back_populates="item", cascade="all, delete-orphan", init=False
@@ -37,6 +64,11 @@ class Item(Base):
 
 class Properties(Base):
     __tablename__ = "properties"
+    __table_args__ = (
+        Index(
+            "ix_properties_weapon_type_item_ingame_id", "weapon_type", "item_ingame_id"
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     max_lvl: Mapped[int]
@@ -51,11 +83,30 @@ class Properties(Base):
     crit_rate: Mapped[float] = mapped_column(nullable=True)
     base_sync: Mapped[int] = mapped_column(nullable=True)
     max_sync: Mapped[int] = mapped_column(nullable=True)
-    item_ingame_id: Mapped[int] = mapped_column(ForeignKey("item.ingame_id"))
+    # Level 1 stats and their increase per level, see app.stats for curves.
+    base_damage: Mapped[float] = mapped_column(nullable=True)
+    damage_per_lvl: Mapped[float] = mapped_column(nullable=True)
+    base_atk_speed: Mapped[float] = mapped_column(nullable=True)
+    atk_speed_per_lvl: Mapped[float] = mapped_column(nullable=True)
+    base_hp: Mapped[float] = mapped_column(nullable=True)
+    hp_per_lvl: Mapped[float] = mapped_column(nullable=True)
+    item_ingame_id: Mapped[int] = mapped_column(
+        ForeignKey("item.ingame_id"), unique=True
+    )
+    content_hash: Mapped[str | None] = mapped_column(
+        String(32), init=False, default=None
+    )
 
     item: Mapped["Item"] = relationship("Item", back_populates="properties")
 
 
+class SkillDescriptionTemplate(Base):
+    __tablename__ = "skill_description_template"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    template: Mapped[str]
+
+
 class Skill(Base):
     __tablename__ = "skill"
 
@@ -63,14 +114,32 @@ class Skill(Base):
     ingame_id: Mapped[int]
     title_id: Mapped[int]
     title: Mapped[str] = mapped_column(String(64))
-    description_template_id: Mapped[int]
-    description_template: Mapped[str]
+    description_template_id: Mapped[int] = mapped_column(
+        ForeignKey("skill_description_template.id")
+    )
+    # Rendered at the item's max level, see app.descriptions for other levels.
     description: Mapped[str]
     damage_type: Mapped[DamageType] = mapped_column(nullable=True)
-    item_ingame_id: Mapped[int] = mapped_column(ForeignKey("item.ingame_id"))
+    item_ingame_id: Mapped[int] = mapped_column(
+        ForeignKey("item.ingame_id"), index=True
+    )
+    # Template parameters at level 1, their increase per level and their
+    # increase at the maximum skill upgrade.
+    base_values: Mapped[list[float] | None] = mapped_column(ARRAY(Float))
+    level_steps: Mapped[list[float] | None] = mapped_column(ARRAY(Float))
+    max_up_increases: Mapped[list[float] | None] = mapped_column(ARRAY(Float))
+    content_hash: Mapped[str | None] = mapped_column(
+        String(32), init=False, default=None
+    )
 
     item: Mapped["Item"] = relationship("Item", back_populates="skills")
 
+    description_template: Mapped[str] = column_property(
+        select(SkillDescriptionTemplate.template)
+        .where(SkillDescriptionTemplate.id == description_template_id)
+        .scalar_subquery(),
+    )
+
 
 class User(Base):
     __tablename__ = "user"
@@ -83,3 +152,11 @@ class User(Base):
     hashed_password: Mapped[str]
     is_active: Mapped[bool] = mapped_column(default=True)
     is_superuser: Mapped[bool] = mapped_column(default=False)
+
+
+class CatalogVersion(Base):
+    __tablename__ = "catalog_version"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
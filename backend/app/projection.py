@@ -0,0 +1,265 @@
+from collections import defaultdict
+from collections.abc import Sequence
+from dataclasses import dataclass
+from itertools import chain
+from typing import Any, Self
+
+import orjson
+from sqlalchemy import (
+    Enum,
+    Join,
+    Row,
+    Select,
+    Text,
+    case,
+    cast,
+    func,
+    join,
+    literal_column,
+    null,
+    select,
+)
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import ColumnElement
+
+from app.descriptions import render_description
+from app.models import Item, Properties, Skill, SkillDescriptionTemplate
+from app.schemas import ItemReadSchema, PropertiesReadSchema, SkillReadSchema
+
+ITEM_RELATIONSHIPS = ("properties", "skills")
+ITEM_FIELDS = tuple(
+    name for name in ItemReadSchema.model_fields if name not in ITEM_RELATIONSHIPS
+)
+PROPERTIES_FIELDS = tuple(PropertiesReadSchema.model_fields)
+SKILL_FIELDS = tuple(SkillReadSchema.model_fields)
+
+PROPERTIES_PREFIX = "properties__"
+
+EMPTY_JSON_ARRAY: ColumnElement[Any] = literal_column("'[]'::json")
+
+
+class InvalidProjectionError(ValueError): ...
+
+
+def split_names(value: str, allowed: Sequence[str], kind: str) -> tuple[str, ...]:
+    names = tuple(dict.fromkeys(name.strip() for name in value.split(",")))
+    names = tuple(name for name in names if name)
+    unknown = [name for name in names if name not in allowed]
+    if unknown:
+        msg = f"Unknown {kind}: {', '.join(unknown)}"
+        raise InvalidProjectionError(msg)
+    return names
+
+
+@dataclass(frozen=True)
+class ItemProjection:
+    fields: tuple[str, ...] = ITEM_FIELDS
+    include: tuple[str, ...] = ITEM_RELATIONSHIPS
+
+    @classmethod
+    def parse(cls, fields: str | None, include: str | None) -> Self:
+        if fields is None and include is None:
+            return cls()
+        item_fields = ITEM_FIELDS
+        if fields is not None:
+            item_fields = split_names(fields, ITEM_FIELDS, "fields")
+        relationships: tuple[str, ...] = ()
+        if include is not None:
+            relationships = split_names(include, ITEM_RELATIONSHIPS, "include")
+        return cls(fields=item_fields, include=relationships)
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        # ingame_id is always read, it keys cursors and relationship lookups.
+        if "ingame_id" in self.fields:
+            return self.fields
+        return ("ingame_id", *self.fields)
+
+    def select(self) -> Select[Any]:
+        query = select(*(getattr(Item, name) for name in self.columns))
+        if "properties" in self.include:
+            query = query.add_columns(
+                *(
+                    getattr(Properties, name).label(PROPERTIES_PREFIX + name)
+                    for name in PROPERTIES_FIELDS
+                )
+            ).outerjoin(Item.properties)
+        return query
+
+    def document(self) -> ColumnElement[Any]:
+        # The same item shape as load(), built by Postgres as one json value.
+        pairs: list[tuple[str, ColumnElement[Any]]] = [
+            (name, getattr(Item, name)) for name in self.fields
+        ]
+        if "properties" in self.include:
+            properties = select(json_object(Properties, PROPERTIES_FIELDS)).where(
+                Properties.item_ingame_id == Item.ingame_id
+            )
+            pairs.append(("properties", properties.scalar_subquery()))
+        if "skills" in self.include:
+            skill_pairs = [(name, skill_column(name)) for name in SKILL_FIELDS]
+            skills = (
+                select(
+                    func.coalesce(
+                        func.json_agg(
+                            ordered(json_build_object(skill_pairs), Skill.id)
+                        ),
+                        EMPTY_JSON_ARRAY,
+                    )
+                )
+                .select_from(skills_with_templates())
+                .where(Skill.item_ingame_id == Item.ingame_id)
+            )
+            pairs.append(("skills", skills.scalar_subquery()))
+        return json_build_object(pairs)
+
+    def documents_select(self, page_query: Select[Any]) -> Select[Any]:
+        # Folds the items of a page into one json array, returned as text so
+        # the driver hands over the bytes Postgres produced. Documents are
+        # built after the page is cut, a window count in page_query would
+        # otherwise build one for every matching row.
+        page = page_query.subquery()
+        total = page.c.total if "total" in page.c else null()
+        data = func.coalesce(
+            func.json_agg(ordered(self.document(), Item.ingame_id)),
+            EMPTY_JSON_ARRAY,
+        )
+        return (
+            select(
+                cast(data, Text).label("data"),
+                func.array_agg(ordered(Item.ingame_id, Item.ingame_id)).label(
+                    "ingame_ids"
+                ),
+                func.min(total).label("total"),
+            )
+            .select_from(page)
+            .join(Item, Item.ingame_id == page.c.ingame_id)
+        )
+
+    async def load(
+        self,
+        session: AsyncSession,
+        rows: Sequence[Row[Any]],
+        *,
+        skill_level: int | None = None,
+    ) -> list[dict[str, Any]]:
+        items = []
+        for row in rows:
+            mapping = row._mapping
+            item = {name: mapping[name] for name in self.fields}
+            if "properties" in self.include:
+                item["properties"] = None
+                if mapping[PROPERTIES_PREFIX + "id"] is not None:
+                    item["properties"] = {
+                        name: mapping[PROPERTIES_PREFIX + name]
+                        for name in PROPERTIES_FIELDS
+                    }
+            items.append(item)
+        if "skills" in self.include and rows:
+            ingame_ids = [row.ingame_id for row in rows]
+            skills = await load_skills(session, ingame_ids, skill_level=skill_level)
+            for item, ingame_id in zip(items, ingame_ids, strict=True):
+                item["skills"] = skills.get(ingame_id, [])
+        return items
+
+
+async def load_skills(
+    session: AsyncSession, ingame_ids: Sequence[int], *, skill_level: int | None = None
+) -> dict[int, list[dict[str, Any]]]:
+    query = (
+        select(*(skill_column(name).label(name) for name in SKILL_FIELDS))
+        .select_from(skills_with_templates())
+        .where(Skill.item_ingame_id.in_(ingame_ids))
+        .order_by(Skill.item_ingame_id, Skill.id)
+    )
+    if skill_level is not None:
+        query = query.add_columns(
+            Skill.base_values, Skill.level_steps, Skill.max_up_increases
+        )
+    result = await session.execute(query)
+    skills: dict[int, list[dict[str, Any]]] = defaultdict(list)
+    for mapping in result.mappings():
+        skill = dict(mapping)
+        if skill_level is not None:
+            description = render_description(
+                skill["description_template"],
+                skill.pop("base_values"),
+                skill.pop("level_steps"),
+                skill.pop("max_up_increases"),
+                skill_level,
+            )
+            # Skills without level values keep their max level description.
+            if description is not None:
+                skill["description"] = description
+        skills[mapping["item_ingame_id"]].append(skill)
+    return skills
+
+
+def skills_with_templates() -> Join:
+    return join(
+        Skill,
+        SkillDescriptionTemplate,
+        SkillDescriptionTemplate.id == Skill.description_template_id,
+    )
+
+
+def skill_column(name: str) -> ColumnElement[Any]:
+    # Joined once per statement instead of the per row subquery behind
+    # Skill.description_template.
+    if name == "description_template":
+        template: ColumnElement[Any] = SkillDescriptionTemplate.__table__.c.template
+        return template
+    column: ColumnElement[Any] = getattr(Skill, name)
+    return column
+
+
+def ordered(target: Any, *order_by: Any) -> ColumnElement[Any]:
+    result: ColumnElement[Any] = aggregate_order_by(  # type: ignore[no-untyped-call]
+        target, *order_by
+    )
+    return result
+
+
+def sql_string(value: str | None) -> ColumnElement[Any]:
+    if value is None:
+        return null()
+    escaped = value.replace("'", "''")
+    result: ColumnElement[Any] = literal_column(f"'{escaped}'")
+    return result
+
+
+def json_value(column: Any) -> ColumnElement[Any]:
+    # Enums are stored by name while responses carry their values. The
+    # mapping is inlined, it is fixed and keeps the statement free of
+    # parameters.
+    column_type = column.type
+    if isinstance(column_type, Enum) and column_type.enum_class is not None:
+        return case(
+            {
+                sql_string(member.name): sql_string(member.value)
+                for member in column_type.enum_class
+            },
+            value=column,
+        )
+    result: ColumnElement[Any] = column
+    return result
+
+
+def json_build_object(pairs: Sequence[tuple[str, Any]]) -> ColumnElement[Any]:
+    return func.json_build_object(
+        *chain.from_iterable(
+            (sql_string(name), json_value(value)) for name, value in pairs
+        )
+    )
+
+
+def json_object(model: type[Any], names: Sequence[str]) -> ColumnElement[Any]:
+    return json_build_object([(name, getattr(model, name)) for name in names])
+
+
+def encode_document(data: str, content: dict[str, Any]) -> bytes:
+    # Splices the json array built by Postgres in front of the other keys.
+    rest = orjson.dumps(content)
+    separator = b"," if len(rest) > 2 else b""
+    return b'{"data":' + data.encode() + separator + rest[1:]
@@ -3,6 +3,9 @@ import uuid
 from hg2_item_parser.enums import DamageType, WeaponType
 from pydantic import BaseModel, ConfigDict, EmailStr, Field, HttpUrl
 
+from app.core.counts import CountStrategy
+from app.stats import Metric
+
 
 class PropertiesBaseSchema(BaseModel):
     max_lvl: int = Field(ge=1, le=99)
@@ -65,9 +68,51 @@ class ItemReadSchema(ItemBaseSchema):
     skills: list[SkillReadSchema]
 
 
+class FacetValueSchema[T](BaseModel):
+    value: T
+    count: int
+
+
+class ItemFacetsSchema(BaseModel):
+    rarity: list[FacetValueSchema[int]]
+    damage_type: list[FacetValueSchema[DamageType | None]]
+    weapon_type: list[FacetValueSchema[WeaponType | None]]
+
+
 class ItemsReadSchema(BaseModel):
     data: list[ItemReadSchema]
     count: int
+    count_kind: CountStrategy
+    next_cursor: str | None = None
+    facets: ItemFacetsSchema | None = None
+
+
+class ItemsSearchSchema(BaseModel):
+    data: list[ItemReadSchema]
+    next_cursor: str | None = None
+
+
+class ItemsBatchRequestSchema(BaseModel):
+    ids: list[int] = Field(min_length=1)
+
+
+class ItemsBatchSchema(BaseModel):
+    data: list[ItemReadSchema]
+    missing: list[int]
+
+
+class ItemRankingSchema(BaseModel):
+    ingame_id: int
+    title: str
+    weapon_type: WeaponType | None
+    level: int
+    value: float
+
+
+class ItemRankingsSchema(BaseModel):
+    metric: Metric
+    level: int | None
+    data: list[ItemRankingSchema]
 
 
 class UserReadSchema(UserBaseSchema):
@@ -78,6 +123,7 @@ class UserReadSchema(UserBaseSchema):
 class UsersReadSchema(BaseModel):
     data: list[UserReadSchema]
     count: int
+    count_kind: CountStrategy
 
 
 class PropertiesCreateSchema(PropertiesBaseSchema): ...
@@ -119,7 +165,7 @@ class Token(BaseModel):
 
 
 class TokenPayload(BaseModel):
-    sub: str | None = None
+    sub: uuid.UUID
 
 
 class Message(BaseModel):
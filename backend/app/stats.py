@@ -0,0 +1,189 @@
+import asyncio
+from collections.abc import Sequence
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import Any
+
+import numpy as np
+from hg2_item_parser.enums import WeaponType
+from numpy.typing import NDArray
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Item, Properties
+
+# Crits deal double damage, a crit_rate of 0.2 adds a fifth to the damage.
+CRIT_DAMAGE_MULTIPLIER = 2.0
+WEAPON_TYPES = tuple(WeaponType)
+NO_WEAPON_TYPE = -1
+
+
+class Metric(StrEnum):
+    DAMAGE = "damage"
+    ATK_SPEED = "atk_speed"
+    HP = "hp"
+    DPS = "dps"
+
+
+@dataclass(frozen=True)
+class Ranking:
+    ingame_id: int
+    title: str
+    weapon_type: WeaponType | None
+    level: int
+    value: float
+
+
+@dataclass(frozen=True)
+class CatalogStats:
+    version: int
+    ingame_ids: NDArray[np.int64]
+    titles: tuple[str, ...]
+    weapon_types: NDArray[np.int16]
+    max_lvl: NDArray[np.int64]
+    # One row per item and one column per level, levels past an item's
+    # max_lvl repeat its max level value. Missing stats are NaN.
+    curves: dict[Metric, NDArray[np.float64]]
+
+    def rank(
+        self,
+        metric: Metric,
+        level: int | None,
+        weapon_types: Sequence[WeaponType],
+        limit: int,
+    ) -> list[Ranking]:
+        rows = np.arange(len(self.ingame_ids))
+        # Items that cannot reach the level are ranked at their max level.
+        levels = self.max_lvl if level is None else np.minimum(self.max_lvl, level)
+        values = self.curves[metric][rows, levels - 1]
+        mask = ~np.isnan(values)
+        if weapon_types:
+            codes = [WEAPON_TYPES.index(weapon_type) for weapon_type in weapon_types]
+            mask &= np.isin(self.weapon_types, codes)
+        (candidates,) = np.nonzero(mask)
+        if len(candidates) > limit:
+            # Only values reaching the limit-th highest are sorted, ties at
+            # the cut included so the order stays stable.
+            threshold = np.partition(values[candidates], -limit)[-limit]
+            candidates = candidates[values[candidates] >= threshold]
+        # Highest value first, ties in ingame_id order.
+        order = np.lexsort((self.ingame_ids[candidates], -values[candidates]))
+        return [
+            Ranking(
+                ingame_id=int(self.ingame_ids[row]),
+                title=self.titles[row],
+                weapon_type=weapon_type_of(int(self.weapon_types[row])),
+                level=int(levels[row]),
+                value=float(values[row]),
+            )
+            for row in candidates[order[:limit]]
+        ]
+
+
+def weapon_type_of(code: int) -> WeaponType | None:
+    return None if code == NO_WEAPON_TYPE else WEAPON_TYPES[code]
+
+
+def floats(values: Sequence[float | None]) -> NDArray[np.float64]:
+    # None becomes NaN.
+    return np.array(values, dtype=np.float64)
+
+
+def level_curve(
+    base: NDArray[np.float64],
+    per_lvl: NDArray[np.float64],
+    levels: NDArray[np.int64],
+    decimals: int = 0,
+) -> NDArray[np.float64]:
+    # The same rounding as PropertyParser uses for the max level values.
+    curve: NDArray[np.float64] = np.round(
+        base[:, None] + per_lvl[:, None] * (levels - 1), decimals
+    )
+    return curve
+
+
+def compute_stats(version: int, rows: Sequence[Any]) -> CatalogStats:
+    max_lvl = np.array([row.max_lvl for row in rows], dtype=np.int64)
+    top_level = int(max_lvl.max(initial=1))
+    levels = np.minimum(np.arange(1, top_level + 1), max_lvl[:, None])
+
+    damage = level_curve(
+        floats([row.base_damage for row in rows]),
+        floats([row.damage_per_lvl for row in rows]),
+        levels,
+    )
+    atk_speed = level_curve(
+        floats([row.base_atk_speed for row in rows]),
+        floats([row.atk_speed_per_lvl for row in rows]),
+        levels,
+        decimals=3,
+    )
+    hp = level_curve(
+        floats([row.base_hp for row in rows]),
+        floats([row.hp_per_lvl for row in rows]),
+        levels,
+    )
+    crit_rate = np.nan_to_num(floats([row.crit_rate for row in rows]))
+    crit_factor = 1 + crit_rate * (CRIT_DAMAGE_MULTIPLIER - 1)
+    return CatalogStats(
+        version=version,
+        ingame_ids=np.array([row.ingame_id for row in rows], dtype=np.int64),
+        titles=tuple(row.title for row in rows),
+        weapon_types=np.array(
+            [
+                NO_WEAPON_TYPE
+                if row.weapon_type is None
+                else WEAPON_TYPES.index(row.weapon_type)
+                for row in rows
+            ],
+            dtype=np.int16,
+        ),
+        max_lvl=max_lvl,
+        curves={
+            Metric.DAMAGE: damage,
+            Metric.ATK_SPEED: atk_speed,
+            Metric.HP: hp,
+            Metric.DPS: damage * atk_speed * crit_factor[:, None],
+        },
+    )
+
+
+async def load_stats(session: AsyncSession, version: int) -> CatalogStats:
+    query = (
+        select(
+            Item.ingame_id,
+            Item.title,
+            Properties.max_lvl,
+            Properties.weapon_type,
+            Properties.crit_rate,
+            Properties.base_damage,
+            Properties.damage_per_lvl,
+            Properties.base_atk_speed,
+            Properties.atk_speed_per_lvl,
+            Properties.base_hp,
+            Properties.hp_per_lvl,
+        )
+        .join(Item.properties)
+        .order_by(Item.ingame_id)
+    )
+    result = await session.execute(query)
+    return compute_stats(version, result.all())
+
+
+class StatsCache:
+    def __init__(self) -> None:
+        self._stats: CatalogStats | None = None
+        self._lock = asyncio.Lock()
+
+    async def get(self, session: AsyncSession, version: int) -> CatalogStats:
+        stats = self._stats
+        if stats is not None and stats.version == version:
+            return stats
+        # Concurrent requests after a catalog change load the stats once.
+        async with self._lock:
+            if self._stats is None or self._stats.version != version:
+                self._stats = await load_stats(session, version)
+            return self._stats
+
+
+stats_cache = StatsCache()
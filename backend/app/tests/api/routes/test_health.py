@@ -0,0 +1,17 @@
+import pytest
+from httpx import AsyncClient
+
+from app.core.pool import pool_metrics
+
+
+@pytest.mark.asyncio
+async def test_healthz(client: AsyncClient) -> None:
+    checkouts = pool_metrics.checkouts
+    response = await client.get("/healthz")
+    assert response.status_code == 200
+    content = response.json()
+    assert content["status"] == "ok"
+    assert content["database"]["latency_ms"] > 0
+    assert {"size", "checked_out", "overflow", "wait_ms"} <= set(content["pool"])
+    # The check runs on its own engine, not on the request pool.
+    assert pool_metrics.checkouts == checkouts
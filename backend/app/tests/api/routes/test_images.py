@@ -0,0 +1,58 @@
+from pathlib import Path
+
+import pytest
+from httpx import AsyncClient
+from PIL import Image
+
+from app.core.config import settings
+from app.images.build import build_images
+from app.images.store import ImageStore, image_store
+from app.images.variants import VariantOptions
+
+
+@pytest.fixture
+def images(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> ImageStore:
+    source_dir = tmp_path / "source"
+    source_dir.mkdir()
+    Image.new("RGB", (120, 80), "red").save(source_dir / "7.png")
+    cache_dir = tmp_path / "cache"
+    options = VariantOptions(widths=(48, 96), formats=("avif", "webp"), quality=50)
+    build_images(source_dir, cache_dir, options, workers=1)
+    monkeypatch.setattr(image_store, "cache_dir", cache_dir)
+    return image_store
+
+
+@pytest.mark.asyncio
+async def test_read_image(client: AsyncClient, images: ImageStore) -> None:
+    response = await client.get(
+        f"{settings.API_V1_STR}/images/7",
+        params={"w": 40},
+        headers={"Accept": "image/avif,image/webp,*/*"},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "image/avif"
+    assert response.headers["vary"] == "Accept"
+    assert "max-age" in response.headers["cache-control"]
+    variant = images.manifest.images[7].variants["avif"][48]
+    assert response.content == (images.cache_dir / variant).read_bytes()
+
+    response = await client.get(
+        f"{settings.API_V1_STR}/images/7",
+        headers={"Accept": "image/webp", "If-None-Match": response.headers["etag"]},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "image/webp"
+
+    response = await client.get(
+        f"{settings.API_V1_STR}/images/7",
+        headers={"Accept": "image/webp", "If-None-Match": response.headers["etag"]},
+    )
+    assert response.status_code == 304
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("images")
+async def test_read_image_not_found(client: AsyncClient) -> None:
+    response = await client.get(f"{settings.API_V1_STR}/images/8")
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Image not found"}
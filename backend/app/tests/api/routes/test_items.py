@@ -1,11 +1,31 @@
+import asyncio
+import json
 import random
+from typing import Any
 
 import pytest
+from hg2_item_parser.enums import DamageType, WeaponType
 from httpx import AsyncClient
+from sqlalchemy import delete, event, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from starlette.types import Message
 
+from app import crud
+from app.core.cache import ITEMS_LIST_KEY, item_key, response_cache
 from app.core.config import settings
-from app.tests.utils.item import create_random_item
+from app.core.db import engine
+from app.core.middleware import SURROGATE_KEY_HEADER
+from app.core.pagination import encode_cursor
+from app.main import app
+from app.models import Item, Properties, Skill
+from app.schemas import ItemReadSchema, ItemsReadSchema
+from app.tests.utils.item import (
+    create_random_item,
+    create_random_properties,
+    create_random_skill,
+)
+from app.tests.utils.utils import random_lower_string
 
 
 @pytest.mark.asyncio
@@ -24,6 +44,43 @@ async def test_read_item(client: AsyncClient, db: AsyncSession) -> None:
     assert content["id"] == item.id
 
 
+@pytest.mark.asyncio
+async def test_read_item_relationships(client: AsyncClient, db: AsyncSession) -> None:
+    item = await create_random_item(db)
+    await create_random_properties(db, item)
+    await create_random_skill(db, item)
+    await create_random_skill(db, item)
+    response = await client.get(
+        f"{settings.API_V1_STR}/items/{item.ingame_id}",
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["properties"]["item_ingame_id"] == item.ingame_id
+    assert len(content["skills"]) == 2
+    assert ItemReadSchema.model_validate(content)
+
+
+@pytest.mark.asyncio
+async def test_read_item_matches_validated_schema(
+    client: AsyncClient, db: AsyncSession
+) -> None:
+    item = await create_random_item(db)
+    await create_random_properties(db, item)
+    await create_random_skill(db, item)
+    response = await client.get(f"{settings.API_V1_STR}/items/{item.ingame_id}")
+    assert response.status_code == 200
+
+    query = (
+        select(Item)
+        .where(Item.ingame_id == item.ingame_id)
+        .options(selectinload(Item.properties), selectinload(Item.skills))
+        .execution_options(populate_existing=True)
+    )
+    db_item = (await db.execute(query)).scalar_one()
+    validated = ItemReadSchema.model_validate(db_item)
+    assert response.json() == validated.model_dump(mode="json")
+
+
 @pytest.mark.asyncio
 async def test_read_item_not_found(client: AsyncClient) -> None:
     response = await client.get(
@@ -34,6 +91,37 @@ async def test_read_item_not_found(client: AsyncClient) -> None:
     assert content["detail"] == "Item not found"
 
 
+@pytest.mark.asyncio
+async def test_read_item_skill_level(client: AsyncClient, db: AsyncSession) -> None:
+    item = await create_random_item(db)
+    # As the catalog stores it for an item with max_lvl 11.
+    await create_random_skill(
+        db,
+        item,
+        template="Deals #1% damage for #2s",
+        description="Deals 250(300)% damage for 3s",
+        base_values=[1.5, 3.0],
+        level_steps=[0.1, 0.0],
+        max_up_increases=[0.5, 0.0],
+    )
+    await create_random_skill(db, item)
+    url = f"{settings.API_V1_STR}/items/{item.ingame_id}"
+
+    response = await client.get(url, params={"skill_level": 6})
+    assert response.status_code == 200
+    rendered, stored = response.json()["skills"]
+    assert rendered["description"] == "Deals 200(250)% damage for 3s"
+    assert rendered["description_template"] == "Deals #1% damage for #2s"
+
+    response = await client.get(url, params={"skill_level": 11})
+    skills = response.json()["skills"]
+    assert skills[0]["description"] == "Deals 250(300)% damage for 3s"
+    assert skills[1]["description"] == stored["description"]
+
+    response = await client.get(url, params={"skill_level": 0})
+    assert response.status_code == 422
+
+
 @pytest.mark.asyncio
 async def test_read_items(client: AsyncClient, db: AsyncSession) -> None:
     await create_random_item(db)
@@ -46,3 +134,823 @@ async def test_read_items(client: AsyncClient, db: AsyncSession) -> None:
     assert len(content["data"]) >= 2
     assert "count" in content
     assert content["count"] == len(content["data"])
+
+
+@pytest.mark.asyncio
+async def test_read_items_cursor(client: AsyncClient, db: AsyncSession) -> None:
+    await create_random_item(db)
+    await create_random_item(db)
+    await create_random_item(db)
+    response = await client.get(
+        f"{settings.API_V1_STR}/items/",
+        params={"limit": 2},
+    )
+    assert response.status_code == 200
+    first_page = response.json()
+    assert len(first_page["data"]) == 2
+    assert first_page["next_cursor"] is not None
+    response = await client.get(
+        f"{settings.API_V1_STR}/items/",
+        params={"after": first_page["next_cursor"], "limit": 2},
+    )
+    assert response.status_code == 200
+    second_page = response.json()
+    assert len(second_page["data"]) >= 1
+    assert second_page["count"] == first_page["count"]
+    last_seen = first_page["data"][-1]["ingame_id"]
+    assert all(item["ingame_id"] > last_seen for item in second_page["data"])
+
+
+@pytest.mark.asyncio
+async def test_read_items_cursor_matches_offset(
+    client: AsyncClient, db: AsyncSession
+) -> None:
+    await create_random_item(db)
+    await create_random_item(db)
+    response = await client.get(
+        f"{settings.API_V1_STR}/items/",
+        params={"limit": 1},
+    )
+    first_item = response.json()["data"][0]
+    response = await client.get(
+        f"{settings.API_V1_STR}/items/",
+        params={"after": first_item["ingame_id"], "limit": 1},
+    )
+    by_cursor = response.json()["data"]
+    response = await client.get(
+        f"{settings.API_V1_STR}/items/",
+        params={"skip": 1, "limit": 1},
+    )
+    by_offset = response.json()["data"]
+    assert by_cursor == by_offset
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "after", ["not-a-cursor", "\u00b2", "3000000000", encode_cursor(3_000_000_000)]
+)
+async def test_read_items_invalid_cursor(client: AsyncClient, after: str) -> None:
+    response = await client.get(
+        f"{settings.API_V1_STR}/items/", params={"after": after}
+    )
+    assert response.status_code == 400
+    content = response.json()
+    assert content["detail"] == "Invalid cursor"
+
+
+@pytest.mark.asyncio
+async def test_read_items_card_single_statement(
+    client: AsyncClient, db: AsyncSession
+) -> None:
+    await create_random_item(db)
+    statements: list[str] = []
+
+    def record(*args: Any) -> None:
+        statements.append(args[2])
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        response = await client.get(
+            f"{settings.API_V1_STR}/items/",
+            params={"fields": "ingame_id,title,image_url"},
+        )
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+    assert response.status_code == 200
+    content = response.json()
+    assert content["count_kind"] == "exact"
+    assert content["count"] == await db.scalar(select(func.count()).select_from(Item))
+    # Besides the catalog version lookup, the page is a single statement.
+    assert len([s for s in statements if "catalog_version" not in s]) == 1
+    for item in content["data"]:
+        assert set(item) == {"ingame_id", "title", "image_url"}
+
+
+@pytest.mark.asyncio
+async def test_read_items_cached_count(
+    client: AsyncClient, db: AsyncSession, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "ITEMS_COUNT_STRATEGY", "cached")
+    response = await client.get(f"{settings.API_V1_STR}/items/")
+    content = response.json()
+    assert content["count_kind"] == "cached"
+    count = content["count"]
+    await create_random_item(db)
+    response = await client.get(f"{settings.API_V1_STR}/items/")
+    content = response.json()
+    assert content["count"] == count + 1
+
+
+@pytest.mark.asyncio
+async def test_read_items_estimated_count(
+    client: AsyncClient, db: AsyncSession, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "ITEMS_COUNT_STRATEGY", "estimated")
+    await create_random_item(db)
+    response = await client.get(f"{settings.API_V1_STR}/items/")
+    assert response.status_code == 200
+    content = response.json()
+    assert content["count_kind"] == "estimated"
+    assert content["count"] >= len(content["data"])
+
+
+@pytest.mark.asyncio
+async def test_read_items_include(client: AsyncClient, db: AsyncSession) -> None:
+    item = await create_random_item(db)
+    await create_random_skill(db, item)
+    response = await client.get(
+        f"{settings.API_V1_STR}/items/",
+        params={"fields": "ingame_id", "include": "skills", "limit": 1000},
+    )
+    assert response.status_code == 200
+    content = response.json()
+    for api_item in content["data"]:
+        assert set(api_item) == {"ingame_id", "skills"}
+    (api_item,) = (i for i in content["data"] if i["ingame_id"] == item.ingame_id)
+    assert len(api_item["skills"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_read_items_default_projection(
+    client: AsyncClient, db: AsyncSession
+) -> None:
+    await create_random_item(db)
+    response = await client.get(f"{settings.API_V1_STR}/items/")
+    content = response.json()
+    for item in content["data"]:
+        assert ItemReadSchema.model_validate(item)
+
+
+@pytest.mark.asyncio
+async def test_read_items_unknown_field(client: AsyncClient) -> None:
+    response = await client.get(
+        f"{settings.API_V1_STR}/items/",
+        params={"fields": "title,hashed_password"},
+    )
+    assert response.status_code == 400
+    content = response.json()
+    assert content["detail"] == "Unknown fields: hashed_password"
+
+
+@pytest.mark.asyncio
+async def test_read_item_fields(client: AsyncClient, db: AsyncSession) -> None:
+    item = await create_random_item(db)
+    response = await client.get(
+        f"{settings.API_V1_STR}/items/{item.ingame_id}",
+        params={"fields": "title,rarity", "include": "properties"},
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content == {"title": item.title, "rarity": item.rarity, "properties": None}
+
+
+@pytest.mark.asyncio
+async def test_read_item_cached(client: AsyncClient, db: AsyncSession) -> None:
+    item = await create_random_item(db)
+    url = f"{settings.API_V1_STR}/items/{item.ingame_id}"
+    first = await client.get(url)
+    assert first.headers["X-Cache"] == "MISS"
+    assert first.headers["Surrogate-Key"] == f"item:{item.ingame_id}"
+    second = await client.get(url)
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.content == first.content
+
+
+@pytest.mark.asyncio
+async def test_read_item_cache_follows_catalog_version(
+    client: AsyncClient, db: AsyncSession
+) -> None:
+    item = await create_random_item(db)
+    url = f"{settings.API_V1_STR}/items/{item.ingame_id}"
+    first = await client.get(url)
+    etag = first.headers["ETag"]
+    assert (await client.get(url)).headers["X-Cache"] == "HIT"
+    # Written outside the API, as a catalog load in another process does.
+    title = random_lower_string()
+    await set_title(db, item, title)
+    response = await client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["X-Cache"] == "MISS"
+    assert response.headers["ETag"] != etag
+    assert response.json()["title"] == title
+
+
+@pytest.mark.asyncio
+async def test_read_items_compressed_once(
+    client: AsyncClient, db: AsyncSession
+) -> None:
+    for _ in range(10):
+        await create_random_item(db)
+    url = f"{settings.API_V1_STR}/items/"
+    params = {"limit": 1000}
+    first = await client.get(url, params=params, headers={"Accept-Encoding": "br"})
+    assert first.headers["X-Cache"] == "MISS"
+    assert first.headers["Content-Encoding"] == "br"
+    assert first.headers["Vary"] == "Accept-Encoding"
+    etag = first.headers["ETag"]
+    assert etag.endswith('-br"')
+    catalog_version = await crud.get_catalog_version(db)
+    entry = response_cache.get(f"{catalog_version.version}:{url}?limit=1000")
+    assert entry is not None
+    assert set(entry.variants) == {"br"}
+
+    second = await client.get(url, params=params, headers={"Accept-Encoding": "br"})
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.content == first.content
+    response = await client.get(url, params=params, headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.content == first.content
+    assert set(entry.variants) == {"br", "gzip"}
+    response = await client.get(
+        url, params=params, headers={"Accept-Encoding": "identity"}
+    )
+    assert "Content-Encoding" not in response.headers
+    assert response.content == first.content
+
+    response = await client.get(
+        url, params=params, headers={"Accept-Encoding": "br", "If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    assert response.headers["X-Cache"] == "HIT"
+    response_cache.clear()
+    response = await client.get(
+        url, params=params, headers={"Accept-Encoding": "br", "If-None-Match": etag}
+    )
+    assert response.status_code == 304
+
+
+@pytest.mark.asyncio
+async def test_read_items_cache_purged_on_create(
+    client: AsyncClient, db: AsyncSession
+) -> None:
+    url = f"{settings.API_V1_STR}/items/"
+    params: dict[str, str | int] = {"limit": 1000, "fields": "ingame_id"}
+    await client.get(url, params=params)
+    response = await client.get(url, params=params)
+    assert response.headers["X-Cache"] == "HIT"
+    item = await create_random_item(db)
+    response = await client.get(url, params=params)
+    assert response.headers["X-Cache"] == "MISS"
+    assert {"ingame_id": item.ingame_id} in response.json()["data"]
+
+
+@pytest.mark.asyncio
+async def test_read_item_not_modified(client: AsyncClient, db: AsyncSession) -> None:
+    item = await create_random_item(db)
+    url = f"{settings.API_V1_STR}/items/{item.ingame_id}"
+    response = await client.get(url)
+    etag = response.headers["ETag"]
+    assert response.headers["Last-Modified"]
+    response = await client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["X-Cache"] == "HIT"
+    assert response.content == b""
+    response_cache.clear()
+    response = await client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+
+
+@pytest.mark.asyncio
+async def test_read_items_etag_changes_on_write(
+    client: AsyncClient, db: AsyncSession
+) -> None:
+    url = f"{settings.API_V1_STR}/items/"
+    response = await client.get(url)
+    etag = response.headers["ETag"]
+    await create_random_item(db)
+    response = await client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    response = await client.get(
+        url, headers={"If-Modified-Since": response.headers["Last-Modified"]}
+    )
+    assert response.status_code == 304
+
+
+async def set_title(db: AsyncSession, item: Item, title: str) -> None:
+    await db.execute(
+        update(Item).where(Item.ingame_id == item.ingame_id).values(title=title)
+    )
+    await db.commit()
+
+
+@pytest.mark.asyncio
+async def test_search_items(client: AsyncClient, db: AsyncSession) -> None:
+    word = random_lower_string()
+    title_match = await create_random_item(db)
+    await set_title(db, title_match, f"{word} lance")
+    skill_match = await create_random_item(db)
+    await create_random_skill(db, skill_match)
+    await db.execute(
+        update(Skill)
+        .where(Skill.item_ingame_id == skill_match.ingame_id)
+        .values(description=f"Summons a {word}")
+    )
+    await db.commit()
+    response = await client.get(
+        f"{settings.API_V1_STR}/items/search",
+        params={"q": word, "fields": "ingame_id,title"},
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert [item["ingame_id"] for item in content["data"]] == [
+        title_match.ingame_id,
+        skill_match.ingame_id,
+    ]
+    assert content["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_search_items_skill_deleted(
+    client: AsyncClient, db: AsyncSession
+) -> None:
+    word = random_lower_string()
+    item = await create_random_item(db)
+    await create_random_skill(db, item)
+    await db.execute(
+        update(Skill).where(Skill.item_ingame_id == item.ingame_id).values(title=word)
+    )
+    await db.commit()
+    url = f"{settings.API_V1_STR}/items/search"
+    response = await client.get(url, params={"q": word})
+    assert len(response.json()["data"]) == 1
+    await db.execute(delete(Skill).where(Skill.item_ingame_id == item.ingame_id))
+    await db.commit()
+    response = await client.get(url, params={"q": word})
+    assert response.json()["data"] == []
+
+
+@pytest.mark.asyncio
+async def test_search_items_cursor(client: AsyncClient, db: AsyncSession) -> None:
+    word = random_lower_string()
+    for n in range(3):
+        item = await create_random_item(db)
+        await set_title(db, item, f"{word} {'blade ' * n}")
+    url = f"{settings.API_V1_STR}/items/search"
+    response = await client.get(url, params={"q": word, "limit": 2})
+    first_page = response.json()
+    assert len(first_page["data"]) == 2
+    assert first_page["next_cursor"] is not None
+    response = await client.get(
+        url, params={"q": word, "limit": 2, "after": first_page["next_cursor"]}
+    )
+    second_page = response.json()
+    assert len(second_page["data"]) == 1
+    seen = {item["ingame_id"] for item in first_page["data"]}
+    assert second_page["data"][0]["ingame_id"] not in seen
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("after", ["not-a-cursor", encode_cursor(0.5, 3_000_000_000)])
+async def test_search_items_invalid_cursor(client: AsyncClient, after: str) -> None:
+    response = await client.get(
+        f"{settings.API_V1_STR}/items/search",
+        params={"q": "lance", "after": after},
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path", ["/items/", "/items/search"])
+@pytest.mark.parametrize("limit", [-1, 0, settings.ITEMS_MAX_LIMIT + 1])
+async def test_read_items_invalid_limit(
+    client: AsyncClient, path: str, limit: int
+) -> None:
+    response = await client.get(
+        f"{settings.API_V1_STR}{path}", params={"q": "lance", "limit": limit}
+    )
+    assert response.status_code == 422
+
+
+async def make_fire_legendary(db: AsyncSession, item: Item) -> None:
+    await db.execute(
+        update(Item)
+        .where(Item.ingame_id == item.ingame_id)
+        .values(rarity=7, damage_type=DamageType.FIRE)
+    )
+    await db.commit()
+
+
+@pytest.mark.asyncio
+async def test_read_items_filters(client: AsyncClient, db: AsyncSession) -> None:
+    item = await create_random_item(db)
+    await make_fire_legendary(db, item)
+    await create_random_item(db)
+    response = await client.get(
+        f"{settings.API_V1_STR}/items/",
+        params={"rarity": [6, 7], "damage_type": "Fire"},
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert item.ingame_id in [i["ingame_id"] for i in content["data"]]
+    assert all(i["rarity"] in (6, 7) for i in content["data"])
+    assert all(i["damage_type"] == "Fire" for i in content["data"])
+    expected = await db.scalar(
+        select(func.count())
+        .select_from(Item)
+        .where(Item.rarity.in_((6, 7)), Item.damage_type == DamageType.FIRE)
+    )
+    assert content["count"] == expected
+    assert content["count_kind"] == "exact"
+
+
+@pytest.mark.asyncio
+async def test_read_items_weapon_type_filter(
+    client: AsyncClient, db: AsyncSession
+) -> None:
+    item = await create_random_item(db)
+    await create_random_properties(db, item)
+    weapon_type = await db.scalar(
+        select(Properties.weapon_type).where(
+            Properties.item_ingame_id == item.ingame_id
+        )
+    )
+    assert weapon_type is not None
+    response = await client.get(
+        f"{settings.API_V1_STR}/items/",
+        params={"weapon_type": weapon_type.value, "include": "properties"},
+    )
+    content = response.json()
+    assert item.ingame_id in [i["ingame_id"] for i in content["data"]]
+    assert all(
+        i["properties"]["weapon_type"] == weapon_type.value for i in content["data"]
+    )
+
+
+@pytest.mark.asyncio
+async def test_read_items_filters_cursor_count(
+    client: AsyncClient, db: AsyncSession
+) -> None:
+    for _ in range(3):
+        await make_fire_legendary(db, await create_random_item(db))
+    url = f"{settings.API_V1_STR}/items/"
+    params: dict[str, Any] = {"rarity": 7, "limit": 1}
+    first_page = (await client.get(url, params=params)).json()
+    params["after"] = first_page["next_cursor"]
+    second_page = (await client.get(url, params=params)).json()
+    assert second_page["count"] == first_page["count"]
+    assert second_page["data"][0]["rarity"] == 7
+
+
+@pytest.mark.asyncio
+async def test_read_items_filters_exact_count(
+    client: AsyncClient, db: AsyncSession, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "ITEMS_COUNT_STRATEGY", "estimated")
+    await make_fire_legendary(db, await create_random_item(db))
+    response = await client.get(f"{settings.API_V1_STR}/items/", params={"rarity": 7})
+    assert response.json()["count_kind"] == "exact"
+
+
+@pytest.mark.asyncio
+async def test_read_items_facets(client: AsyncClient, db: AsyncSession) -> None:
+    item = await create_random_item(db)
+    await make_fire_legendary(db, item)
+    await create_random_properties(db, item)
+    response = await client.get(
+        f"{settings.API_V1_STR}/items/",
+        params={"rarity": 7, "facets": "true", "fields": "ingame_id"},
+    )
+    content = response.json()
+    facets = content["facets"]
+    assert facets["rarity"] == [{"value": 7, "count": content["count"]}]
+    for name in ("damage_type", "weapon_type"):
+        assert sum(facet["count"] for facet in facets[name]) == content["count"]
+    assert "Fire" in [facet["value"] for facet in facets["damage_type"]]
+
+
+@pytest.mark.asyncio
+async def test_read_items_facets_single_statement(
+    client: AsyncClient, db: AsyncSession
+) -> None:
+    await create_random_item(db)
+    statements: list[str] = []
+
+    def record(*args: Any) -> None:
+        statements.append(args[2])
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        response = await client.get(
+            f"{settings.API_V1_STR}/items/",
+            params={"facets": "true", "fields": "ingame_id"},
+        )
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+    assert response.status_code == 200
+    # The page and one GROUPING SETS query for every facet.
+    statements = [s for s in statements if "catalog_version" not in s]
+    assert len(statements) == 2
+    assert "GROUPING SETS" in statements[1]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "params",
+    [
+        {},
+        {"limit": 5},
+        {"after": "1", "limit": 5},
+        {"skip": 100_000},
+        {"fields": "ingame_id,damage_type", "include": "properties"},
+        {"include": "skills", "rarity": [1, 2, 3], "facets": "true"},
+        {"weapon_type": "Pistol"},
+    ],
+)
+async def test_read_items_rendered_in_database(
+    client: AsyncClient,
+    db: AsyncSession,
+    monkeypatch: pytest.MonkeyPatch,
+    params: dict[str, Any],
+) -> None:
+    item = await create_random_item(db)
+    await create_random_properties(db, item)
+    await create_random_skill(db, item)
+    await create_random_skill(db, item)
+    await create_random_item(db)
+    response = await client.get(f"{settings.API_V1_STR}/items/", params=params)
+    assert response.status_code == 200
+
+    response_cache.clear()
+    monkeypatch.setattr(settings, "ITEMS_RENDER_STRATEGY", "database")
+    database_response = await client.get(f"{settings.API_V1_STR}/items/", params=params)
+    assert database_response.status_code == 200
+    assert database_response.headers["content-type"] == "application/json"
+    assert database_response.json() == response.json()
+    assert (
+        database_response.headers[SURROGATE_KEY_HEADER]
+        == response.headers[SURROGATE_KEY_HEADER]
+    )
+    if not params.keys() & {"fields", "include"}:
+        assert ItemsReadSchema.model_validate_json(database_response.content)
+
+
+@pytest.mark.asyncio
+async def test_export_items(client: AsyncClient, db: AsyncSession) -> None:
+    item = await create_random_item(db)
+    await create_random_properties(db, item)
+    await create_random_skill(db, item)
+    response = await client.get(f"{settings.API_V1_STR}/items/export.ndjson")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    exported = [json.loads(line) for line in response.text.splitlines()]
+
+    response = await client.get(
+        f"{settings.API_V1_STR}/items/", params={"limit": 10_000}
+    )
+    assert exported == response.json()["data"]
+    assert any(api_item["ingame_id"] == item.ingame_id for api_item in exported)
+
+
+@pytest.mark.asyncio
+async def test_export_items_filters_and_fields(
+    client: AsyncClient, db: AsyncSession
+) -> None:
+    for _ in range(3):
+        await create_random_item(db)
+    response = await client.get(
+        f"{settings.API_V1_STR}/items/export.ndjson",
+        params={"rarity": [1, 2], "fields": "ingame_id,rarity", "include": ""},
+    )
+    assert response.status_code == 200
+    exported = [json.loads(line) for line in response.text.splitlines()]
+    count = await db.scalar(
+        select(func.count()).select_from(Item).where(Item.rarity.in_([1, 2]))
+    )
+    assert len(exported) == count
+    for api_item in exported:
+        assert set(api_item) == {"ingame_id", "rarity"}
+        assert api_item["rarity"] in (1, 2)
+
+
+@pytest.mark.asyncio
+async def test_export_items_chunks(
+    db: AsyncSession, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    for _ in range(4):
+        await create_random_item(db)
+    monkeypatch.setattr(settings, "ITEMS_EXPORT_CHUNK_SIZE", 2)
+    count = await db.scalar(select(func.count()).select_from(Item))
+    assert count is not None
+
+    # httpx joins the body of ASGI responses, read the messages directly.
+    bodies: list[bytes] = []
+
+    requests: list[Message] = [{"type": "http.request", "body": b""}]
+
+    async def receive() -> Message:
+        if requests:
+            return requests.pop()
+        # The client stays connected until the response is complete.
+        await asyncio.Event().wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: Message) -> None:
+        if message["type"] == "http.response.body" and message.get("body"):
+            bodies.append(message["body"])
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": f"{settings.API_V1_STR}/items/export.ndjson",
+        "raw_path": b"",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [],
+        "client": ("127.0.0.1", 123),
+        "server": ("127.0.0.1", 80),
+    }
+    await app(scope, receive, send)
+    assert len(bodies) == -(-count // 2)
+    assert all(body.count(b"\n") <= 2 for body in bodies)
+
+
+@pytest.mark.asyncio
+async def test_read_item_revisions(client: AsyncClient, db: AsyncSession) -> None:
+    first = await create_random_item(db)
+    second = await create_random_item(db)
+    url = f"{settings.API_V1_STR}/items/revisions"
+    params = {"fields": "ingame_id,title,rarity"}
+    response = await client.get(url, params=params)
+    assert response.status_code == 200
+    content = response.json()
+    etag = response.headers["ETag"]
+    assert etag.startswith(f'"catalog-{content["version"]}')
+    revisions = dict(content["data"])
+    ingame_ids = [ingame_id for ingame_id, _ in content["data"]]
+    assert ingame_ids == sorted(ingame_ids)
+
+    response = await client.get(url, params=params, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+    await set_title(db, first, random_lower_string())
+    response = await client.get(url, params=params, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    changed = {
+        ingame_id
+        for ingame_id, revision in response.json()["data"]
+        if revisions.get(ingame_id) != revision
+    }
+    assert changed == {first.ingame_id}
+    assert second.ingame_id in revisions
+
+    # Fields outside the projection do not change the revision.
+    response = await client.get(url, params={"fields": "ingame_id,rarity"})
+    rarity_revisions = dict(response.json()["data"])
+    await set_title(db, second, random_lower_string())
+    response = await client.get(url, params={"fields": "ingame_id,rarity"})
+    assert dict(response.json()["data"]) == rarity_revisions
+
+
+@pytest.mark.asyncio
+async def test_read_items_batch(client: AsyncClient, db: AsyncSession) -> None:
+    items = [await create_random_item(db) for _ in range(3)]
+    for item in items:
+        await create_random_skill(db, item)
+    missing_id = max(item.ingame_id for item in items) + 1000
+    requested = [items[2].ingame_id, missing_id, items[0].ingame_id, items[2].ingame_id]
+    statements: list[str] = []
+
+    def record(*args: Any) -> None:
+        statements.append(args[2])
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        response = await client.get(
+            f"{settings.API_V1_STR}/items/batch",
+            params={"ids": ",".join(map(str, requested))},
+        )
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+    assert response.status_code == 200
+    content = response.json()
+    assert [item["ingame_id"] for item in content["data"]] == [
+        items[2].ingame_id,
+        items[0].ingame_id,
+    ]
+    assert content["missing"] == [missing_id]
+    assert len(content["data"][0]["skills"]) == 1
+    item_statements = [s for s in statements if "FROM item" in s]
+    assert len(item_statements) == 1
+    assert "ANY" in item_statements[0]
+
+    response = await client.post(
+        f"{settings.API_V1_STR}/items/batch",
+        params={"fields": "ingame_id,title"},
+        json={"ids": [items[1].ingame_id, missing_id]},
+    )
+    assert response.status_code == 200
+    assert response.json() == {
+        "data": [{"ingame_id": items[1].ingame_id, "title": items[1].title}],
+        "missing": [missing_id],
+    }
+
+
+@pytest.mark.asyncio
+async def test_read_items_batch_out_of_range(
+    client: AsyncClient, db: AsyncSession
+) -> None:
+    item = await create_random_item(db)
+    url = f"{settings.API_V1_STR}/items/batch"
+    requested = [item.ingame_id, 3_000_000_000, -1, 0]
+    response = await client.get(url, params={"ids": ",".join(map(str, requested))})
+    assert response.status_code == 200
+    assert [i["ingame_id"] for i in response.json()["data"]] == [item.ingame_id]
+    assert response.json()["missing"] == requested[1:]
+    response = await client.post(url, json={"ids": [3_000_000_000]})
+    assert response.status_code == 200
+    assert response.json() == {"data": [], "missing": [3_000_000_000]}
+
+
+@pytest.mark.asyncio
+async def test_read_items_batch_surrogate_keys(client: AsyncClient) -> None:
+    response = await client.get(
+        f"{settings.API_V1_STR}/items/batch", params={"ids": ",".join(["7"] * 1000)}
+    )
+    assert response.status_code == 200
+    assert response.headers[SURROGATE_KEY_HEADER] == f"{ITEMS_LIST_KEY} {item_key(7)}"
+
+
+@pytest.mark.asyncio
+async def test_read_items_batch_invalid(
+    client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    url = f"{settings.API_V1_STR}/items/batch"
+    response = await client.get(url, params={"ids": "1,two"})
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid ids"}
+
+    monkeypatch.setattr(settings, "ITEMS_BATCH_MAX_IDS", 2)
+    response = await client.post(url, json={"ids": [1, 2, 3]})
+    assert response.status_code == 400
+    response = await client.post(url, json={"ids": []})
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_read_item_rankings(client: AsyncClient, db: AsyncSession) -> None:
+    stats = {
+        "max_lvl": 30,
+        "base_damage": 100,
+        "damage_per_lvl": 10,
+        "base_atk_speed": 2.0,
+        "atk_speed_per_lvl": 0,
+    }
+    items = [await create_random_item(db) for _ in range(3)]
+    await create_random_properties(
+        db, items[0], **stats, weapon_type=WeaponType.PISTOL, crit_rate=0.5
+    )
+    await create_random_properties(
+        db,
+        items[1],
+        **stats | {"max_lvl": 5, "base_damage": 260, "base_atk_speed": 1.0},
+        weapon_type=WeaponType.PISTOL,
+        crit_rate=None,
+    )
+    await create_random_properties(
+        db, items[2], **stats | {"base_damage": 1000}, weapon_type=WeaponType.MELEE
+    )
+    ingame_ids = [item.ingame_id for item in items]
+    url = f"{settings.API_V1_STR}/items/rankings"
+
+    response = await client.get(
+        url, params={"metric": "dps", "level": 10, "weapon_type": "Pistol"}
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert (content["metric"], content["level"]) == ("dps", 10)
+    data = [entry for entry in content["data"] if entry["ingame_id"] in ingame_ids]
+    assert data == [
+        {
+            "ingame_id": items[0].ingame_id,
+            "title": items[0].title,
+            "weapon_type": "Pistol",
+            "level": 10,
+            "value": 190 * 2.0 * 1.5,
+        },
+        {
+            "ingame_id": items[1].ingame_id,
+            "title": items[1].title,
+            "weapon_type": "Pistol",
+            "level": 5,
+            "value": 300.0,
+        },
+    ]
+
+    response = await client.get(url, params={"metric": "damage"})
+    data = [
+        entry for entry in response.json()["data"] if entry["ingame_id"] in ingame_ids
+    ]
+    assert [(entry["ingame_id"], entry["value"]) for entry in data] == [
+        (items[2].ingame_id, 1290.0),
+        (items[0].ingame_id, 390.0),
+        (items[1].ingame_id, 300.0),
+    ]
+
+    response = await client.get(url, params={"metric": "range"})
+    assert response.status_code == 422
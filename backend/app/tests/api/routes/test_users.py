@@ -1,12 +1,17 @@
+from typing import Any
+
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import event, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import crud
 from app.core.config import settings
+from app.core.db import engine
 from app.core.security import verify_password
+from app.models import User
 from app.schemas import UserCreateSchema
-from app.tests.utils.user import create_random_user
+from app.tests.utils.user import create_random_user, user_authentication_headers
 from app.tests.utils.utils import random_email, random_lower_string
 
 
@@ -117,6 +122,28 @@ async def test_read_users(
         assert "name" in item
 
 
+@pytest.mark.asyncio
+async def test_read_users_cached_count(
+    client: AsyncClient,
+    superuser_token_headers: dict[str, str],
+    db: AsyncSession,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "USERS_COUNT_STRATEGY", "cached")
+    r = await client.get(
+        f"{settings.API_V1_STR}/users/",
+        headers=superuser_token_headers,
+    )
+    api_users = r.json()
+    assert api_users["count_kind"] == "cached"
+    await create_random_user(db)
+    r = await client.get(
+        f"{settings.API_V1_STR}/users/",
+        headers=superuser_token_headers,
+    )
+    assert r.json()["count"] == api_users["count"] + 1
+
+
 @pytest.mark.asyncio
 async def test_create_user_by_normal_user(
     client: AsyncClient, normal_user_token_headers: dict[str, str]
@@ -588,3 +615,81 @@ async def test_delete_user_without_privileges(
     )
     assert r.status_code == 403
     assert r.json()["detail"] == "The user doesn't have enough privileges"
+
+
+@pytest.mark.asyncio
+async def test_read_user_me_cached_principal(
+    client: AsyncClient, superuser_token_headers: dict[str, str]
+) -> None:
+    url = f"{settings.API_V1_STR}/users/me"
+    await client.get(url, headers=superuser_token_headers)
+    statements: list[str] = []
+
+    def record(*args: Any) -> None:
+        statements.append(args[2])
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        r = await client.get(url, headers=superuser_token_headers)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+    assert r.status_code == 200
+    assert r.json()["name"] == settings.FIRST_SUPERUSER_NAME
+    assert statements == []
+
+
+@pytest.mark.asyncio
+async def test_deactivated_user_rejected_immediately(
+    client: AsyncClient, superuser_token_headers: dict[str, str], db: AsyncSession
+) -> None:
+    username = random_lower_string()
+    password = random_lower_string()
+    user_in = UserCreateSchema(email=random_email(), name=username, password=password)
+    await crud.create_user(db, user_in)
+    headers = await user_authentication_headers(client, username, password)
+    url = f"{settings.API_V1_STR}/users/me"
+    r = await client.get(url, headers=headers)
+    assert r.status_code == 200
+    r = await client.patch(
+        f"{settings.API_V1_STR}/users/{username}",
+        headers=superuser_token_headers,
+        json={"is_active": False},
+    )
+    assert r.status_code == 200
+    r = await client.get(url, headers=headers)
+    assert r.status_code == 400
+    assert r.json()["detail"] == "Inactive user"
+
+
+@pytest.mark.asyncio
+async def test_privileged_paths_recheck_cached_principal(
+    client: AsyncClient, db: AsyncSession
+) -> None:
+    username = random_lower_string()
+    password = random_lower_string()
+    user_in = UserCreateSchema(
+        email=random_email(), name=username, password=password, is_superuser=True
+    )
+    await crud.create_user(db, user_in)
+    headers = await user_authentication_headers(client, username, password)
+    url = f"{settings.API_V1_STR}/users/"
+    r = await client.get(url, headers=headers)
+    assert r.status_code == 200
+
+    # Written outside this worker, the cached principal is not invalidated.
+    await db.execute(
+        update(User).where(User.name == username).values(is_superuser=False)
+    )
+    await db.commit()
+    r = await client.get(url, headers=headers)
+    assert r.status_code == 403
+    r = await client.get(f"{url}{settings.FIRST_SUPERUSER_NAME}", headers=headers)
+    assert r.status_code == 403
+
+    await db.execute(update(User).where(User.name == username).values(is_active=False))
+    await db.commit()
+    r = await client.patch(
+        f"{settings.API_V1_STR}/users/me", headers=headers, json={"name": username}
+    )
+    assert r.status_code == 400
+    assert r.json()["detail"] == "Inactive user"
@@ -0,0 +1,32 @@
+import pytest
+from httpx import AsyncClient
+
+from app.core.config import settings
+
+
+@pytest.mark.asyncio
+async def test_read_metrics(
+    client: AsyncClient, superuser_token_headers: dict[str, str]
+) -> None:
+    response = await client.get(
+        f"{settings.API_V1_STR}/utils/metrics", headers=superuser_token_headers
+    )
+    assert response.status_code == 200
+    hashing = response.json()["password_hashing"]
+    assert hashing["waiting"] == 0
+    assert hashing["running"] == 0
+    # Logging in the superuser verified a password.
+    assert hashing["completed"] >= 1
+    database_pool = response.json()["database_pool"]
+    assert database_pool["checkouts"] >= 1
+    assert database_pool["wait_ms"]["count"] >= database_pool["checkouts"]
+
+
+@pytest.mark.asyncio
+async def test_read_metrics_normal_user(
+    client: AsyncClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    response = await client.get(
+        f"{settings.API_V1_STR}/utils/metrics", headers=normal_user_token_headers
+    )
+    assert response.status_code == 403
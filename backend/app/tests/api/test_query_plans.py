@@ -0,0 +1,154 @@
+from collections.abc import AsyncGenerator, Iterator
+from typing import Any
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.db import engine
+from app.tests.utils.item import (
+    create_random_item,
+    create_random_properties,
+    create_random_skill,
+)
+
+# Planner cost units. A sequential scan that could not be avoided costs
+# at least 1e10 while enable_seqscan is off, far above this budget.
+COST_BUDGET = 5_000.0
+
+type Statement = tuple[str, Any]
+
+
+@pytest_asyncio.fixture(scope="module")
+async def seeded_item_id(db: AsyncSession) -> int:
+    item_id = 0
+    for _ in range(30):
+        item = await create_random_item(db)
+        await create_random_properties(db, item)
+        await create_random_skill(db, item)
+        await create_random_skill(db, item)
+        item_id = item.ingame_id
+    return item_id
+
+
+@pytest_asyncio.fixture
+async def statements() -> AsyncGenerator[list[Statement], None]:
+    captured: list[Statement] = []
+
+    def record(*args: Any) -> None:
+        statement, parameters = args[2], args[3]
+        if statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            captured.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    yield captured
+    event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+
+async def explain(statement: str, parameters: Any) -> dict[str, Any]:
+    async with engine.connect() as connection:
+        raw_connection = await connection.get_raw_connection()
+        driver_connection = raw_connection.driver_connection
+        assert driver_connection is not None
+        async with driver_connection.transaction():
+            # Small test tables are always cheaper to scan, only report a
+            # sequential scan when no index could serve the query.
+            await driver_connection.execute("SET LOCAL enable_seqscan = off")
+            plan = await driver_connection.fetchval(
+                f"EXPLAIN (FORMAT JSON) {statement}", *(parameters or ())
+            )
+    # The engine registers a json codec, the plan arrives decoded.
+    result: dict[str, Any] = plan[0]["Plan"]
+    return result
+
+
+def plan_nodes(node: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    yield node
+    for child in node.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+async def assert_plans(statements: list[Statement]) -> None:
+    assert statements
+    for statement, parameters in statements:
+        plan = await explain(statement, parameters)
+        seq_scans = [
+            node["Relation Name"]
+            for node in plan_nodes(plan)
+            if node["Node Type"] == "Seq Scan"
+            and not node["Relation Name"].startswith("pg_")
+        ]
+        assert not seq_scans, f"Sequential scan on {seq_scans}:\n{statement}"
+        assert (
+            plan["Total Cost"] <= COST_BUDGET
+        ), f"Cost {plan['Total Cost']} over budget:\n{statement}"
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("seeded_item_id")
+@pytest.mark.parametrize(
+    "params",
+    [
+        {},
+        {"fields": "ingame_id,title,image_url"},
+        {"after": "1", "limit": 10},
+        {"rarity": [6, 7], "damage_type": "Fire"},
+        {"weapon_type": "Pistol", "facets": "true"},
+    ],
+)
+async def test_read_items_plans(
+    client: AsyncClient, statements: list[Statement], params: dict[str, Any]
+) -> None:
+    response = await client.get(f"{settings.API_V1_STR}/items/", params=params)
+    assert response.status_code == 200
+    await assert_plans(statements)
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("seeded_item_id")
+async def test_read_items_rendered_in_database_plans(
+    client: AsyncClient, statements: list[Statement], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "ITEMS_RENDER_STRATEGY", "database")
+    # One statement replaces three and runs the properties and skills subplans
+    # once per item, a smaller page keeps it comparable to the others.
+    response = await client.get(f"{settings.API_V1_STR}/items/", params={"limit": 20})
+    assert response.status_code == 200
+    await assert_plans(statements)
+
+
+@pytest.mark.asyncio
+async def test_read_item_plans(
+    client: AsyncClient, seeded_item_id: int, statements: list[Statement]
+) -> None:
+    response = await client.get(f"{settings.API_V1_STR}/items/{seeded_item_id}")
+    assert response.status_code == 200
+    await assert_plans(statements)
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("seeded_item_id")
+async def test_search_items_plans(
+    client: AsyncClient, statements: list[Statement]
+) -> None:
+    response = await client.get(
+        f"{settings.API_V1_STR}/items/search", params={"q": "lance"}
+    )
+    assert response.status_code == 200
+    await assert_plans(statements)
+
+
+@pytest.mark.asyncio
+async def test_read_users_plans(
+    client: AsyncClient,
+    superuser_token_headers: dict[str, str],
+    statements: list[Statement],
+) -> None:
+    response = await client.get(
+        f"{settings.API_V1_STR}/users/", headers=superuser_token_headers
+    )
+    assert response.status_code == 200
+    await assert_plans(statements)
@@ -0,0 +1,106 @@
+from collections.abc import AsyncGenerator
+from typing import Any
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.core.cache import response_cache
+from app.core.config import settings
+from app.core.db import engine, replica_router
+from app.core.middleware import READ_YOUR_WRITES_HEADER
+
+
+def capture(target: AsyncEngine) -> list[str]:
+    captured: list[str] = []
+
+    def record(*args: Any) -> None:
+        captured.append(args[2])
+
+    event.listen(target.sync_engine, "before_cursor_execute", record)
+    return captured
+
+
+@pytest_asyncio.fixture
+async def replica(
+    monkeypatch: pytest.MonkeyPatch,
+) -> AsyncGenerator[AsyncEngine, None]:
+    # A streaming replica serves the same rows, a second engine on the test
+    # database stands in for it.
+    replica_engine = create_async_engine(
+        settings.SQLALCHEMY_DATABASE_URI.unicode_string()
+    )
+    monkeypatch.setattr(replica_router, "replica", replica_engine)
+    monkeypatch.setattr(replica_router, "unhealthy_until", 0.0)
+    yield replica_engine
+    await replica_engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def dead_replica(
+    monkeypatch: pytest.MonkeyPatch,
+) -> AsyncGenerator[AsyncEngine, None]:
+    url = make_url(settings.SQLALCHEMY_DATABASE_URI.unicode_string()).set(port=1)
+    replica_engine = create_async_engine(url, connect_args={"timeout": 1})
+    monkeypatch.setattr(replica_router, "replica", replica_engine)
+    monkeypatch.setattr(replica_router, "unhealthy_until", 0.0)
+    yield replica_engine
+    await replica_engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_reads_use_replica(
+    client: AsyncClient,
+    replica: AsyncEngine,
+    superuser_token_headers: dict[str, str],
+) -> None:
+    replica_statements = capture(replica)
+    primary_statements = capture(engine)
+
+    # A cached response would not reach either engine.
+    response_cache.clear()
+    response = await client.get(f"{settings.API_V1_STR}/items/")
+    assert response.status_code == 200
+    response = await client.get(
+        f"{settings.API_V1_STR}/users/", headers=superuser_token_headers
+    )
+    assert response.status_code == 200
+
+    assert any("FROM item" in statement for statement in replica_statements)
+    assert any('FROM "user"' in statement for statement in replica_statements)
+    assert not any("FROM item" in statement for statement in primary_statements)
+
+
+@pytest.mark.asyncio
+async def test_read_your_writes_uses_primary(
+    client: AsyncClient, replica: AsyncEngine
+) -> None:
+    replica_statements = capture(replica)
+    primary_statements = capture(engine)
+
+    response = await client.get(
+        f"{settings.API_V1_STR}/items/", headers={READ_YOUR_WRITES_HEADER: "1"}
+    )
+    assert response.status_code == 200
+    assert "X-Cache" not in response.headers
+    assert not replica_statements
+    assert any("FROM item" in statement for statement in primary_statements)
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("dead_replica")
+async def test_unhealthy_replica_falls_back(client: AsyncClient) -> None:
+    fallbacks = replica_router.fallbacks
+
+    response = await client.get(f"{settings.API_V1_STR}/items/")
+    assert response.status_code == 200
+    assert replica_router.fallbacks == fallbacks + 1
+    assert not replica_router.available
+
+    # Further reads skip the replica until the retry period is over.
+    response = await client.get(f"{settings.API_V1_STR}/items/", params={"limit": 1})
+    assert response.status_code == 200
+    assert replica_router.fallbacks == fallbacks + 1
@@ -0,0 +1,38 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.catalog.loader import load_catalog
+from app.catalog.rows import catalog_rows
+from app.core.config import settings
+from app.tests.utils.item import random_parsed_item
+
+
+@pytest.mark.asyncio
+async def test_load_catalog(client: AsyncClient, db: AsyncSession) -> None:
+    parsed_items = [random_parsed_item(), random_parsed_item(skills=0)]
+    written = await load_catalog(db, [catalog_rows(parsed_items)])
+    await db.commit()
+    templates = {skill.description_template_id for skill in parsed_items[0].skills}
+    assert written == 2 + 2 + 2 + len(templates)
+
+    parsed_item = parsed_items[0]
+    response = await client.get(
+        f"{settings.API_V1_STR}/items/{parsed_item.info.id}",
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["title"] == parsed_item.info.title
+    assert content["damage_type"] == parsed_item.info.damage_type.value
+    assert content["properties"]["max_lvl"] == parsed_item.properties.max_lvl
+    assert content["properties"]["weapon_type"] == (
+        parsed_item.properties.weapon_type.value
+    )
+    assert [skill["title"] for skill in content["skills"]] == [
+        skill.title for skill in parsed_item.skills
+    ]
+
+    response = await client.get(
+        f"{settings.API_V1_STR}/items/{parsed_items[1].info.id}",
+    )
+    assert response.json()["skills"] == []
@@ -0,0 +1,39 @@
+import pytest
+
+from app.catalog.pipeline import IdRange, id_ranges, stream_batches
+from app.catalog.rows import CatalogRows, catalog_rows
+from app.tests.utils.item import random_parsed_item
+
+
+def parse_fake_range(id_range: IdRange) -> CatalogRows:
+    first, last = id_range
+    return catalog_rows(random_parsed_item(i) for i in range(first, last + 1))
+
+
+def parse_failing_range(id_range: IdRange) -> CatalogRows:
+    msg = f"Broken range: {id_range}"
+    raise ValueError(msg)
+
+
+def test_id_ranges() -> None:
+    assert id_ranges(1, 10, 4) == [(1, 4), (5, 8), (9, 10)]
+
+
+@pytest.mark.asyncio
+async def test_stream_batches() -> None:
+    ranges = id_ranges(10_000, 10_099, 7)
+    ingame_ids: list[int] = []
+    async for rows in stream_batches(ranges, parse_fake_range, workers=2, queue_size=1):
+        ingame_ids.extend(record[0] for record in rows.items)
+        assert len(rows.properties) == len(rows.items)
+    assert sorted(ingame_ids) == list(range(10_000, 10_100))
+
+
+@pytest.mark.asyncio
+async def test_stream_batches_error() -> None:
+    batches = stream_batches(
+        id_ranges(1, 10, 5), parse_failing_range, workers=2, queue_size=1
+    )
+    with pytest.raises(ExceptionGroup) as exc_info:
+        await anext(batches)
+    assert exc_info.group_contains(ValueError)
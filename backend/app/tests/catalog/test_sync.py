@@ -0,0 +1,91 @@
+import dataclasses
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.catalog.loader import load_catalog
+from app.catalog.rows import catalog_rows
+from app.catalog.sync import TableSyncReport, sync_catalog
+from app.models import Item, Properties, Skill, SkillDescriptionTemplate
+from app.tests.utils.item import random_parsed_item
+
+
+@pytest.mark.asyncio
+async def test_sync_catalog(db: AsyncSession) -> None:
+    # Rows created by other tests are not part of the dump and get removed.
+    counts = [
+        (await db.execute(select(func.count()).select_from(model))).scalar_one()
+        for model in (Item, Properties, Skill)
+    ]
+    other_items, other_properties, other_skills = counts
+    kept, changed, removed = (random_parsed_item() for _ in range(3))
+    await load_catalog(db, [catalog_rows([kept, changed, removed])])
+    await db.commit()
+
+    skill_ids = (
+        (
+            await db.execute(
+                select(Skill.id).where(Skill.item_ingame_id == changed.info.id)
+            )
+        )
+        .scalars()
+        .all()
+    )
+    changed = dataclasses.replace(
+        changed,
+        info=dataclasses.replace(changed.info, title="changed"),
+        skills=[
+            changed.skills[0],
+            dataclasses.replace(changed.skills[1], description="changed"),
+        ],
+    )
+    added = random_parsed_item()
+    report = await sync_catalog(db, catalog_rows([kept, changed, added]))
+    await db.commit()
+
+    assert report.item == TableSyncReport(
+        inserted=1, updated=1, deleted=1 + other_items, unchanged=1
+    )
+    assert report.properties == TableSyncReport(
+        inserted=1, deleted=1 + other_properties, unchanged=2
+    )
+    assert report.skill == TableSyncReport(
+        inserted=2, updated=1, deleted=2 + other_skills, unchanged=3
+    )
+
+    items = (await db.execute(select(Item.ingame_id, Item.title))).tuples().all()
+    assert dict(items) == {
+        kept.info.id: kept.info.title,
+        changed.info.id: "changed",
+        added.info.id: added.info.title,
+    }
+    new_skill_ids = (
+        (
+            await db.execute(
+                select(Skill.id).where(Skill.item_ingame_id == changed.info.id)
+            )
+        )
+        .scalars()
+        .all()
+    )
+    assert sorted(new_skill_ids) == sorted(skill_ids)
+
+    report = await sync_catalog(db, catalog_rows([kept, changed, added]))
+    await db.commit()
+    assert report.item == TableSyncReport(unchanged=3)
+    assert report.skill == TableSyncReport(unchanged=6)
+
+    # Templates of removed skills go with them, the rest are stored once.
+    templates = {
+        skill.description_template_id: skill.description_template
+        for parsed_item in (kept, changed, added)
+        for skill in parsed_item.skills
+    }
+    assert report.skill_description_template == TableSyncReport(
+        unchanged=len(templates)
+    )
+    stored = await db.execute(
+        select(SkillDescriptionTemplate.id, SkillDescriptionTemplate.template)
+    )
+    assert dict(stored.tuples().all()) == templates
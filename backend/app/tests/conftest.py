@@ -10,8 +10,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.core.db import engine, init_db
+from app.core.security import principal_cache
 from app.main import app
-from app.models import Item, User
+from app.models import Item, Properties, Skill, SkillDescriptionTemplate, User
 from app.tests.utils.user import authentication_token_from_username
 from app.tests.utils.utils import get_superuser_token_headers
 
@@ -29,6 +30,12 @@ async def db() -> AsyncGenerator[AsyncSession, None]:
     async with AsyncSession(engine, expire_on_commit=False) as session:
         await init_db(session)
         yield session
+        statement = delete(Skill)
+        await session.execute(statement)
+        statement = delete(SkillDescriptionTemplate)
+        await session.execute(statement)
+        statement = delete(Properties)
+        await session.execute(statement)
         statement = delete(Item)
         await session.execute(statement)
         statement = delete(User)
@@ -36,6 +43,11 @@ async def db() -> AsyncGenerator[AsyncSession, None]:
         await session.commit()
 
 
+@pytest.fixture(autouse=True)
+def clear_caches() -> None:
+    principal_cache.clear()
+
+
 @pytest_asyncio.fixture(scope="module")
 async def client() -> AsyncGenerator[AsyncClient, None]:
     async with AsyncClient(
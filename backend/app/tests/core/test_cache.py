@@ -0,0 +1,57 @@
+import pytest
+
+from app.core.cache import ResponseCache, TTLCache
+
+
+def test_ttl_cache_evicts_least_recently_used() -> None:
+    cache: TTLCache[str, int] = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_ttl_cache_expires(monkeypatch: pytest.MonkeyPatch) -> None:
+    cache: TTLCache[str, int] = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    monkeypatch.setattr("app.core.cache.time.monotonic", lambda: float("inf"))
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_response_cache_purges_tagged_entries() -> None:
+    cache = ResponseCache(max_bytes=1024, ttl=60)
+    cache.set("/items/1", 200, [], b"one", frozenset({"item:1", "items:list"}))
+    cache.set("/items/2", 200, [], b"two", frozenset({"item:2"}))
+    cache.set("/items/", 200, [], b"list", frozenset({"items:list"}))
+    assert cache.purge("items:list") == 2
+    assert cache.get("/items/1") is None
+    assert cache.get("/items/") is None
+    assert cache.get("/items/2") is not None
+    assert cache.size == len(b"two")
+
+
+def test_response_cache_memory_bound() -> None:
+    cache = ResponseCache(max_bytes=10, ttl=60)
+    cache.set("a", 200, [], b"12345", frozenset({"t"}))
+    cache.set("b", 200, [], b"12345", frozenset({"t"}))
+    cache.get("a")
+    cache.set("c", 200, [], b"12345", frozenset({"t"}))
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.size <= 10
+    cache.set("d", 200, [], b"x" * 11, frozenset())
+    assert cache.get("d") is None
+
+
+def test_response_cache_accounts_variants() -> None:
+    cache = ResponseCache(max_bytes=20, ttl=60)
+    entry = cache.set("a", 200, [], b"1234567890", frozenset({"t"}))
+    cache.add_variant("a", entry, "gzip", b"12345")
+    assert cache.size == 15
+    cache.add_variant("a", entry, "br", b"123456")
+    assert cache.get("a") is None
+    assert cache.size == 0
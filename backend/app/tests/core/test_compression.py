@@ -0,0 +1,134 @@
+import gzip
+from collections.abc import AsyncIterator
+
+import brotli
+import pytest
+from httpx import ASGITransport, AsyncClient
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Route
+
+from app.core.compression import CompressionMiddleware, Compressor, negotiate_encoding
+from app.core.etag import etag_matches
+
+BODY = b'{"title": "Lance"}' * 200
+
+
+async def large(_: Request) -> Response:
+    return Response(BODY, media_type="application/json", headers={"ETag": '"v1"'})
+
+
+async def small(_: Request) -> Response:
+    return Response(b"{}", media_type="application/json")
+
+
+async def opted_out(_: Request) -> Response:
+    return Response(
+        BODY, media_type="application/json", headers={"Cache-Control": "no-transform"}
+    )
+
+
+async def image(_: Request) -> Response:
+    return Response(BODY, media_type="image/webp")
+
+
+async def stream(_: Request) -> StreamingResponse:
+    async def lines() -> AsyncIterator[bytes]:
+        for _ in range(3):
+            yield BODY + b"\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+app = CompressionMiddleware(
+    Starlette(
+        routes=[
+            Route("/large", large),
+            Route("/small", small),
+            Route("/opted-out", opted_out),
+            Route("/image", image),
+            Route("/stream", stream),
+        ]
+    )
+)
+
+
+async def fetch(path: str, accept_encoding: str) -> tuple[int, dict[str, str], bytes]:
+    async with (
+        AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client,
+        client.stream(
+            "GET", path, headers={"Accept-Encoding": accept_encoding}
+        ) as response,
+    ):
+        body = b"".join([chunk async for chunk in response.aiter_raw()])
+        return response.status_code, dict(response.headers), body
+
+
+@pytest.mark.parametrize(
+    ("accept_encoding", "expected"),
+    [
+        ("", None),
+        ("identity", None),
+        ("gzip", "gzip"),
+        ("gzip, deflate, br", "br"),
+        ("br;q=0.5, gzip", "gzip"),
+        ("br;q=0, gzip;q=0", None),
+        ("*", "br"),
+        ("*;q=0.1, gzip;q=0.5", "gzip"),
+        ("br;q=invalid, gzip", "gzip"),
+    ],
+)
+def test_negotiate_encoding(accept_encoding: str, expected: str | None) -> None:
+    assert negotiate_encoding(accept_encoding) == expected
+
+
+@pytest.mark.parametrize("encoding", ["br", "gzip"])
+def test_compressor_streams(encoding: str) -> None:
+    compressor = Compressor(encoding)
+    chunks = [compressor.compress(BODY, final=False) for _ in range(3)]
+    chunks.append(compressor.compress(b"", final=True))
+    decompress = brotli.decompress if encoding == "br" else gzip.decompress
+    assert decompress(b"".join(chunks)) == BODY * 3
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("encoding", ["br", "gzip"])
+async def test_compresses_large_responses(encoding: str) -> None:
+    status, headers, body = await fetch("/large", encoding)
+    assert status == 200
+    assert headers["content-encoding"] == encoding
+    assert headers["vary"] == "Accept-Encoding"
+    assert headers["etag"] == f'"v1-{encoding}"'
+    assert int(headers["content-length"]) == len(body) < len(BODY)
+    decompress = brotli.decompress if encoding == "br" else gzip.decompress
+    assert decompress(body) == BODY
+
+
+@pytest.mark.asyncio
+async def test_identity_varies_on_accept_encoding() -> None:
+    _, headers, body = await fetch("/large", "identity")
+    assert "content-encoding" not in headers
+    assert headers["vary"] == "Accept-Encoding"
+    assert body == BODY
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path", ["/small", "/opted-out", "/image"])
+async def test_skips_small_opted_out_and_binary_responses(path: str) -> None:
+    _, headers, _ = await fetch(path, "br")
+    assert "content-encoding" not in headers
+
+
+@pytest.mark.asyncio
+async def test_compresses_streaming_responses() -> None:
+    _, headers, body = await fetch("/stream", "gzip")
+    assert headers["content-encoding"] == "gzip"
+    assert "content-length" not in headers
+    assert gzip.decompress(body) == (BODY + b"\n") * 3
+
+
+def test_encoded_etag_matches_identity_etag() -> None:
+    assert etag_matches('"catalog-1-br"', '"catalog-1"')
+    assert etag_matches('W/"catalog-1-gzip"', '"catalog-1-br"')
+    assert not etag_matches('"catalog-2-br"', '"catalog-1"')
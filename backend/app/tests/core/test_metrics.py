@@ -0,0 +1,12 @@
+from app.core.metrics import Histogram
+
+
+def test_histogram_snapshot() -> None:
+    histogram = Histogram(buckets=(1, 10))
+    for value in (0.5, 1, 5, 50):
+        histogram.observe(value)
+    assert histogram.snapshot() == {
+        "buckets": {"1": 2, "10": 3, "+Inf": 4},
+        "count": 4,
+        "sum": 56.5,
+    }
@@ -0,0 +1,54 @@
+import asyncio
+import time
+
+import pytest
+
+from app.core.config import settings
+from app.core.security import (
+    get_password_hash,
+    get_password_hash_async,
+    hashing_metrics,
+    run_hashing,
+    verify_password_async,
+)
+
+
+@pytest.mark.asyncio
+async def test_password_hash_async() -> None:
+    hashed_password = await get_password_hash_async("secret")
+    assert await verify_password_async("secret", hashed_password)
+    assert not await verify_password_async("wrong", hashed_password)
+
+
+@pytest.mark.asyncio
+async def test_run_hashing_concurrency_cap() -> None:
+    running = 0
+    peak = 0
+
+    def work() -> None:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        time.sleep(0.01)
+        running -= 1
+
+    tasks = settings.PASSWORD_HASH_CONCURRENCY * 3
+    await asyncio.gather(*(run_hashing(work) for _ in range(tasks)))
+    assert peak <= settings.PASSWORD_HASH_CONCURRENCY
+    assert hashing_metrics.peak_waiting >= tasks - settings.PASSWORD_HASH_CONCURRENCY
+    assert hashing_metrics.waiting == 0
+    assert hashing_metrics.running == 0
+
+
+@pytest.mark.asyncio
+async def test_run_hashing_keeps_loop_responsive() -> None:
+    hashed_password = get_password_hash("secret")
+    verification = asyncio.ensure_future(
+        verify_password_async("secret", hashed_password)
+    )
+    start = time.perf_counter()
+    await asyncio.sleep(0)
+    # The loop is free while bcrypt runs in a worker thread.
+    assert time.perf_counter() - start < 0.01
+    assert not verification.done()
+    assert await verification
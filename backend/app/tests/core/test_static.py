@@ -0,0 +1,113 @@
+import gzip
+from pathlib import Path
+
+import brotli
+import pytest
+from httpx import ASGITransport, AsyncClient
+from starlette.applications import Starlette
+from starlette.routing import Mount
+
+from app.build_static import build
+from app.core.static import IMMUTABLE, PrecompressedStaticFiles
+
+SCRIPT = b"const items = [];\n" * 200
+STYLES = b"body { margin: 0; }\n" * 200
+INDEX = (
+    '<link rel="stylesheet" href="styles.css">\n'
+    '<script src="/script.js"></script>\n'
+    '<a href="https://example.com/script.js">\n'
+)
+
+
+@pytest.fixture
+def output(tmp_path: Path) -> Path:
+    source = tmp_path / "static"
+    source.mkdir()
+    (source / "script.js").write_bytes(SCRIPT)
+    (source / "styles.css").write_bytes(STYLES)
+    (source / "index.html").write_text(INDEX)
+    output = tmp_path / "dist"
+    build(source, output)
+    return output
+
+
+def fingerprinted(output: Path, pattern: str) -> Path:
+    (path,) = output.glob(pattern)
+    return path
+
+
+def client(output: Path) -> AsyncClient:
+    app = Starlette(
+        routes=[Mount("/", PrecompressedStaticFiles(directory=output, html=True))]
+    )
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+
+def test_build_fingerprints_and_precompresses(output: Path) -> None:
+    script = fingerprinted(output, "script.*.js")
+    styles = fingerprinted(output, "styles.*.css")
+    assert not (output / "script.js").exists()
+    assert script.read_bytes() == SCRIPT
+    assert gzip.decompress(Path(f"{script}.gz").read_bytes()) == SCRIPT
+    assert brotli.decompress(Path(f"{styles}.br").read_bytes()) == STYLES
+
+    index = (output / "index.html").read_text()
+    assert f'href="{styles.name}"' in index
+    assert f'src="/{script.name}"' in index
+    assert 'href="https://example.com/script.js"' in index
+
+
+def test_build_is_deterministic(output: Path, tmp_path: Path) -> None:
+    names = build(tmp_path / "static", tmp_path / "rebuilt")
+    assert names["script.js"] == fingerprinted(output, "script.*.js").name
+    assert (tmp_path / "rebuilt" / f"{names['script.js']}.gz").read_bytes() == (
+        output / f"{names['script.js']}.gz"
+    ).read_bytes()
+
+
+@pytest.mark.asyncio
+async def test_serves_precompressed_immutable_assets(output: Path) -> None:
+    script = fingerprinted(output, "script.*.js")
+    async with client(output) as static:
+        response = await static.get(
+            f"/{script.name}", headers={"Accept-Encoding": "gzip, br"}
+        )
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "br"
+        assert response.headers["cache-control"] == IMMUTABLE
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert "javascript" in response.headers["content-type"]
+        assert response.content == SCRIPT
+
+        response = await static.get(
+            f"/{script.name}", headers={"Accept-Encoding": "identity"}
+        )
+        assert "content-encoding" not in response.headers
+        assert response.content == SCRIPT
+
+        response = await static.get(
+            f"/{script.name}",
+            headers={
+                "Accept-Encoding": "br",
+                "If-None-Match": response.headers["etag"],
+            },
+        )
+        assert response.status_code == 200
+
+        etag = (
+            await static.get(f"/{script.name}", headers={"Accept-Encoding": "br"})
+        ).headers["etag"]
+        response = await static.get(
+            f"/{script.name}",
+            headers={"Accept-Encoding": "br", "If-None-Match": etag},
+        )
+        assert response.status_code == 304
+
+
+@pytest.mark.asyncio
+async def test_index_is_revalidated(output: Path) -> None:
+    async with client(output) as static:
+        response = await static.get("/", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == "no-cache"
+    assert response.headers["content-type"].startswith("text/html")
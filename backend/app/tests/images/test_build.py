@@ -0,0 +1,104 @@
+import os
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from app.images.build import build_images
+from app.images.store import ImageStore, load_manifest
+from app.images.variants import VariantOptions, variant_widths
+
+OPTIONS = VariantOptions(widths=(32, 64, 128), formats=("avif", "webp"), quality=50)
+
+
+def write_source(path: Path, size: tuple[int, int], color: str) -> None:
+    Image.new("RGBA", size, color).save(path)
+
+
+@pytest.fixture
+def source_dir(tmp_path: Path) -> Path:
+    source_dir = tmp_path / "source"
+    source_dir.mkdir()
+    write_source(source_dir / "1.png", (100, 50), "red")
+    write_source(source_dir / "2.png", (200, 200), "blue")
+    (source_dir / "notes.txt").write_text("not an image")
+    return source_dir
+
+
+def test_variant_widths() -> None:
+    assert variant_widths(100, (32, 64, 128)) == [32, 64, 100]
+    assert variant_widths(20, (32, 64)) == [20]
+
+
+def test_build_images(source_dir: Path, tmp_path: Path) -> None:
+    cache_dir = tmp_path / "cache"
+    report = build_images(source_dir, cache_dir, OPTIONS, workers=2)
+    assert (report.rendered, report.unchanged) == (2, 0)
+
+    manifest = load_manifest(cache_dir)
+    entry = manifest.images[1]
+    assert (entry.width, entry.height) == (100, 50)
+    assert sorted(entry.variants["webp"]) == [32, 64, 100]
+    with Image.open(cache_dir / entry.variants["avif"][64]) as image:
+        assert image.format == "AVIF"
+        assert image.size == (64, 32)
+    with Image.open(cache_dir / manifest.images[2].variants["webp"][128]) as image:
+        assert image.format == "WEBP"
+        assert image.size == (128, 128)
+
+
+def test_rebuild_renders_only_changes(source_dir: Path, tmp_path: Path) -> None:
+    cache_dir = tmp_path / "cache"
+    build_images(source_dir, cache_dir, OPTIONS, workers=1)
+    old_variants = load_manifest(cache_dir).images[2].variants
+
+    report = build_images(source_dir, cache_dir, OPTIONS, workers=1)
+    assert (report.rendered, report.unchanged) == (0, 2)
+
+    # A touched file with the same content is hashed but not rendered.
+    os.utime(source_dir / "1.png", ns=(0, 0))
+    write_source(source_dir / "2.png", (200, 200), "green")
+    write_source(source_dir / "3.png", (100, 50), "red")
+    report = build_images(source_dir, cache_dir, OPTIONS, workers=1)
+    assert (report.rendered, report.unchanged) == (2, 1)
+
+    manifest = load_manifest(cache_dir)
+    assert manifest.images[2].variants != old_variants
+    assert manifest.images[1].mtime_ns == 0
+    # Identical output is stored once.
+    assert (
+        manifest.images[3].variants["webp"][64]
+        == (manifest.images[1].variants["webp"][64])
+    )
+    for path in old_variants["webp"].values():
+        assert not (cache_dir / path).exists()
+
+    (source_dir / "3.png").unlink()
+    report = build_images(source_dir, cache_dir, OPTIONS, workers=1)
+    assert (report.removed, report.rendered) == (1, 0)
+    assert 3 not in load_manifest(cache_dir).images
+
+
+def test_broken_source_is_skipped(source_dir: Path, tmp_path: Path) -> None:
+    (source_dir / "4.png").write_bytes(b"not a png")
+    report = build_images(source_dir, tmp_path / "cache", OPTIONS, workers=1)
+    assert (report.rendered, report.failed) == (2, 1)
+
+
+def test_store_picks_format_and_width(source_dir: Path, tmp_path: Path) -> None:
+    cache_dir = tmp_path / "cache"
+    build_images(source_dir, cache_dir, OPTIONS, workers=1)
+    store = ImageStore(cache_dir)
+
+    found = store.find(2, "image/avif,image/webp,*/*", 40)
+    assert found is not None
+    path, image_format = found
+    assert image_format == "avif"
+    assert path == cache_dir / store.manifest.images[2].variants["avif"][64]
+
+    found = store.find(2, "image/webp,*/*", None)
+    assert found is not None
+    assert found[1] == "webp"
+    assert found[0] == cache_dir / store.manifest.images[2].variants["webp"][128]
+
+    assert store.find(99, None, None) is None
@@ -0,0 +1,80 @@
+import pytest
+from hg2_item_parser.skill_parser import EquipSkillParser, PetSkillParser
+from hg2_item_parser.text_parser import TextParser
+
+from app.catalog.levels import equip_level_values, pet_level_values
+from app.descriptions import compile_template, render_description
+
+TEMPLATES = [
+    "Deals #1% damage for #2s",
+    "#ALB(12)Heals 2#1 HP every #2 s#n",
+    "Raises crit by #1 %, then #3% more and #5 more",
+    "No values here",
+]
+BASE_VALUES = ["0.5", "3", "0.125", "0", "12.3"]
+LEVEL_STEPS = ["0.01", "0", "0.0025", "0", "0.7"]
+UP_STEPS = ["0.05", "0.5", "0", "0", "1.1"]
+
+
+def equip_data(max_lvl: int) -> tuple[dict[str, str], dict[str, str]]:
+    item_main_data = {"DisplayNumber": "1001", "MaxLv": str(max_lvl)}
+    item_skill_data = {"SlotCount": "1", "Slot1Equips": "1001", "Slot1MaxLevel": "4"}
+    for i, (base, step, up) in enumerate(
+        zip(BASE_VALUES, LEVEL_STEPS, UP_STEPS, strict=True), start=1
+    ):
+        item_main_data[f"Prop1Param{i}"] = base
+        item_main_data[f"Prop1Param{i}Add"] = step
+        item_skill_data[f"Slot1Para{i}Add"] = up
+    return item_main_data, item_skill_data
+
+
+@pytest.mark.parametrize("template", TEMPLATES)
+@pytest.mark.parametrize("level", [1, 10, 50])
+def test_render_equip_description_matches_parser(template: str, level: int) -> None:
+    # The parser renders at the item's max level, so it renders any level
+    # given that level as max_lvl.
+    item_main_data, item_skill_data = equip_data(level)
+    expected = TextParser.fill_description_template(
+        template,
+        EquipSkillParser.parse_max_lvl_values(item_main_data, 1),
+        EquipSkillParser.parse_max_up_values(item_skill_data, item_main_data, 1),
+    )
+    level_values = equip_level_values(item_skill_data, item_main_data, 1)
+    assert render_description(template, *level_values, level) == expected
+
+
+@pytest.mark.parametrize("template", TEMPLATES)
+def test_render_pet_description_matches_parser(template: str) -> None:
+    item_skill_data = {"Maxlevel": "9"}
+    for i, (value, up) in enumerate(
+        zip([*BASE_VALUES, "2"], [*UP_STEPS, "0.25"], strict=True), start=1
+    ):
+        item_skill_data[f"Para{i}"] = value
+        item_skill_data[f"Para{i}SkillUpAdd"] = up
+    expected = TextParser.fill_description_template(
+        template,
+        PetSkillParser.parse_values(item_skill_data),
+        PetSkillParser.parse_max_up_values(item_skill_data),
+    )
+    level_values = pet_level_values(item_skill_data)
+    for level in (1, 30):
+        assert render_description(template, *level_values, level) == expected
+
+
+def test_render_description_max_up() -> None:
+    rendered = render_description(
+        "Deals #1% damage for #2s", [1.5, 3.0], [0.0, 0.0], [0.5, 0.0], 1
+    )
+    assert rendered == "Deals 150(200)% damage for 3s"
+
+
+def test_render_description_without_values() -> None:
+    assert render_description("Deals #1% damage", None, None, None, 10) is None
+
+
+def test_compile_template_cached() -> None:
+    compile_template.cache_clear()
+    for level in range(1, 4):
+        render_description("Deals #1% damage", [1.0], [0.5], [0.0], level)
+    info = compile_template.cache_info()
+    assert (info.misses, info.hits) == (1, 2)
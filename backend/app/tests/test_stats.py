@@ -0,0 +1,75 @@
+from types import SimpleNamespace
+from typing import Any
+
+import numpy as np
+import pytest
+from hg2_item_parser.enums import WeaponType
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.stats import Metric, StatsCache, compute_stats
+
+
+def stats_row(ingame_id: int, **values: Any) -> SimpleNamespace:
+    row = {
+        "ingame_id": ingame_id,
+        "title": f"item {ingame_id}",
+        "max_lvl": 10,
+        "weapon_type": None,
+        "crit_rate": None,
+        "base_damage": None,
+        "damage_per_lvl": None,
+        "base_atk_speed": None,
+        "atk_speed_per_lvl": None,
+        "base_hp": None,
+        "hp_per_lvl": None,
+    }
+    return SimpleNamespace(**row | values)
+
+
+def test_compute_stats() -> None:
+    rows = [
+        stats_row(
+            1,
+            max_lvl=3,
+            weapon_type=WeaponType.BOW,
+            crit_rate=0.1,
+            base_damage=10.4,
+            damage_per_lvl=2.5,
+            base_atk_speed=1.0,
+            atk_speed_per_lvl=0.0125,
+        ),
+        stats_row(2, max_lvl=5, base_hp=100.0, hp_per_lvl=20.0),
+    ]
+    stats = compute_stats(7, rows)
+    curves = stats.curves
+
+    assert curves[Metric.DAMAGE].shape == (2, 5)
+    # Rounded like PropertyParser, then held at the max level.
+    np.testing.assert_array_equal(curves[Metric.DAMAGE][0], [10, 13, 15, 15, 15])
+    np.testing.assert_array_equal(
+        curves[Metric.ATK_SPEED][0], [1.0, 1.012, 1.025, 1.025, 1.025]
+    )
+    np.testing.assert_allclose(
+        curves[Metric.DPS][0],
+        curves[Metric.DAMAGE][0] * curves[Metric.ATK_SPEED][0] * 1.1,
+    )
+    np.testing.assert_array_equal(curves[Metric.HP][1], [100, 120, 140, 160, 180])
+    assert np.isnan(curves[Metric.DPS][1]).all()
+
+    (ranking,) = stats.rank(Metric.DPS, 2, [], limit=10)
+    assert (ranking.ingame_id, ranking.level) == (1, 2)
+    assert ranking.weapon_type is WeaponType.BOW
+    assert stats.rank(Metric.DPS, None, [WeaponType.PISTOL], limit=10) == []
+
+
+def test_compute_stats_empty() -> None:
+    stats = compute_stats(1, [])
+    assert stats.rank(Metric.DPS, 10, [], limit=10) == []
+
+
+@pytest.mark.asyncio
+async def test_stats_cache(db: AsyncSession) -> None:
+    cache = StatsCache()
+    stats = await cache.get(db, 1)
+    assert await cache.get(db, 1) is stats
+    assert await cache.get(db, 2) is not stats
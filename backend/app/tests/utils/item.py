@@ -1,16 +1,25 @@
 import random
+from typing import Any
 
-from hg2_item_parser.enums import DamageType
+from hg2_item_parser.enums import DamageType, WeaponType
+from hg2_item_parser.models import Item as ParsedItem
+from hg2_item_parser.models import ItemInfo, ItemProperties, ItemSkill
+from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import crud
-from app.models import Item
+from app.models import Item, Properties, Skill, SkillDescriptionTemplate
 from app.schemas import ItemCreateSchema
 from app.tests.utils.utils import random_lower_string
 
+# Random but unique for the whole session, items are only removed at teardown.
+ingame_ids = iter(random.sample(range(1, 10_000), k=9_999))
+# Likewise for templates, so no test rewrites a template another one uses.
+template_ids = iter(random.sample(range(1, 100_000), k=99_999))
+
 
 async def create_random_item(db: AsyncSession) -> Item:
-    ingame_id = random.randint(1, 5000)
+    ingame_id = next(ingame_ids)
     title_id = random.randint(1, 5000)
     title = random_lower_string()
     image_id = random.randint(1, 5000)
@@ -27,3 +36,82 @@ async def create_random_item(db: AsyncSession) -> Item:
         rarity=rarity,
     )
     return await crud.create_item(db, item_in)
+
+
+async def create_random_properties(db: AsyncSession, item: Item, **values: Any) -> None:
+    statement = (
+        insert(Properties)
+        .values(
+            max_lvl=random.randint(1, 99),
+            max_lvl_damage=random.randint(1, 5000),
+            max_lvl_atk_speed=random.uniform(0.1, 10),
+            weapon_type=random.choice(list(WeaponType)),
+            crit_rate=random.uniform(0, 1),
+            item_ingame_id=item.ingame_id,
+        )
+        .values(**values)
+    )
+    await db.execute(statement)
+    await db.commit()
+
+
+async def create_random_skill(
+    db: AsyncSession,
+    item: Item,
+    *,
+    template: str | None = None,
+    description: str | None = None,
+    base_values: list[float] | None = None,
+    level_steps: list[float] | None = None,
+    max_up_increases: list[float] | None = None,
+) -> None:
+    template_id = next(template_ids)
+    statement = insert(SkillDescriptionTemplate).values(
+        id=template_id, template=template or random_lower_string()
+    )
+    await db.execute(statement)
+    statement = insert(Skill).values(
+        ingame_id=random.randint(1, 5000),
+        title_id=random.randint(1, 5000),
+        title=random_lower_string(),
+        description_template_id=template_id,
+        description=description or random_lower_string(),
+        damage_type=random.choice(list(DamageType)),
+        item_ingame_id=item.ingame_id,
+        base_values=base_values,
+        level_steps=level_steps,
+        max_up_increases=max_up_increases,
+    )
+    await db.execute(statement)
+    await db.commit()
+
+
+def random_parsed_item(ingame_id: int | None = None, skills: int = 2) -> ParsedItem:
+    image_id = random.randint(1, 5000)
+    info = ItemInfo(
+        id=ingame_id or random.randint(10_000, 99_999),
+        title_id=random.randint(1, 5000),
+        title=random_lower_string(),
+        image_id=image_id,
+        image_url=f"http://example.com/{image_id}",
+        damage_type=random.choice(list(DamageType)),
+        rarity=random.randint(1, 7),
+    )
+    properties = ItemProperties(
+        max_lvl=random.randint(1, 99),
+        max_lvl_damage=random.randint(1, 5000),
+        weapon_type=random.choice(list(WeaponType)),
+    )
+    item_skills = [
+        ItemSkill(
+            id=random.randint(1, 5000),
+            damage_type=random.choice(list(DamageType)),
+            title_id=random.randint(1, 5000),
+            title=random_lower_string(),
+            description_template_id=next(template_ids),
+            description_template=random_lower_string(),
+            description=random_lower_string(),
+        )
+        for _ in range(skills)
+    ]
+    return ParsedItem(info, properties, item_skills)
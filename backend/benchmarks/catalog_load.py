@@ -0,0 +1,43 @@
+import argparse
+import asyncio
+import logging
+import time
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.catalog.loader import load_catalog
+from app.catalog.rows import row_batches
+from app.core.db import engine
+from benchmarks.utils import FIRST_BENCHMARK_INGAME_ID, random_parsed_item
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def run(rows: int, batch_size: int) -> None:
+    # Each synthetic item writes one item, one properties and two skill rows.
+    item_count = rows // 4
+    parsed_items = [
+        random_parsed_item(FIRST_BENCHMARK_INGAME_ID + n) for n in range(item_count)
+    ]
+    async with AsyncSession(engine) as session:
+        start = time.perf_counter()
+        written = await load_catalog(session, row_batches(parsed_items, batch_size))
+        elapsed = time.perf_counter() - start
+        # The dump is only timed, never kept.
+        await session.rollback()
+    logger.info(
+        "Copied %s rows in %.2f s: %.0f rows/s", written, elapsed, written / elapsed
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure bulk catalog loading")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
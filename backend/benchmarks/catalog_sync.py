@@ -0,0 +1,47 @@
+import argparse
+import asyncio
+import dataclasses
+import logging
+import random
+import time
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.catalog.loader import load_catalog
+from app.catalog.rows import catalog_rows, row_batches
+from app.catalog.sync import sync_catalog
+from app.core.db import engine
+from benchmarks.utils import FIRST_BENCHMARK_INGAME_ID, random_parsed_item
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def run(items: int, changed: float) -> None:
+    parsed_items = [
+        random_parsed_item(FIRST_BENCHMARK_INGAME_ID + n) for n in range(items)
+    ]
+    async with AsyncSession(engine) as session:
+        # The dump replaces the catalog inside a transaction that is rolled
+        # back at the end, so the benchmark leaves the database untouched.
+        await load_catalog(session, row_batches(parsed_items, 1000), replace=True)
+        for n in random.sample(range(items), int(items * changed)):
+            info = dataclasses.replace(parsed_items[n].info, title="Patched")
+            parsed_items[n] = dataclasses.replace(parsed_items[n], info=info)
+        start = time.perf_counter()
+        report = await sync_catalog(session, catalog_rows(parsed_items))
+        elapsed = time.perf_counter() - start
+        await session.rollback()
+    logger.info("Synced %s items in %.2f s: %s", items, elapsed, report)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure incremental catalog sync")
+    parser.add_argument("--items", type=int, default=25_000)
+    parser.add_argument("--changed", type=float, default=0.01)
+    args = parser.parse_args()
+    asyncio.run(run(args.items, args.changed))
+
+
+if __name__ == "__main__":
+    main()
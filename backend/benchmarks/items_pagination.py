@@ -0,0 +1,81 @@
+import argparse
+import asyncio
+import logging
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import response_cache
+from app.core.config import settings
+from app.core.db import engine
+from app.core.pagination import encode_cursor
+from app.main import app
+from app.models import Item
+from benchmarks.utils import clear_items, measure, seed_items
+
+logging.basicConfig(level=logging.INFO)
+logging.getLogger("httpx").setLevel(logging.WARNING)
+logger = logging.getLogger(__name__)
+
+
+async def cursor_before(session: AsyncSession, position: int) -> str | None:
+    if position == 0:
+        return None
+    query = select(Item.ingame_id).order_by(Item.ingame_id).offset(position - 1)
+    result = await session.execute(query.limit(1))
+    return encode_cursor(result.scalars().one())
+
+
+async def run(items: int, limit: int, page: int, repeat: int) -> None:
+    async with AsyncSession(engine) as session:
+        logger.info("Seeding %s items", items)
+        await seed_items(session, items)
+        try:
+            async with AsyncClient(
+                transport=ASGITransport(app=app), base_url="http://127.0.0.1"
+            ) as client:
+                for page_number in (1, page):
+                    skip = (page_number - 1) * limit
+                    after = await cursor_before(session, skip)
+                    offset_params: dict[str, int | str] = {"skip": skip, "limit": limit}
+                    cursor_params: dict[str, int | str] = {"limit": limit}
+                    if after is not None:
+                        cursor_params["after"] = after
+                    for mode, params in (
+                        ("offset", offset_params),
+                        ("cursor", cursor_params),
+                    ):
+
+                        async def fetch(params: dict[str, int | str] = params) -> None:
+                            # Measure the query, not the response cache.
+                            response_cache.clear()
+                            response = await client.get(
+                                f"{settings.API_V1_STR}/items/", params=params
+                            )
+                            response.raise_for_status()
+
+                        result = await measure(fetch, repeat=repeat)
+                        logger.info(
+                            "page %s %s: median %.2f ms, p95 %.2f ms",
+                            page_number,
+                            mode,
+                            result["median_ms"],
+                            result["p95_ms"],
+                        )
+        finally:
+            await clear_items(session)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare offset and cursor pages")
+    parser.add_argument("--items", type=int, default=50_000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--page", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(run(args.items, args.limit, args.page, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
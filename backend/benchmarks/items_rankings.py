@@ -0,0 +1,84 @@
+import argparse
+import asyncio
+import logging
+import random
+from types import SimpleNamespace
+
+from hg2_item_parser.enums import WeaponType
+
+from app.stats import CatalogStats, Metric, compute_stats
+from benchmarks.utils import measure
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def random_stats_row(ingame_id: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        ingame_id=ingame_id,
+        title=f"Benchmark item {ingame_id}",
+        max_lvl=random.randint(1, 99),
+        weapon_type=random.choice([None, *WeaponType]),
+        crit_rate=random.uniform(0, 1),
+        base_damage=random.uniform(10, 500),
+        damage_per_lvl=random.uniform(0, 50),
+        base_atk_speed=random.uniform(0.1, 5),
+        atk_speed_per_lvl=random.uniform(0, 0.05),
+        base_hp=random.choice([None, random.uniform(100, 5000)]),
+        hp_per_lvl=random.uniform(0, 100),
+    )
+
+
+async def run(sizes: list[int], repeat: int) -> None:
+    for size in sizes:
+        rows = [random_stats_row(i) for i in range(1, size + 1)]
+
+        async def build(rows: list[SimpleNamespace] = rows) -> None:
+            compute_stats(1, rows)
+
+        result = await measure(build, repeat=repeat, warmup=1)
+        logger.info(
+            "%s items compute: median %.2f ms, p95 %.2f ms",
+            size,
+            result["median_ms"],
+            result["p95_ms"],
+        )
+
+        stats = compute_stats(1, rows)
+        queries: tuple[tuple[str, Metric, int | None, list[WeaponType]], ...] = (
+            ("dps", Metric.DPS, 30, []),
+            ("dps pistol", Metric.DPS, 30, [WeaponType.PISTOL]),
+            ("damage max_lvl", Metric.DAMAGE, None, []),
+        )
+        for name, metric, level, weapon_types in queries:
+
+            async def rank(
+                metric: Metric = metric,
+                level: int | None = level,
+                weapon_types: list[WeaponType] = weapon_types,
+                stats: CatalogStats = stats,
+            ) -> None:
+                stats.rank(metric, level, weapon_types, limit=100)
+
+            result = await measure(rank, repeat=repeat * 10)
+            logger.info(
+                "%s items rank %s: median %.3f ms, p95 %.3f ms",
+                size,
+                name,
+                result["median_ms"],
+                result["p95_ms"],
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Measure stat curve computation and rankings over the arrays"
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(run(args.sizes, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import argparse
+import asyncio
+import logging
+import random
+
+from hg2_item_parser.models import Item as ParsedItem
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.catalog.loader import load_catalog
+from app.catalog.rows import row_batches
+from app.core.cache import response_cache
+from app.core.config import settings
+from app.core.db import engine
+from app.main import app
+from benchmarks.utils import (
+    FIRST_BENCHMARK_INGAME_ID,
+    clear_items,
+    measure,
+    random_parsed_item,
+)
+
+logging.basicConfig(level=logging.INFO)
+logging.getLogger("httpx").setLevel(logging.WARNING)
+logger = logging.getLogger(__name__)
+
+WORDS = (
+    "lance", "blade", "cannon", "rifle", "shield", "drone", "katana", "bow",
+    "hammer", "pistol", "frost", "flame", "thunder", "shadow", "holy", "storm",
+    "crystal", "void", "iron", "lunar", "solar", "venom", "plasma", "spirit",
+)  # fmt: skip
+
+
+def search_item(ingame_id: int) -> ParsedItem:
+    parsed_item = random_parsed_item(ingame_id)
+    parsed_item.info.title = f"{' '.join(random.sample(WORDS, 2))} {ingame_id}"
+    for skill in parsed_item.skills:
+        skill.description = f"Deals {random.choice(WORDS)} damage to enemies"
+    return parsed_item
+
+
+async def run(items: int, limit: int, fields: str, repeat: int) -> None:
+    async with AsyncSession(engine) as session:
+        logger.info("Seeding %s items", items)
+        parsed_items = (
+            search_item(FIRST_BENCHMARK_INGAME_ID + n) for n in range(items)
+        )
+        await load_catalog(session, row_batches(parsed_items, 5000))
+        await session.commit()
+        # Steady state: statistics are current and the GIN pending list has
+        # been merged, as autovacuum would leave them.
+        async with engine.connect() as connection:
+            autocommit = await connection.execution_options(
+                isolation_level="AUTOCOMMIT"
+            )
+            await autocommit.execute(text("VACUUM ANALYZE item"))
+        try:
+            async with AsyncClient(
+                transport=ASGITransport(app=app), base_url="http://127.0.0.1"
+            ) as client:
+                queries = {
+                    "rare": str(FIRST_BENCHMARK_INGAME_ID + items // 2),
+                    "common": WORDS[0],
+                    "phrase": f'"{WORDS[1]} {WORDS[2]}"',
+                }
+                for name, q in queries.items():
+
+                    async def fetch(q: str = q) -> None:
+                        # Measure the query, not the response cache.
+                        response_cache.clear()
+                        response = await client.get(
+                            f"{settings.API_V1_STR}/items/search",
+                            params={"q": q, "limit": limit, "fields": fields},
+                        )
+                        response.raise_for_status()
+
+                    result = await measure(fetch, repeat=repeat)
+                    logger.info(
+                        "%s query %r: median %.2f ms, p95 %.2f ms",
+                        name,
+                        q,
+                        result["median_ms"],
+                        result["p95_ms"],
+                    )
+        finally:
+            await clear_items(session)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure item search latency")
+    parser.add_argument("--items", type=int, default=50_000)
+    parser.add_argument("--limit", type=int, default=96)
+    # The frontend grid projection.
+    parser.add_argument("--fields", default="ingame_id,title,image_url")
+    parser.add_argument("--repeat", type=int, default=100)
+    args = parser.parse_args()
+    asyncio.run(run(args.items, args.limit, args.fields, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+import argparse
+import asyncio
+import logging
+import random
+from collections.abc import Callable
+from typing import Any
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+from hg2_item_parser.enums import DamageType, WeaponType
+
+from app.models import Item, Properties, Skill
+from app.schemas import ItemsSearchSchema
+from benchmarks.utils import measure, random_item_row
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def random_item_dict(ingame_id: int, skills: int) -> dict[str, Any]:
+    # The shape ItemProjection.load returns for the default projection.
+    item = random_item_row(ingame_id) | {"id": ingame_id}
+    item["properties"] = {
+        "id": ingame_id,
+        "max_lvl": random.randint(1, 99),
+        "cost": None,
+        "max_lvl_damage": random.randint(1, 5000),
+        "max_lvl_ammo": None,
+        "max_lvl_atk_speed": random.uniform(0.1, 10),
+        "max_lvl_hp": None,
+        "weapon_type": random.choice(list(WeaponType)),
+        "deploy_limit": None,
+        "duration": None,
+        "crit_rate": random.uniform(0, 1),
+        "base_sync": None,
+        "max_sync": None,
+        "item_ingame_id": ingame_id,
+    }
+    item["skills"] = [
+        {
+            "id": ingame_id * skills + n,
+            "ingame_id": random.randint(1, 5000),
+            "title_id": random.randint(1, 5000),
+            "title": f"Benchmark skill {ingame_id}-{n}",
+            "description_template_id": random.randint(1, 500),
+            "description_template": "Deals #1% damage for #2s",
+            "description": "Deals 150% damage for 3s",
+            "damage_type": random.choice(list(DamageType)),
+            "item_ingame_id": ingame_id,
+            "base_values": [1.5, 3.0],
+            "level_steps": [0.01, 0.0],
+            "max_up_increases": [0.5, 0.0],
+        }
+        for n in range(skills)
+    ]
+    return item
+
+
+def to_orm(item_dict: dict[str, Any]) -> Item:
+    fields = {
+        name: value
+        for name, value in item_dict.items()
+        if name not in ("id", "properties", "skills")
+    }
+    item = Item(**fields)
+    item.id = item_dict["id"]
+    Properties(**item_dict["properties"], item=item)
+    for skill in item_dict["skills"]:
+        # description_template is loaded from its own table, as if it had been.
+        fields = {
+            name: value
+            for name, value in skill.items()
+            if name != "description_template"
+        }
+        Skill(**fields, item=item).description_template = skill["description_template"]
+    return item
+
+
+def render_validated(items: list[Item]) -> bytes:
+    # What a response_model route does with ORM objects: validate every
+    # attribute, dump to JSON compatible data, then encode with json.
+    model = ItemsSearchSchema.model_validate(
+        {"data": items, "next_cursor": None}, from_attributes=True
+    )
+    return JSONResponse(model.model_dump(mode="json")).body
+
+
+def render_encoder(items: list[dict[str, Any]]) -> bytes:
+    return JSONResponse(jsonable_encoder({"data": items, "next_cursor": None})).body
+
+
+def render_trusted(items: list[dict[str, Any]]) -> bytes:
+    return ORJSONResponse({"data": items, "next_cursor": None}).body
+
+
+async def run(sizes: list[int], skills: int, repeat: int) -> None:
+    for size in sizes:
+        item_dicts = [random_item_dict(i, skills) for i in range(1, size + 1)]
+        orm_items = [to_orm(item) for item in item_dicts]
+        modes: tuple[tuple[str, Callable[[Any], bytes], Any], ...] = (
+            ("validated", render_validated, orm_items),
+            ("jsonable_encoder", render_encoder, item_dicts),
+            ("orjson", render_trusted, item_dicts),
+        )
+        for mode, render, items in modes:
+
+            async def encode(
+                render: Callable[[Any], bytes] = render, items: Any = items
+            ) -> None:
+                render(items)
+
+            result = await measure(encode, repeat=repeat, warmup=2)
+            logger.info(
+                "%s items %s: median %.2f ms, p95 %.2f ms, %s bytes",
+                size,
+                mode,
+                result["median_ms"],
+                result["p95_ms"],
+                len(render(items)),
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare validated and trusted item response serialization"
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1_000, 10_000])
+    parser.add_argument("--skills", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(run(args.sizes, args.skills, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
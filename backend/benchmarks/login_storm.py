@@ -0,0 +1,114 @@
+import argparse
+import asyncio
+import logging
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from typing import Any
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud
+from app.core import security
+from app.core.cache import response_cache
+from app.core.config import settings
+from app.core.db import engine
+from app.main import app
+from app.schemas import UserCreateSchema
+from benchmarks.utils import clear_items, measure, seed_items
+
+logging.basicConfig(level=logging.INFO)
+logging.getLogger("httpx").setLevel(logging.WARNING)
+logger = logging.getLogger(__name__)
+
+USER_NAME = "loginstorm"
+USER_PASSWORD = "loginstorm-password"
+
+
+async def run_inline[T](func: Callable[..., T], *args: Any) -> T:
+    return func(*args)
+
+
+@asynccontextmanager
+async def login_storm(
+    client: AsyncClient, logins: int, *, blocking: bool
+) -> AsyncIterator[None]:
+    async def log_in() -> None:
+        while True:
+            response = await client.post(
+                f"{settings.API_V1_STR}/login/access-token",
+                data={"username": USER_NAME, "password": USER_PASSWORD},
+            )
+            response.raise_for_status()
+
+    # Blocking mode hashes on the event loop, as before the thread pool.
+    run_hashing = security.run_hashing
+    if blocking:
+        security.run_hashing = run_inline
+    tasks = [asyncio.create_task(log_in()) for _ in range(logins)]
+    try:
+        yield
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        security.run_hashing = run_hashing
+
+
+async def run(items: int, logins: int, repeat: int) -> None:
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        await seed_items(session, items)
+        user = await crud.create_user(
+            session,
+            UserCreateSchema(
+                email=f"{USER_NAME}@example.com",
+                name=USER_NAME,
+                password=USER_PASSWORD,
+            ),
+        )
+        try:
+            async with AsyncClient(
+                transport=ASGITransport(app=app), base_url="http://127.0.0.1"
+            ) as client:
+
+                async def read_items() -> None:
+                    response_cache.clear()
+                    response = await client.get(
+                        f"{settings.API_V1_STR}/items/",
+                        params={"fields": "ingame_id,title,image_url", "limit": 96},
+                    )
+                    response.raise_for_status()
+
+                result = await measure(read_items, repeat=repeat)
+                logger.info(
+                    "idle: median %.2f ms, p99 %.2f ms",
+                    result["median_ms"],
+                    result["p99_ms"],
+                )
+                for blocking in (False, True):
+                    async with login_storm(client, logins, blocking=blocking):
+                        result = await measure(read_items, repeat=repeat)
+                    logger.info(
+                        "%s logins (%s): median %.2f ms, p99 %.2f ms",
+                        logins,
+                        "blocking" if blocking else "thread pool",
+                        result["median_ms"],
+                        result["p99_ms"],
+                    )
+                logger.info("hashing: %s", security.hashing_metrics.snapshot())
+        finally:
+            await crud.delete_user(session, user)
+            await clear_items(session)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Item reads during a login storm")
+    parser.add_argument("--items", type=int, default=5_000)
+    parser.add_argument("--logins", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+    asyncio.run(run(args.items, args.logins, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import random
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from hg2_item_parser.enums import DamageType, WeaponType
+from hg2_item_parser.models import Item as ParsedItem
+from hg2_item_parser.models import ItemInfo, ItemProperties, ItemSkill
+from sqlalchemy import delete, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Item, Properties, Skill
+
+# Benchmark rows live far above real ingame ids so they never collide with
+# catalog data and can be removed in one statement.
+FIRST_BENCHMARK_INGAME_ID = 1_000_000
+
+
+def random_item_row(ingame_id: int) -> dict[str, Any]:
+    image_id = random.randint(1, 5000)
+    return {
+        "ingame_id": ingame_id,
+        "title_id": random.randint(1, 5000),
+        "title": f"Benchmark item {ingame_id}",
+        "image_id": image_id,
+        "image_url": f"http://example.com/{image_id}",
+        "damage_type": random.choice(list(DamageType)),
+        "rarity": random.randint(1, 7),
+    }
+
+
+def random_parsed_item(ingame_id: int, skills: int = 2) -> ParsedItem:
+    row = random_item_row(ingame_id)
+    info = ItemInfo(id=row.pop("ingame_id"), **row)
+    properties = ItemProperties(
+        max_lvl=random.randint(1, 99),
+        max_lvl_damage=random.randint(1, 5000),
+        max_lvl_atk_speed=random.uniform(0.1, 10),
+        weapon_type=random.choice(list(WeaponType)),
+        crit_rate=random.uniform(0, 1),
+    )
+    item_skills = [
+        ItemSkill(
+            id=random.randint(1, 5000),
+            damage_type=random.choice(list(DamageType)),
+            title_id=random.randint(1, 5000),
+            title=f"Benchmark skill {ingame_id}-{n}",
+            description_template_id=random.randint(1, 500),
+            description_template="Deals #1% damage for #2s",
+            description="Deals 150% damage for 3s",
+        )
+        for n in range(skills)
+    ]
+    return ParsedItem(info, properties, item_skills)
+
+
+async def seed_items(session: AsyncSession, count: int, batch_size: int = 5000) -> None:
+    ingame_ids = range(FIRST_BENCHMARK_INGAME_ID, FIRST_BENCHMARK_INGAME_ID + count)
+    for start in range(0, count, batch_size):
+        rows = [random_item_row(i) for i in ingame_ids[start : start + batch_size]]
+        await session.execute(insert(Item), rows)
+    await session.commit()
+
+
+async def clear_items(session: AsyncSession) -> None:
+    for column in (Skill.item_ingame_id, Properties.item_ingame_id, Item.ingame_id):
+        statement = delete(column.class_).where(column >= FIRST_BENCHMARK_INGAME_ID)
+        await session.execute(statement)
+    await session.commit()
+
+
+async def measure(
+    func: Callable[[], Awaitable[Any]], repeat: int = 50, warmup: int = 5
+) -> dict[str, float]:
+    for _ in range(warmup):
+        await func()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await func()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return {
+        "median_ms": statistics.median(timings),
+        "p95_ms": timings[int(len(timings) * 0.95) - 1],
+        "p99_ms": timings[int(len(timings) * 0.99) - 1],
+    }
@@ -1,6 +1,13 @@
 const API_BASE = "http://127.0.0.1:8000/api/v1/items";
+const IMAGES_BASE = "http://127.0.0.1:8000/api/v1/images";
+// Widths rendered by app.build_images (IMAGES_WIDTHS).
+const imageWidths = [96, 192, 384];
 let currentPage = 1;
 const itemsPerPage = 96;
+// Everything the grid and the detail view show, kept in the local copy.
+const catalogFields = "ingame_id,title,image_id,image_url,rarity,damage_type";
+// Item ids in list order, known once the catalog has been synced.
+let catalogOrder = null;
 
 function changePage(direction) {
     currentPage += direction;
@@ -24,10 +31,133 @@ function jumpToPage(event) {
     }
 }
 
+function openCatalog() {
+    return new Promise((resolve, reject) => {
+        const request = indexedDB.open('hg2-catalog', 1);
+        request.onupgradeneeded = () => {
+            request.result.createObjectStore('items', { keyPath: 'ingame_id' });
+            request.result.createObjectStore('meta');
+        };
+        request.onsuccess = () => resolve(request.result);
+        request.onerror = () => reject(request.error);
+    });
+}
+
+// Without IndexedDB (e.g. private browsing) every page comes from the API.
+const catalogDb = 'indexedDB' in window ? openCatalog().catch(() => null) : Promise.resolve(null);
+
+function requestResult(request) {
+    return new Promise((resolve, reject) => {
+        request.onsuccess = () => resolve(request.result);
+        request.onerror = () => reject(request.error);
+    });
+}
+
+async function readStore(storeName, keys) {
+    const db = await catalogDb;
+    if (!db) {
+        return keys.map(() => undefined);
+    }
+    const store = db.transaction(storeName).objectStore(storeName);
+    return Promise.all(keys.map(key => requestResult(store.get(key))));
+}
+
+async function storedKeys(storeName) {
+    const db = await catalogDb;
+    if (!db) {
+        return [];
+    }
+    return requestResult(db.transaction(storeName).objectStore(storeName).getAllKeys());
+}
+
+async function writeStore(storeName, write) {
+    const db = await catalogDb;
+    if (!db) {
+        return;
+    }
+    const transaction = db.transaction(storeName, 'readwrite');
+    write(transaction.objectStore(storeName));
+    return new Promise((resolve, reject) => {
+        transaction.oncomplete = () => resolve();
+        transaction.onerror = () => reject(transaction.error);
+    });
+}
+
+async function syncCatalog() {
+    const [version, revisions] = await readStore('meta', ['version', 'revisions']);
+    let catalog;
+    try {
+        // Revalidated with the catalog ETag, unchanged catalogs cost a 304.
+        const response = await fetch(`${API_BASE}/revisions?fields=${catalogFields}`, { cache: 'no-cache' });
+        if (!response.ok) {
+            throw new Error(`Catalog sync failed: ${response.status}`);
+        }
+        catalog = await response.json();
+    } catch (error) {
+        // Offline, browse what the local copy has.
+        catalogOrder = revisions ? revisions.map(([itemId]) => itemId) : null;
+        return;
+    }
+    catalogOrder = catalog.data.map(([itemId]) => itemId);
+    if (catalog.version === version) {
+        return;
+    }
+    // Only items whose document changed, or that are gone, are dropped and
+    // fetched again.
+    const previous = new Map(revisions || []);
+    const current = new Map(catalog.data);
+    const stale = (await storedKeys('items')).filter(
+        itemId => !previous.has(itemId) || previous.get(itemId) !== current.get(itemId)
+    );
+    await writeStore('items', store => stale.forEach(itemId => store.delete(itemId)));
+    await writeStore('meta', store => {
+        store.put(catalog.version, 'version');
+        store.put(catalog.data, 'revisions');
+    });
+}
+
+async function fetchItems(query) {
+    const response = await fetch(`${API_BASE}/?${query}&limit=${itemsPerPage}&fields=${catalogFields}`);
+    const items = (await response.json()).data;
+    await writeStore('items', store => items.forEach(item => store.put(item)));
+    return items;
+}
+
+async function pageItems(page) {
+    const start = (page - 1) * itemsPerPage;
+    if (!catalogOrder) {
+        return fetchItems(`skip=${start}`);
+    }
+    const itemIds = catalogOrder.slice(start, start + itemsPerPage);
+    const items = await readStore('items', itemIds);
+    if (items.every(item => item !== undefined)) {
+        return items;
+    }
+    // Keyset pagination fetches exactly the ids of this page.
+    return fetchItems(start > 0 ? `after=${catalogOrder[start - 1]}` : 'skip=0');
+}
+
+function prefetchPage(page) {
+    if (catalogOrder && (page - 1) * itemsPerPage >= catalogOrder.length) {
+        return;
+    }
+    const whenIdle = window.requestIdleCallback || (callback => setTimeout(callback, 200));
+    whenIdle(() => pageItems(page).catch(() => {}));
+}
+
 async function loadItems(page) {
-    const response = await fetch(`${API_BASE}/?skip=${(page-1) * itemsPerPage}&limit=${itemsPerPage}`);
-    const items = await response.json();
-    renderItems(items.data);
+    renderItems(await pageItems(page));
+    prefetchPage(page + 1);
+}
+
+function imageAttributes(item) {
+    const srcset = imageWidths
+        .map(width => `${IMAGES_BASE}/${item.image_id}?w=${width} ${width}w`)
+        .join(', ');
+    // Images without rendered variants fall back to the original.
+    return `src="${IMAGES_BASE}/${item.image_id}?w=${imageWidths[1]}" srcset="${srcset}"
+        sizes="(max-width: 600px) 30vw, 160px" loading="lazy"
+        onerror="this.onerror = null; this.srcset = ''; this.src = '${item.image_url}';"`;
 }
 
 function renderItems(items) {
@@ -44,7 +174,7 @@ function renderItems(items) {
         const itemDiv = document.createElement('div');
         itemDiv.classList.add('item');
         itemDiv.innerHTML = `
-        <img src="${item.image_url}" alt="${item.title}" style="width: 100%; height: auto;">
+        <img ${imageAttributes(item)} alt="${item.title}" style="width: 100%; height: auto;">
         <h3>${item.title}</h3>
         `;
         itemDiv.addEventListener('click', () => showItemDetails(item.ingame_id));
@@ -55,8 +185,11 @@ function renderItems(items) {
 }
 
 async function showItemDetails(itemId) {
-    const response = await fetch(`${API_BASE}/${itemId}`);
-    const item = await response.json();
+    let [item] = await readStore('items', [itemId]);
+    if (!item) {
+        const response = await fetch(`${API_BASE}/${itemId}?fields=${catalogFields}`);
+        item = await response.json();
+    }
     alert(`
         Title: ${item.title}
         Rarity: ${item.rarity}
@@ -72,6 +205,12 @@ function updatePagination() {
     nextButton.disabled = false;
 }
 
-document.addEventListener('DOMContentLoaded', () => {
+document.addEventListener('DOMContentLoaded', async () => {
+    try {
+        await syncCatalog();
+    } catch (error) {
+        // Without a usable local copy, page through the API.
+        catalogOrder = null;
+    }
     loadItems(currentPage);
 });